@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Synthetic inventory generator.
+
+Writes an Excel inventory with the same Parcelas/PiesMayores layout as data/data_sm4.2015.1p_eng.xlsx,
+so any number of plots can be fed to the simulator through the BasicLoad model.
+
+    python generator.py -o inventory.xlsx -p 1000 -t 40 -s "Pinus pinaster"
+"""
+
+import argparse
+import random
+import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'src'))
+
+from constants import PLOT_VARIABLE_NAMES
+from data.tree import VARIABLE_NAMES
+
+import openpyxl
+
+
+PARCEL_CODE = 'Parcelas'
+TREE_CODE = 'PiesMayores'
+
+PLOT_RADIUS = 15  # (m)
+EXPAN = 10000 / (math.pi * PLOT_RADIUS ** 2)
+
+# Species supported by the shipped models and their IFN code.
+SPECIES = {
+    'Pinus sylvestris': 21,
+    'Pinus pinea': 23,
+    'Pinus halepensis': 24,
+    'Pinus nigra': 25,
+    'Pinus pinaster': 26,
+    'Pinus radiata': 28,
+    'Quercus robur': 41,
+    'Quercus pyrenaica': 43,
+    'Quercus suber': 46,
+    'Fagus sylvatica': 71
+}
+
+
+def generate_trees(random_state: random.Random, plot_id: int, number_trees: int, specie: int, age: int):
+
+    trees = list()
+
+    mean_dbh = 5 + age * random_state.uniform(0.35, 0.65)
+
+    for tree_id in range(1, number_trees + 1):
+
+        dbh = round(max(7.5, random_state.gauss(mean_dbh, mean_dbh * 0.25)), 2)
+        height = round(1.3 + (dbh * 0.9) / (1 + dbh * 0.035) * random_state.uniform(0.85, 1.15), 2)
+
+        tree = dict.fromkeys(VARIABLE_NAMES, 0)
+        tree.update({
+            'INVENTORY_ID': 1,
+            'PLOT_ID': plot_id,
+            'TREE_ID': tree_id,
+            'number_of_trees': 1,
+            'specie': specie,
+            'age_130': max(1, age - 3),
+            'tree_age': age,
+            'expan': round(EXPAN, 2),
+            'dbh': dbh,
+            'height': height,
+            'normal_circumference': round(math.pi * dbh, 2),
+            'hd_ratio': round(height * 100 / dbh, 2),
+            'basal_area': round(math.pi * (dbh / 2) ** 2, 2)
+        })
+        trees.append(tree)
+
+    return trees
+
+
+def generate_plot(plot_id: int, main_specie: str, age: int, trees: list):
+
+    dbhs = sorted((tree['dbh'] for tree in trees), reverse=True)
+    heights = sorted((tree['height'] for tree in trees), reverse=True)
+    # dominant trees are the 100 thickest trees per hectare
+    dominant = max(1, int(round(100 / EXPAN)))
+
+    density = EXPAN * len(trees)
+    basal_area = sum(tree['basal_area'] for tree in trees) * EXPAN / 10000
+
+    plot = dict.fromkeys(PLOT_VARIABLE_NAMES, 0)
+    plot.update({
+        'INVENTORY_ID': 1,
+        'PLOT_ID': plot_id,
+        'PLOT_TYPE': 'Synthetic plot',
+        'PLOT_AREA': str(PLOT_RADIUS) + ' m',
+        'PROVINCE': 'Synthetic',
+        'STUDY_AREA': 'Synthetic',
+        'MUNICIPALITY': 'Synthetic',
+        'FOREST': 'Synthetic',
+        'MAIN_SPECIE': main_specie,
+        'SPECIE_IFN_ID': SPECIES[main_specie],
+        'SLOPE': 10,
+        'ASPECT': 200,
+        'CONTINENTALITY': 500,
+        'ALTITUDE': 900,
+        'EXPAN': 100,
+        'AGE': age,
+        'DENSITY': round(density, 2),
+        'BASAL_AREA': round(basal_area, 2),
+        'DBH_MAX': dbhs[0],
+        'DBH_MIN': dbhs[-1],
+        'MEAN_DBH': round(sum(dbhs) / len(dbhs), 2),
+        'QM_DBH': round(math.sqrt(sum(dbh ** 2 for dbh in dbhs) / len(dbhs)), 2),
+        'DOMINANT_DBH': round(sum(dbhs[:dominant]) / len(dbhs[:dominant]), 2),
+        'H_MAX': heights[0],
+        'H_MIN': heights[-1],
+        'MEAN_H': round(sum(heights) / len(heights), 2),
+        'DOMINANT_H': round(sum(heights[:dominant]) / len(heights[:dominant]), 2)
+    })
+
+    return plot
+
+
+def generate_inventory(file_path: str, plots: int, trees_per_plot: int = 40, species: list = None,
+                       min_age: int = 20, max_age: int = 60, seed: int = 0):
+    """
+    Writes an inventory of synthetic plots. Plots cycle through the given species (all of them by default),
+    and the same seed always produces the same file.
+    """
+
+    if species is None or len(species) == 0:
+        species = list(SPECIES.keys())
+
+    for specie in species:
+        if specie not in SPECIES:
+            raise ValueError('Unknown specie ' + str(specie) + ', expected one of ' + ', '.join(SPECIES.keys()))
+
+    random_state = random.Random(seed)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    plot_sheet = workbook.create_sheet(PARCEL_CODE)
+    tree_sheet = workbook.create_sheet(TREE_CODE)
+
+    plot_sheet.append(PLOT_VARIABLE_NAMES)
+    tree_sheet.append(VARIABLE_NAMES)
+
+    for plot_id in range(1, plots + 1):
+
+        main_specie = species[(plot_id - 1) % len(species)]
+        age = random_state.randint(min_age, max_age)
+        trees = generate_trees(random_state, plot_id, trees_per_plot, SPECIES[main_specie], age)
+
+        plot = generate_plot(plot_id, main_specie, age, trees)
+        plot_sheet.append([plot[variable] for variable in PLOT_VARIABLE_NAMES])
+
+        for tree in trees:
+            tree_sheet.append([tree[variable] for variable in VARIABLE_NAMES])
+
+    workbook.save(file_path)
+
+    return file_path
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Simanfor synthetic inventory generator')
+
+    parser.add_argument('-o', metavar='output_file', required=True, type=str, help='inventory file (xlsx)')
+    parser.add_argument('-p', metavar='plots', default=10, type=int, help='number of plots')
+    parser.add_argument('-t', metavar='trees_per_plot', default=40, type=int, help='number of trees per plot')
+    parser.add_argument('-s', metavar='specie', nargs='*', default=None, type=str,
+                        help='main species of the plots, one of: ' + ', '.join(SPECIES.keys()))
+    parser.add_argument('--seed', metavar='seed', default=0, type=int, help='random seed')
+
+    args = parser.parse_args()
+
+    generate_inventory(args.o, args.p, args.t, args.s, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
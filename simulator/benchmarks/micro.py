@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Micro-benchmarks of the data layer functions that every simulation step goes through.
+
+Every benchmark runs at several plot sizes (trees per plot) and reports the best time per call.
+Results are compared with a stored baseline, and the run fails when any benchmark is slower than the
+baseline by more than the threshold.
+
+    python micro.py                      # compare with baseline.json
+    python micro.py --save               # store the current timings as the new baseline
+    python micro.py -b tree_clone -s 100 # run a subset
+"""
+
+from generator import generate_trees
+from generator import generate_plot
+
+import argparse
+import logging
+import random
+import timeit
+import json
+import sys
+import os
+
+SRC_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'src')
+
+sys.path.append(SRC_FOLDER)
+
+from openpyxl import Workbook
+from data import Tree
+from data import Plot
+from data.search.order_criteria import OrderCriteria
+from data.search.order_criteria import DESC
+from scenario import Operation
+from scenario import OperationType
+from simulation import Simulation
+from simulation.inventory import Inventory
+from simulation.step import Step
+
+import i18n
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baseline.json')
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_THRESHOLD = 0.25
+INVENTORY_PLOTS = 10
+SPECIE = 'Pinus pinaster'
+
+
+def tree_data(size: int, seed: int = 0):
+    return generate_trees(random.Random(seed), 1, size, 26, 40)
+
+
+def build_plot(size: int, plot_id: int = 1, seed: int = 0):
+
+    trees = generate_trees(random.Random(seed), plot_id, size, 26, 40)
+
+    plot = Plot(generate_plot(plot_id, SPECIE, 40, trees))
+    for data in trees:
+        plot.add_tree(Tree(data))
+
+    return plot
+
+
+def build_inventory(size: int):
+
+    inventory = Inventory()
+    for plot_id in range(1, INVENTORY_PLOTS + 1):
+        inventory.add_plot(build_plot(size, plot_id, plot_id))
+
+    return inventory
+
+
+def build_operation(action: str):
+    return Operation({'name': action, 'description': action, 'model_path': '', 'model_class': '',
+                      'operation': action, 'variables': {'time': 5}})
+
+
+def bench_tree_init(size: int):
+
+    data = tree_data(size)
+
+    def run():
+        for values in data:
+            Tree(values)
+
+    return run
+
+
+def bench_tree_clone(size: int):
+
+    trees = [Tree(values) for values in tree_data(size)]
+
+    def run():
+        for tree in trees:
+            Tree().clone(tree)
+
+    return run
+
+
+def bench_tree_get_add_value(size: int):
+
+    trees = [Tree(values) for values in tree_data(size)]
+
+    def run():
+        for tree in trees:
+            tree.add_value('vol', tree.get_value('dbh') * tree.get_value('height'))
+
+    return run
+
+
+def bench_tree_sort(size: int):
+
+    plot = build_plot(size)
+    order_criteria = OrderCriteria(DESC)
+    order_criteria.add_criteria('dbh')
+
+    def run():
+        Tree.get_sord_and_order_tree_list(plot.trees, order_criteria=order_criteria)
+
+    return run
+
+
+def bench_plot_clone(size: int):
+
+    plot = build_plot(size)
+
+    def run():
+        Plot().clone(plot, True)
+
+    return run
+
+
+def bench_plot_recalculate(size: int):
+
+    plot = build_plot(size)
+
+    def run():
+        plot.recalculate()
+
+    return run
+
+
+def bench_plot_short_trees(size: int):
+
+    plot = build_plot(size)
+
+    def run():
+        plot.short_trees_on_list('dbh', DESC)
+
+    return run
+
+
+def bench_inventory_correct_plots(size: int):
+
+    inventory = build_inventory(size)
+    operation = build_operation('EXECUTION')
+
+    def run():
+        Inventory().correct_plots(inventory, operation)
+
+    return run
+
+
+def bench_step_to_xslt(size: int):
+
+    i18n.load_path.append(os.path.join(SRC_FOLDER, '..', 'translations'))
+    i18n.set('locale', 'es')
+    i18n.set('fallback', 'es')
+
+    labels = Simulation().get_labels()
+    inventory = build_inventory(size)
+    operation = build_operation('EXECUTION')
+    step = Step(1, inventory, OperationType('EXECUTION'), '', 40, 0, 0, operation, '')
+
+    def run():
+        workbook = Workbook()
+        workbook.active.title = labels['simanfor.general.Summary']
+        workbook.create_sheet(labels['simanfor.general.Plots'])
+        step.to_xslt(labels, workbook, 1, 8, None, None, 8)
+
+    return run
+
+
+BENCHMARKS = {
+    'tree_init': bench_tree_init,
+    'tree_clone': bench_tree_clone,
+    'tree_get_add_value': bench_tree_get_add_value,
+    'tree_sort': bench_tree_sort,
+    'plot_clone': bench_plot_clone,
+    'plot_recalculate': bench_plot_recalculate,
+    'plot_short_trees': bench_plot_short_trees,
+    'inventory_correct_plots': bench_inventory_correct_plots,
+    'step_to_xslt': bench_step_to_xslt
+}
+
+
+def measure(function, repeat: int = 5):
+    """
+    Returns the best time per call, in seconds, of repeat rounds of timeit.
+    """
+
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(names: list = None, sizes: list = None, repeat: int = 5):
+
+    results = dict()
+
+    for name in names if names is not None else BENCHMARKS.keys():
+        for size in sizes if sizes is not None else DEFAULT_SIZES:
+            key = '{}[{}]'.format(name, size)
+            results[key] = measure(BENCHMARKS[name](size), repeat)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Returns the benchmarks that are slower than the baseline by more than threshold,
+    as a list of (name, baseline time, current time).
+    """
+
+    regressions = list()
+
+    for key, value in results.items():
+        if key in baseline and value > baseline[key] * (1 + threshold):
+            regressions.append((key, baseline[key], value))
+
+    return regressions
+
+
+def print_results(results: dict, baseline: dict):
+
+    print('{:<32} {:>14} {:>14} {:>9}'.format('Benchmark', 'Baseline (us)', 'Current (us)', 'Change'))
+
+    for key, value in results.items():
+        if key in baseline:
+            print('{:<32} {:>14.2f} {:>14.2f} {:>8.1f}%'.format(
+                key, baseline[key] * 1000000, value * 1000000, (value / baseline[key] - 1) * 100))
+        else:
+            print('{:<32} {:>14} {:>14.2f} {:>9}'.format(key, '-', value * 1000000, '-'))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Simanfor data layer micro-benchmarks')
+
+    parser.add_argument('-b', metavar='benchmark', nargs='+', default=None, type=str,
+                        choices=list(BENCHMARKS.keys()), help='benchmarks to run (default: all)')
+    parser.add_argument('-s', metavar='size', nargs='+', default=DEFAULT_SIZES, type=int,
+                        help='plot sizes, in trees per plot')
+    parser.add_argument('-r', metavar='repeat', default=5, type=int, help='timing rounds per benchmark')
+    parser.add_argument('-t', metavar='threshold', default=DEFAULT_THRESHOLD, type=float,
+                        help='allowed slowdown over the baseline before failing (0.25 = 25%%)')
+    parser.add_argument('--baseline', metavar='baseline_file', default=BASELINE_FILE, type=str,
+                        help='baseline file (json format)')
+    parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+
+    args = parser.parse_args()
+
+    # log records are still created as in a real run, but not written anywhere
+    logging.basicConfig(level=logging.DEBUG, handlers=[logging.NullHandler()])
+
+    results = run_benchmarks(args.b, args.s, args.r)
+
+    baseline = dict()
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w') as outfile:
+            json.dump(baseline, outfile, indent=2, sort_keys=True)
+        return 0
+
+    regressions = compare(results, baseline, args.t)
+
+    for key, before, after in regressions:
+        print('REGRESSION {}: {:.2f} us -> {:.2f} us'.format(key, before * 1000000, after * 1000000))
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Scaling benchmark.
+
+Runs main.py on synthetic inventories of growing size, once per model and engine, and records for every run
+the throughput of the execution steps (trees x steps / s), the peak resident memory of the simulator process
+and the time spent writing the output files.
+
+    python scaling.py -w /tmp/simanfor-bench -p 1 10 1000 20000 -e 0 2 -m pp sylves_stand
+"""
+
+from generator import generate_inventory
+from generator import SPECIES
+from scenarios import MODELS
+from scenarios import write_scenario
+
+import subprocess
+import argparse
+import json
+import time
+import sys
+import os
+
+
+SRC_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'src')
+LOGGING_CONFIG = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'config_files', 'logging.conf')
+
+DEFAULT_PLOTS = [1, 10, 1000, 20000]
+DEFAULT_ENGINES = [0, 2]
+ENGINE_NAMES = {0: 'BasicEngine', 1: 'BasicEngine', 2: 'DaskEngine'}
+
+
+def run_simulator(scenario_path: str, engine: int, profile_path: str, work_folder: str, log_path: str):
+    """
+    Runs the simulator in a child process and returns its exit code, wall time and peak RSS (MB).
+    The process runs inside work_folder, so the log file it writes does not end up in the source tree.
+    """
+
+    command = [sys.executable, os.path.join(SRC_FOLDER, 'main.py'), '-s', scenario_path, '-e', str(engine),
+               '--profile', profile_path, '-logging_config_file', LOGGING_CONFIG]
+
+    start = time.perf_counter()
+
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(command, cwd=work_folder, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is reported in KB on Linux
+    return process.returncode, time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+def summarize_profile(profile_path: str):
+
+    with open(profile_path, 'r') as f:
+        profile = json.load(f)
+
+    trees_steps = 0
+    execution_time = 0.0
+    output_time = 0.0
+
+    for operation in profile['operations']:
+        if operation['action'] == 'EXECUTION':
+            trees_steps += operation['trees_in']
+            execution_time += operation['time']
+        elif operation['action'] == 'OUTPUT':
+            output_time += operation['time']
+
+    return {
+        'trees_steps': trees_steps,
+        'execution_time': execution_time,
+        'throughput': trees_steps / execution_time if execution_time > 0 else 0.0,
+        'output_time': output_time,
+        'total_time': profile['total_time']
+    }
+
+
+def run_benchmark(work_folder: str, plots: list, engines: list, models: list, trees_per_plot: int = 40,
+                  steps: int = 2, seed: int = 0):
+
+    os.makedirs(work_folder, exist_ok=True)
+
+    results = list()
+
+    for size in plots:
+
+        for model in models:
+
+            specie = MODELS[model][2]
+            inventory_path = os.path.join(work_folder, 'inventory_{}_{}_{}.xlsx'.format(
+                size, trees_per_plot, SPECIES[specie]))
+
+            if not os.path.exists(inventory_path):
+                generate_inventory(inventory_path, size, trees_per_plot, [specie], seed=seed)
+
+            for engine in engines:
+
+                name = '{}_{}_{}'.format(model, size, engine)
+                run_folder = os.path.join(work_folder, name)
+                os.makedirs(run_folder, exist_ok=True)
+
+                scenario_path = write_scenario(os.path.join(run_folder, 'scenario.json'), model, inventory_path,
+                                               os.path.join(run_folder, 'output_'), steps)
+                profile_path = os.path.join(run_folder, 'profile.json')
+
+                code, wall_time, peak_rss = run_simulator(scenario_path, engine, profile_path, run_folder,
+                                                          os.path.join(run_folder, 'run.log'))
+
+                result = {
+                    'model': model,
+                    'engine': ENGINE_NAMES.get(engine, str(engine)),
+                    'plots': size,
+                    'trees_per_plot': trees_per_plot,
+                    'steps': steps,
+                    'exit_code': code,
+                    'wall_time': wall_time,
+                    'peak_rss_mb': peak_rss
+                }
+
+                if code == 0 and os.path.exists(profile_path):
+                    result.update(summarize_profile(profile_path))
+
+                print_result(result)
+                results.append(result)
+
+    return results
+
+
+def print_result(result: dict):
+
+    if 'throughput' in result:
+        print('{:<14} {:<12} {:>7} plots  {:>12.1f} trees*steps/s  {:>9.1f} MB  output {:>8.3f} s  wall {:>8.3f} s'
+              .format(result['model'], result['engine'], result['plots'], result['throughput'],
+                      result['peak_rss_mb'], result['output_time'], result['wall_time']))
+    else:
+        print('{:<14} {:<12} {:>7} plots  failed with exit code {}'.format(
+            result['model'], result['engine'], result['plots'], result['exit_code']))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Simanfor scaling benchmark')
+
+    parser.add_argument('-w', metavar='work_folder', required=True, type=str,
+                        help='folder for the generated inventories, scenarios and outputs')
+    parser.add_argument('-p', metavar='plots', nargs='+', default=DEFAULT_PLOTS, type=int,
+                        help='inventory sizes (number of plots)')
+    parser.add_argument('-e', metavar='engine', nargs='+', default=DEFAULT_ENGINES, type=int,
+                        help='execution engines')
+    parser.add_argument('-m', metavar='model', nargs='+', default=list(MODELS.keys()), type=str,
+                        choices=list(MODELS.keys()), help='models to run')
+    parser.add_argument('-t', metavar='trees_per_plot', default=40, type=int, help='number of trees per plot')
+    parser.add_argument('-n', metavar='steps', default=2, type=int, help='number of execution steps')
+    parser.add_argument('-o', metavar='results_file', default=None, type=str,
+                        help='json file for the results (default: <work_folder>/results.json)')
+    parser.add_argument('--seed', metavar='seed', default=0, type=int, help='random seed')
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.w, args.p, args.e, args.m, args.t, args.n, args.seed)
+
+    with open(args.o if args.o is not None else os.path.join(args.w, 'results.json'), 'w') as outfile:
+        json.dump(results, outfile, indent=2)
+
+
+if __name__ == "__main__":
+    main()
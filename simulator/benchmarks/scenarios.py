@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Scenario templates for every shipped growth model, in the same json layout as the files in simulator/files.
+"""
+
+import json
+
+
+# name: (model path, model class, main specie, years per execution step)
+MODELS = {
+    'fsyl': ('models.trees.Fsylvatica__xx__v01', 'FagusSylvatica', 'Fagus sylvatica', 5),
+    'phal_ar': ('models.trees.Phalepensis__aragon__v01', 'PinusHalepensisAragon', 'Pinus halepensis', 10),
+    'phal_cat': ('models.trees.Phalepensis__cat_ar__v01', 'PinusHalepensisCataluña', 'Pinus halepensis', 10),
+    'pnig': ('models.trees.Pnigra__cat__v01', 'PinusNigraCataluña', 'Pinus nigra', 5),
+    'pp_gal': ('models.trees.Ppinaster_at__gal__v01', 'PinusPinasterGalicia', 'Pinus pinaster', 5),
+    'pp': ('models.trees.Ppinaster_me__sim__v01', 'PinusPinasterSIM', 'Pinus pinaster', 5),
+    'ppinea_and': ('models.trees.Ppinea__and__v01', 'PinusPineaAndalucia', 'Pinus pinea', 5),
+    'ppinea_cat': ('models.trees.Ppinea__cat__v01', 'PinusPineaCataluña', 'Pinus pinea', 5),
+    'ppinea_sc': ('models.trees.Ppinea__sc__v01', 'PinusPineaSistCentral', 'Pinus pinea', 5),
+    'prad': ('models.trees.Pradiata__gal__v01', 'PinusRadiataGalicia', 'Pinus radiata', 1),
+    'ps': ('models.trees.Psylvestris__sim__v01', 'PinusSylvestrisSIM', 'Pinus sylvestris', 5),
+    'qpyr': ('models.trees.Qpyrenaica__cyl__v01', 'QuercusPyrenaicaCyL', 'Quercus pyrenaica', 10),
+    'qrob': ('models.trees.Qrobur__gal__v01', 'QuercusRoburGalicia', 'Quercus robur', 5),
+    'qsub': ('models.trees.Qsuber__cat__v01', 'QuercusSuberCataluña', 'Quercus suber', 1),
+    'sylves_stand': ('models.stand.Psylvestris_stand__SILVES__mad__v01', 'Sylves', 'Pinus sylvestris', 5)
+}
+
+LOAD_MODEL = ('models.load.basic_load', 'BasicLoad')
+HARVEST_MODEL = ('models.harvest.cut_down_by_smallest', 'CutDownBySmallest')
+
+
+def operation(name: str, model_path: str, model_class: str, action: str, variables: dict):
+
+    return {
+        'name': name,
+        'description': name,
+        'model_path': model_path,
+        'model_class': model_class,
+        'operation': action,
+        'variables': variables
+    }
+
+
+def build_scenario(model: str, input_path: str, output_path: str, steps: int = 2, harvest: bool = True):
+    """
+    Builds a LOAD, INIT, <steps> x EXECUTION scenario for a shipped model, followed by a 10% thinning
+    (by smallest trees for tree models, by the model itself for stand models) when harvest is set.
+    """
+
+    model_path, model_class, specie, years = MODELS[model]
+    stand = model_path.startswith('models.stand')
+
+    operations = list()
+    operations.append(operation('Load', LOAD_MODEL[0], LOAD_MODEL[1], 'LOAD',
+                                {'init': 0, 'time': 0, 'input': input_path}))
+    operations.append(operation('Init', model_path, model_class, 'INIT', {'time': 0}))
+
+    for step in range(1, steps + 1):
+        variables = {'time': years}
+        if stand:
+            variables.update({'min_age': 0, 'max_age': 1000})
+        operations.append(operation('Execution ' + str(step), model_path, model_class, 'EXECUTION', variables))
+
+    if harvest:
+        harvest_path, harvest_class = (model_path, model_class) if stand else HARVEST_MODEL
+        operations.append(operation('Harvest', harvest_path, harvest_class, 'HARVEST',
+                                    {'time': 0, 'cut_down': 'PERCENTOFTREES', 'volumen': 10,
+                                     'min_age': 0, 'max_age': 1000}))
+
+    return {
+        'name': 'Benchmark ' + model,
+        'overwrite_output_file': 'YES',
+        'output_path': output_path,
+        'decimal_numbers': 2,
+        'zip_compression': 'NO',
+        'operations': {'operation_' + str(i): item for i, item in enumerate(operations)}
+    }
+
+
+def write_scenario(file_path: str, model: str, input_path: str, output_path: str, steps: int = 2,
+                   harvest: bool = True):
+
+    with open(file_path, 'w') as outfile:
+        json.dump(build_scenario(model, input_path, output_path, steps, harvest), outfile, indent=2,
+                  ensure_ascii=False)
+
+    return file_path
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Startup benchmark.
+
+Measures, in fresh interpreters, how long it takes to import the simulator entry point (optionally together with
+a model) and which heavy third party packages end up loaded. Importing main alone must not load any of them:
+the benchmark exits with an error when it does.
+
+    python startup.py
+    python startup.py -m models.trees.Ppinaster_me__sim__v01 -n 20
+"""
+
+import subprocess
+import argparse
+import statistics
+import json
+import sys
+import os
+
+
+SRC_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'src')
+
+HEAVY_PACKAGES = ['dask', 'distributed', 'openpyxl', 'scipy', 'pandas', 'numpy', 'xlrd']
+
+PROBE = '''
+import sys, time, json, importlib
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import main
+for module in {modules!r}:
+    importlib.import_module(module)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'time': elapsed, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+
+def probe(modules: list):
+
+    code = PROBE.format(src=SRC_FOLDER, modules=modules, heavy=HEAVY_PACKAGES)
+    output = subprocess.run([sys.executable, '-c', code], cwd=SRC_FOLDER, check=True,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def run_benchmark(modules: list = None, runs: int = 10):
+
+    modules = modules if modules is not None else list()
+
+    times = list()
+    loaded = list()
+
+    for _ in range(runs):
+        result = probe(modules)
+        times.append(result['time'])
+        loaded = result['loaded']
+
+    return {
+        'modules': ['main'] + modules,
+        'runs': runs,
+        'median': statistics.median(times),
+        'min': min(times),
+        'loaded': loaded
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Simanfor startup benchmark')
+
+    parser.add_argument('-m', metavar='module', nargs='*', default=None, type=str,
+                        help='extra modules to import after main (e.g. a model path)')
+    parser.add_argument('-n', metavar='runs', default=10, type=int, help='number of fresh interpreters')
+
+    args = parser.parse_args()
+
+    result = run_benchmark(args.m, args.n)
+
+    print('Imported:      ' + ', '.join(result['modules']))
+    print('Import time:   {:.1f} ms (median), {:.1f} ms (min) over {} runs'.format(
+        result['median'] * 1000, result['min'] * 1000, result['runs']))
+    print('Heavy modules: ' + (', '.join(result['loaded']) if len(result['loaded']) > 0 else 'none'))
+
+    if args.m is None and len(result['loaded']) > 0:
+        sys.exit('Heavy modules loaded at startup: ' + ', '.join(result['loaded']))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import argparse
+import json
+import os
+
+from util.tools import Tools
+from util.progress import Progress
+from service.runner import Runner
+from service.batch import BatchRunner
+
+
+def load_json(file_path: str):
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return json.loads(f.read())
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description='Simanfor batch simulator: runs many scenarios sharing their LOAD and INIT operations')
+
+    parser.add_argument('-s',
+                        metavar='scenario_file',
+                        nargs='+',
+                        default=None,
+                        type=str,
+                        help='scenario files (json format)')
+    parser.add_argument('-t',
+                        metavar='template_file',
+                        default=None,
+                        type=str,
+                        help='scenario template (json format), expanded with the parameter grid')
+    parser.add_argument('-g',
+                        metavar='grid_file',
+                        default=None,
+                        type=str,
+                        help='parameter grid (json format), e.g. {"operation_4.volumen": [10, 20, 30]}')
+    parser.add_argument('-w',
+                        metavar='workers',
+                        default=os.cpu_count(),
+                        type=int,
+                        help='number of scenarios run in parallel')
+    parser.add_argument('--plan',
+                        action='store_true',
+                        help='run the scenarios as a tree in one process, sharing every common leading operation')
+    parser.add_argument('--progress',
+                        metavar='progress_file',
+                        nargs='?',
+                        const='',
+                        default=None,
+                        type=str,
+                        help='report plots done, trees per second and time left of every operation on a '
+                             'progress line, or as json lines appended to progress_file')
+    parser.add_argument('-l',
+                        metavar='language',
+                        required=False,
+                        default='es',
+                        type=str,
+                        help='printing language')
+    parser.add_argument('-logging_config_file',
+                        metavar='logging_config_file',
+                        help='log config_file',
+                        type=str,
+                        default='../config_files/logging.conf')
+    parser.add_argument("-v",
+                        metavar='verbosity_level',
+                        default=0,
+                        type=int,
+                        help="increase output verbosity (DEBUG, INFO, WARNING, ERROR, CRITICAL). "
+                             "The default value is None")
+
+    args = parser.parse_args()
+
+    if (args.s is None) == (args.t is None) or (args.t is None) != (args.g is None):
+        parser.error('use either -s scenario files or -t template with -g grid')
+
+    Runner.load_translations(args.l)
+    Tools.load_logger_config(args.logging_config_file, level=args.v)
+
+    if args.s is not None:
+        configurations = [load_json(file_path) for file_path in args.s]
+    else:
+        configurations = BatchRunner.expand_grid(load_json(args.t), load_json(args.g))
+
+    runner = BatchRunner(args.w, args.plan)
+
+    if args.progress is not None:
+        runner.engine.set_progress(Progress(args.progress if args.progress != '' else None))
+
+    results = runner.run_batch(configurations)
+    runner.close()
+
+    for result in results:
+        if result['status'] == 'done':
+            print('{}: {} output files in {:.3f} s ({})'.format(
+                result['name'], len(result['files']), result['time'], result['output_path']))
+        else:
+            print('{}: failed, {}'.format(result['name'], result['error']))
+
+
+if __name__ == "__main__":
+    main()
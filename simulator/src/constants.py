@@ -16,6 +16,10 @@
 # ==============================================================================
 
 OUTPUT_FILE_BASE = 'Output_Plot_'
+# ages of the plots an operation is applied to when it has no min_age or max_age
+AGE_WINDOW = (0, 1000)
+# plot variables an Inventory keeps an index of, see Inventory.plots_by_age and Inventory.plots_by
+INDEXED_PLOT_VARIABLES = ['AGE', 'MAIN_SPECIE', 'PROVINCE', 'STUDY_AREA']
 OUTPUT_EXTENSION = ['xlsx', 'json']
 
 OUTPUT_NAMES = [
@@ -27,4 +27,6 @@ from .search.search_criteria import EQUAL
 from .search.search_criteria import GREATER
 from .search.search_criteria import GREATEREQUAL
 from .search.search_criteria import LESS
-from .search.search_criteria import LESSEQUAL
\ No newline at end of file
+from .search.search_criteria import LESSEQUAL
+from .tree_columns import TreeColumns
+from .plot_matrix import PlotMatrix
@@ -17,12 +17,15 @@
 
 from .tree import Tree
 from util import Tools
+from util import Tracer
 from .search.order_criteria import OrderCriteria
 from constants import PLOT_VARIABLE_NAMES
 from constants import OUTPUT_NAMES
+from constants import AGE_WINDOW
+from constants import INDEXED_PLOT_VARIABLES
 
-import numpy as np
 import logging
+import operator
 import math
 import i18n
 
@@ -36,34 +39,75 @@ ASC = 2
 
 class Plot:
 
+    # variables of the SPARQL JSON inventories read by map_json_to_xl
+    JSON_VARIABLES = ['plot', 'provincia', 'plotlat', 'plotlong', 'age']
+
+    # names of PLOT_VARIABLE_NAMES, their slots and a getter of their values, see layout
+    __layout = (None, None, None)
+    # the list the layout was built from and its length then
+    __layout_source = (None, -1)
+
+    @staticmethod
+    def layout():
+        """
+        Returns the variables of PLOT_VARIABLE_NAMES, a map from every name to its position (slot) and a getter
+        that reads all their values from a values dict at once, in that order. Growth models trim the list when
+        they are imported, only ever removing names, so the layout is built again whenever the length of the
+        list changed, without comparing the names on every call.
+        """
+
+        source, length = Plot.__layout_source
+
+        if source is not PLOT_VARIABLE_NAMES or length != len(PLOT_VARIABLE_NAMES):
+
+            names = list(PLOT_VARIABLE_NAMES)
+            slots = {name: position for position, name in enumerate(names)}
+            getter = operator.itemgetter(*names) if len(names) > 1 else lambda values: tuple(values[name] for name in names)
+
+            Plot.__layout = (names, slots, getter)
+            Plot.__layout_source = (PLOT_VARIABLE_NAMES, len(names))
+
+        return Plot.__layout
+
     @staticmethod
     def get_index_by_name(name):
-        return PLOT_VARIABLE_NAMES.index(name)
+
+        slots = Plot.layout()[1]
+
+        if name not in slots:
+            raise ValueError(repr(name) + ' is not in list')
+
+        return slots[name]
 
     @staticmethod
     def get_name_by_index(index):
         return PLOT_VARIABLE_NAMES[index]
 
-    def __init__(self, data=None):
+    def __init__(self, data=None, schema=None):
 
         self.__values = dict()
         self.__trees = dict()
         self.__dead_trees = dict()
         self.__cut_trees = dict()
         self.__added_trees = dict()
+        self.__shared = False  # the trees dict is shared with other plots, see share
+        self.__owners = list()  # inventories the plot is in, told when an indexed variable changes
 
         if data is None:
             Tools.print_log_line("No data info. The Plot has been created empty.", logging.WARNING)
-            for variable in PLOT_VARIABLE_NAMES:
-                self.__values[variable] = 0.0
+            self.__values = dict.fromkeys(PLOT_VARIABLE_NAMES, 0.0)
         else:
 
-            for variable in PLOT_VARIABLE_NAMES:
-                if variable not in data.keys():
-                    Tools.print_log_line(str(variable) + ' is not in data document', logging.WARNING)
-                    self.__values[variable] = 0.0
-                else:
-                    self.__values[variable] = data[variable]
+            if schema is not None and schema.matches(data):  # missing variables were logged by the reader
+                self.__values = dict.fromkeys(schema.names, 0.0)
+                self.__values.update((variable, data[variable]) for variable in schema.present)
+            else:
+                for variable in PLOT_VARIABLE_NAMES:
+                    if variable not in data.keys():
+                        Tools.print_log_line('%s is not in data document', logging.WARNING, args=(variable,))
+                        self.__values[variable] = 0.0
+                    else:
+                        self.__values[variable] = data[variable]
 
             self.__values[ID] = int(self.__values[ID])
 
@@ -82,8 +126,17 @@ class Plot:
     def get_value(self, var: str):
         return self.__values[var]
 
+    def own_trees(self):
+        """
+        Gives the plot its own copy of a trees dict shared by share, before the dict is changed.
+        """
+        if self.__shared:
+            self.__trees = dict(self.__trees)
+            self.__shared = False
+
     def add_tree(self, tree: Tree):
         if tree.get_value('status') is None:
+            self.own_trees()
             self.__trees[tree.id] = tree
         elif tree.get_value('status') == 'M':
             self.__dead_trees[tree.id] = tree
@@ -93,6 +146,7 @@ class Plot:
             self.__added_trees[tree.id] = tree
 
     def add_trees(self, trees: list):
+        self.own_trees()
         for tree in trees:
             if tree.get_value('status') is None:
                 self.__trees[tree.id] = tree
@@ -142,6 +196,9 @@ class Plot:
         return tmp
 
     def get_np_trees_array(self):
+
+        import numpy as np
+
         tmp = np.array([])
         for tree in self.__trees.values():
             tmp.append(tree.get_array())
@@ -153,17 +210,46 @@ class Plot:
         else:
             return sorted(self.__trees.values(), key=lambda tree: tree.get_value(variable), reverse=False)
 
+    def add_owner(self, inventory):
+        if not any(owner is inventory for owner in self.__owners):
+            self.__owners.append(inventory)
+
+    def remove_owner(self, inventory):
+        self.__owners = [owner for owner in self.__owners if owner is not inventory]
+
+    def changed(self, variable):
+        """
+        Tells the inventories the plot is in that an indexed variable (INDEXED_PLOT_VARIABLES) changed.
+        """
+        if variable in INDEXED_PLOT_VARIABLES:
+            for owner in self.__owners:
+                owner.plot_changed(variable)
+
+    def __getstate__(self):
+        # the inventories are not part of the plot, e.g. when the plot cache pickles it
+        state = self.__dict__.copy()
+        state['_Plot__owners'] = list()
+        return state
+
     def add_value(self, variable, value):
         self.__values[variable] = value
+        if self.__owners:
+            self.changed(variable)
 
     def set_value(self, variable, value):
         self.__values[variable] = value
+        if self.__owners:
+            self.changed(variable)
 
     def sum_value(self, variable, value):
         self.__values[variable] += value
+        if self.__owners:
+            self.changed(variable)
 
     def sub_value(self, variable, value):
         self.__values[variable] -= value
+        if self.__owners:
+            self.changed(variable)
 
 
 #########################################################################################################################
@@ -472,12 +558,42 @@ class Plot:
 
 
         
+    def copy_values(self, plot):
+        """
+        Copies the values of the variables of PLOT_VARIABLE_NAMES from plot, all of them in one pass.
+        """
+
+        names, slots, getter = Plot.layout()
+        self.__values.update(zip(names, getter(plot.values)))
+
+        if self.__owners:
+            for variable in INDEXED_PLOT_VARIABLES:
+                self.changed(variable)
+
+    def share(self, plot):
+        """
+        Copies the values of plot, but shares its trees instead of cloning them: the trees of both plots are the
+        same objects, kept in the same dict until one of the plots adds trees. Used for the plots an operation
+        leaves as they were, so every step only adds a copy of their values (e.g. to change AGE). Trees of a
+        shared plot must not be changed in place; the engines clone the trees they change.
+        """
+
+        self.copy_values(plot)
+
+        self.__trees = plot.__trees
+        self.__shared = True
+        plot.__shared = True
+
+    @property
+    def shared(self):
+        return self.__shared
+
     def clone(self, plot, full=False):
 
-        for variable in PLOT_VARIABLE_NAMES:
-            self.__values[variable] = plot.get_value(variable)
+        self.copy_values(plot)
 
         if full:
+            self.own_trees()
             for tree in plot.trees:
                 tmp_tree = Tree()
                 tmp_tree.clone(tree)
@@ -485,8 +601,8 @@ class Plot:
 
     def clone_by_variable(self, plot, variable: str, value):
 
-        for variable in PLOT_VARIABLE_NAMES:
-            self.__values[variable] = plot.get_value(variable)
+        self.copy_values(plot)
+        self.own_trees()
         for tree in plot.trees:
             if tree.get_value(variable) == value:
                 tmp_tree = Tree()
@@ -532,6 +648,7 @@ class Plot:
                 result += (100 - acumulate) * tree.basal_area
         return result / 100
 
+    @Tracer.traced('recalculate', 'recalculate')
     def recalculate(self):
 
         tree_expansion: float = 0.0
@@ -651,6 +768,7 @@ class Plot:
                 self.__values['DOMINANT_H'] = tree.height
                 self.__values['DENSITY'] = tree.expan
                 self.__values['AGE'] = tree.tree_age
+                self.changed('AGE')
                 self.__values['MEAN_DBH'] = tree.var_1
                 self.__values['QM_DBH'] = tree.dbh
                 self.__values['DOMINANT_DBH'] = tree.var_2
@@ -688,6 +806,16 @@ class Plot:
         return None
 
     def update_trees(self, variables: dict, action: int = 1):
+
+        if self.__shared:  # the trees are changed in place, so a shared plot gets its own clones first
+            trees = dict()
+            for tree in self.__trees.values():
+                tmp_tree = Tree()
+                tmp_tree.clone(tree)
+                trees[tmp_tree.id] = tmp_tree
+            self.__trees = trees
+            self.__shared = False
+
         for tree in self.__trees.values():
             for key, value in variables.items():
                 if action == 1:
@@ -876,8 +1004,7 @@ class Plot:
         
         operation_code = operation.type.get_code_name()    
         
-        min = next_operation.get_variable('min_age') if (next_operation != None and next_operation.has('min_age')) else 0
-        max = next_operation.get_variable('max_age') if (next_operation != None and next_operation.has('max_age')) else 1000
+        min, max = next_operation.age_window if next_operation != None else AGE_WINDOW
 
         if min <= self.age <= max:
         
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from constants import PLOT_VARIABLE_NAMES
+
+import numbers
+
+
+class PlotMatrix:
+    """
+    Plot variables of a list of plots as a dense float matrix, one row per plot and one column per variable of
+    PLOT_VARIABLE_NAMES, for the stand models that compute a step over all the plots at once (see
+    StandModel.batch). Values that are not numbers (None, text) are nan. matrix[variable] is the column of a
+    variable; setting a column, also of a variable that is not in the matrix yet, marks it to be written back to
+    the plots by write().
+    """
+
+    def __init__(self, plots: list, names: list = None):
+
+        import numpy as np
+
+        self.__plots = plots
+        self.__names = list(PLOT_VARIABLE_NAMES if names is None else names)
+        self.__index = {name: position for position, name in enumerate(self.__names)}
+        self.__changed = list()
+
+        self.__values = np.full((len(plots), len(self.__names)), np.nan)
+
+        for row, plot in enumerate(plots):
+            values = plot.values
+            for name, position in self.__index.items():
+                value = values.get(name)
+                if isinstance(value, numbers.Real) and not isinstance(value, bool):
+                    self.__values[row, position] = value
+
+    @property
+    def plots(self):
+        return self.__plots
+
+    @property
+    def names(self):
+        return self.__names
+
+    @property
+    def values(self):
+        return self.__values
+
+    @property
+    def changed(self):
+        return self.__changed
+
+    def __len__(self):
+        return len(self.__plots)
+
+    def __contains__(self, variable: str):
+        return variable in self.__index
+
+    def index(self, variable: str):
+        return self.__index[variable]
+
+    def __getitem__(self, variable: str):
+        return self.__values[:, self.__index[variable]]
+
+    def __setitem__(self, variable: str, values):
+
+        if variable not in self.__index:
+            import numpy as np
+            self.__index[variable] = len(self.__names)
+            self.__names.append(variable)
+            self.__values = np.hstack((self.__values, np.full((len(self.__plots), 1), np.nan)))
+
+        self.__values[:, self.__index[variable]] = values
+
+        if variable not in self.__changed:
+            self.__changed.append(variable)
+
+    def invalid_rows(self):
+        """
+        Positions of the plots with a changed value that is not finite, e.g. a division by zero in a batch equation.
+        """
+
+        if len(self.__changed) == 0:
+            return []
+
+        import numpy as np
+
+        columns = [self.__index[variable] for variable in self.__changed]
+        return np.flatnonzero(~np.isfinite(self.__values[:, columns]).all(axis=1)).tolist()
+
+    def write(self, skip: list = ()):
+        """
+        Writes the changed columns to the plots, except to the plots at the positions of skip.
+        """
+
+        skip = set(skip)
+
+        for variable in self.__changed:
+            column = self.__values[:, self.__index[variable]].tolist()
+            for row, plot in enumerate(self.__plots):
+                if row not in skip:
+                    plot.add_value(variable, column[row])
@@ -15,12 +15,26 @@
 # limitations under the License.
 # ==============================================================================
 
+import operator
+
 EQUAL = 1
 LESS = 2
 GREATER = 3
 LESSEQUAL = 4
 GREATEREQUAL = 5
 
+COMPARISONS = {
+    EQUAL: operator.eq,
+    LESS: operator.lt,
+    GREATER: operator.gt,
+    LESSEQUAL: operator.le,
+    GREATEREQUAL: operator.ge
+}
+
+
+def unknown_comparison(value, criteria_value):
+    return None
+
 
 class Criteria:
 
@@ -28,6 +42,7 @@ class Criteria:
         self.__variable = variable
         self.__value = value
         self.__comparison = comparison
+        self.__compare = COMPARISONS.get(comparison, unknown_comparison)
 
     @property
     def variable(self):
@@ -41,24 +56,22 @@ class Criteria:
     def comparison(self):
         return self.__comparison
 
-    def is_valid(self, value):
+    @property
+    def compare(self):
+        """
+        The comparison as a function of (value, criteria value), e.g. operator.lt for LESS.
+        """
+        return self.__compare
 
-        if self.__comparison == EQUAL:
-            return value == self.__value
-        if self.__comparison == LESS:
-            return value < self.__value
-        if self.__comparison == GREATER:
-            return value > self.__value
-        if self.__comparison == LESSEQUAL:
-            return value <= self.__value
-        if self.__comparison == GREATEREQUAL:
-            return value >= self.__value
+    def is_valid(self, value):
+        return self.__compare(value, self.__value)
 
 
 class SearchCriteria:
 
     def __init__(self):
         self.__criterios = list()
+        self.__predicate = None
 
     @property
     def criterion(self):
@@ -66,3 +79,24 @@ class SearchCriteria:
 
     def add_criteria(self, variable, valor, comparison):
         self.__criterios.append(Criteria(variable, valor, comparison))
+        self.__predicate = None
+
+    def compile(self):
+        """
+        Returns a function of an element (a tree) that is true when the element meets every criteria, reading
+        the variables with get_value. It stops at the first criteria the element does not meet.
+        """
+
+        if self.__predicate is None:
+
+            tests = [(criteria.variable, criteria.compare, criteria.value) for criteria in self.__criterios]
+
+            def predicate(element):
+                for variable, compare, value in tests:
+                    if not compare(element.get_value(variable), value):
+                        return False
+                return True
+
+            self.__predicate = predicate
+
+        return self.__predicate
@@ -16,7 +16,6 @@
 # ==============================================================================
 
 from util import Tools
-from .search.order_criteria import DESC
 
 import logging
 import json
@@ -119,7 +118,10 @@ JSON_STR_VALUES = ['PLOT_ID', 'TREE_ID', 'specie']
 
 class Tree:
 
-    def __init__(self, data=None):
+    # variables of the SPARQL JSON inventories read by map_json_to_xl
+    JSON_VARIABLES = ['tree', 'species', 'treelat', 'treelong', 'height', 'dbh1', 'dbh2', 'plot', 'dbh', 'expan']
+
+    def __init__(self, data=None, schema=None):
 
         self.__values = dict()
 
@@ -129,12 +131,16 @@ class Tree:
             for var_name in VARIABLE_NAMES:
                 self.__values[var_name] = 0
         else:
-            for var_name in VARIABLE_NAMES:
-                if var_name not in data.keys():
-                    Tools.print_log_line(var_name + ' is not in data document', logging.WARNING)
-                    self.__values[var_name] = 0
-                else:
-                    self.__values[var_name] = data[var_name]
+            if schema is not None and schema.matches(data):  # missing variables were logged by the reader
+                self.__values = dict.fromkeys(schema.names, 0)
+                self.__values.update((var_name, data[var_name]) for var_name in schema.present)
+            else:
+                for var_name in VARIABLE_NAMES:
+                    if var_name not in data.keys():
+                        Tools.print_log_line('%s is not in data document', logging.WARNING, args=(var_name,))
+                        self.__values[var_name] = 0
+                    else:
+                        self.__values[var_name] = data[var_name]
 
             if 'tree' in data: # json input
                 self.map_json_to_xl(data)
@@ -222,6 +228,10 @@ class Tree:
         except Exception as e:
             Tools.print_log_line(str(e) + ' when it tried to update variable ' + var + ' with value ' + str(value), logging.ERROR)
 
+    @property
+    def values(self):
+        return self.__values
+
     @property
     def plot_id(self):
         return int(self.__values['PLOT_ID'])
@@ -553,11 +563,6 @@ class Tree:
     @staticmethod
     def get_sord_and_order_tree_list(input, search_criteria=None, order_criteria=None):
 
-        def sort_key(element: Tree):
-            if element.get_value(order_criteria.get_first()) is None:
-                return 0.0
-            return element.get_value(order_criteria.get_first())
-
         if isinstance(input, dict):
             data = input.values()
         elif isinstance(input, list) or isinstance(input, {}.values().__class__):
@@ -566,23 +571,14 @@ class Tree:
             Tools.print_log_line('Input list must be list and dict', logging.WARNING)
             return None
 
-        tmp = list()
-
         if search_criteria is not None:
-            for tree in data:
-                valid = 0
-                for criteria in search_criteria.criterion:
-                    if criteria.is_valid(tree.get_value(criteria.variable)):
-                        valid += 1
-
-                if valid == len(search_criteria.criterion):
-                    tmp.append(tree)
+            valid = search_criteria.compile()
+            tmp = [tree for tree in data if valid(tree)]
         else:
-            for tree in data:
-                tmp.append(tree)
+            tmp = list(data)
 
         if order_criteria is not None:
-            tmp = sorted(tmp, key=sort_key, reverse=False if order_criteria.type == DESC else True)
+            tmp = order_criteria.sort(tmp)
 
         return tmp
 
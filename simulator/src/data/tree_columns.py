@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+class TreeColumns:
+    """
+    Variables of a list of trees as numpy columns, for the models that compute a stage over all the trees of a plot
+    at once (see TreeModel.run_stages). A column is read from the trees the first time it is used, and the columns
+    that are set are written back to the trees by write(), in one pass.
+    """
+
+    def __init__(self, trees: list):
+
+        self.__trees = trees
+        self.__columns = dict()
+        self.__changed = list()
+
+    @property
+    def trees(self):
+        return self.__trees
+
+    def __len__(self):
+        return len(self.__trees)
+
+    def __contains__(self, variable: str):
+        return variable in self.__columns
+
+    def __getitem__(self, variable: str):
+
+        column = self.__columns.get(variable)
+
+        if column is None:
+            import numpy as np
+            column = np.fromiter((tree.values[variable] for tree in self.__trees), dtype=float,
+                                 count=len(self.__trees))
+            self.__columns[variable] = column
+
+        return column
+
+    def __setitem__(self, variable: str, values):
+
+        import numpy as np
+
+        self.__columns[variable] = np.broadcast_to(np.asarray(values, dtype=float), (len(self.__trees),))
+
+        if variable not in self.__changed:
+            self.__changed.append(variable)
+
+    def sum(self, variable: str):
+        """
+        Sum of a column, added in the order of the trees like the per tree loops of the models did.
+        """
+        return sum(self[variable].tolist())
+
+    def write(self):
+        """
+        Writes the columns that were set back to the trees.
+        """
+
+        for variable in self.__changed:
+            for tree, value in zip(self.__trees, self.__columns[variable].tolist()):
+                tree.add_value(variable, value)
+
+        self.__changed = list()
+
+    def clear(self):
+        """
+        Forgets the columns read, so they are read again from the trees, e.g. after per tree code changed them.
+        """
+
+        self.write()
+        self.__columns = dict()
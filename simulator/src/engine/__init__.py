@@ -22,4 +22,11 @@ from .engine_factory import MACHINE
 from .engine_factory import CLUSTER
 from .engine_factory import SUPER
 from engine.engines.basic_engine import BasicEngine
-from engine.engines.dask_engine import DaskEngine
+
+
+def __getattr__(name):
+    # DaskEngine pulls in dask.distributed, so it is only imported when somebody asks for it
+    if name == 'DaskEngine':
+        from engine.engines.dask_engine import DaskEngine
+        return DaskEngine
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
@@ -27,6 +27,14 @@ from scenario import LOAD
 from scenario import INIT
 from scenario import EXECUTION
 from scenario import HARVEST
+from util.tracer import Tracer
+from util import Tools
+from data import Plot
+from data import PlotMatrix
+from constants import CUTTYPES_DICT
+
+import logging
+import time
 
 DEFAULT_CONFIG = {
     "processes": False,
@@ -38,15 +46,204 @@ DEFAULT_CONFIG = {
 
 class Engine(metaclass=ABCMeta):
 
+    __profiler = None
+    __plot_cache = None
+    __random = None
+    __progress = None
+    __memory = None
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    def set_profiler(self, profiler):
+        self.__profiler = profiler
+
+    @property
+    def plot_cache(self):
+        return self.__plot_cache
+
+    def set_plot_cache(self, plot_cache):
+        self.__plot_cache = plot_cache
+
+    @property
+    def random(self):
+        return self.__random
+
+    def set_random(self, random_state):
+        """
+        Sets the random.Random used by replicate runs: tree mortality is then drawn for every tree instead of
+        applied as a fraction of its expan. None goes back to deterministic runs.
+        """
+        self.__random = random_state
+
+    @property
+    def progress(self):
+        return self.__progress
+
+    def set_progress(self, progress):
+        self.__progress = progress
+
+    @property
+    def memory(self):
+        return self.__memory
+
+    def set_memory(self, memory):
+        self.__memory = memory
+
+    def plot_cache_key(self, plot, model, operation: Operation):
+        """
+        Key of the result of running operation on plot in the plot cache, or None when it must be computed:
+        there is no cache, the model is stochastic or mortality is drawn at random.
+        """
+
+        if self.__plot_cache is None or model.stochastic or self.__random is not None:
+            return None
+
+        return self.__plot_cache.key(plot, model, operation)
+
+    def trace_plots(self, plots, operation: Operation):
+        """
+        Iterates over the plots of an operation, wrapping the work done on each plot in its own trace span and
+        counting it as done in the progress reporter once the engine asks for the next one.
+        """
+
+        progress = self.__progress
+
+        if progress is None and not Tracer.enabled():
+            yield from plots
+            return
+
+        if progress is not None:
+            progress.start(operation, len(plots))
+
+        for plot in plots:
+            with Tracer.span('plot ' + str(plot.id), 'plot', {'operation': operation.name}):
+                yield plot
+            if progress is not None:
+                progress.update(plot.get_number_trees())
+
+        if progress is not None:
+            progress.finish()
+
+    def window_plots(self, inventory: Inventory, operation: Operation):
+        """
+        Returns the plots of inventory in the age window of operation, found with the age index of the inventory.
+        """
+
+        min, max = operation.age_window
+
+        plots = inventory.plots_by_age(min, max)
+
+        if len(plots) < inventory.get_number_plots():
+            Tools.print_log_line('%s plots out of the age window were not added', logging.INFO,
+                                 args=(inventory.get_number_plots() - len(plots),))
+
+        return plots
+
+    def apply_stand_model_batch(self, inventory: Inventory, model: StandModel, operation: Operation,
+                                harvest: bool = False):
+        """
+        Runs a stand model with batch set on every plot of the age window at once: the batch hook computes the new
+        plot variables as columns of a PlotMatrix, which are written to the cloned plots in one pass. A plot whose
+        new values are not finite, or every plot if the hook fails, is run again with the per plot model, so errors
+        are reported and left as they were.
+        """
+
+        import numpy as np
+
+        result_inventory = Inventory()
+
+        min, max = operation.age_window
+
+        plots = list()
+        new_plots = list()
+
+        for plot in self.trace_plots(self.window_plots(inventory, operation), operation):
+
+            new_plot = Plot()
+            new_plot.clone(plot)
+
+            plots.append(plot)
+            new_plots.append(new_plot)
+
+        fallback = range(len(plots))
+
+        if len(plots) > 0:
+
+            old_matrix = PlotMatrix(plots)
+            new_matrix = PlotMatrix(new_plots)
+
+            try:
+                with np.errstate(all='ignore'):
+                    if harvest:
+                        model.apply_cut_down_model_batch(old_matrix, new_matrix,
+                                                         CUTTYPES_DICT[operation.get_variable('cut_down')],
+                                                         operation.get_variable('volumen'),
+                                                         operation.get_variable('time'), min, max)
+                    else:
+                        model.apply_grow_model_batch(old_matrix, new_matrix, operation.get_variable('time'))
+
+                fallback = new_matrix.invalid_rows()
+                new_matrix.write(fallback)
+
+            except Exception as e:
+                Tools.print_log_line('Batch model failed, running it plot by plot: %s', logging.WARNING, args=(e,))
+
+        for position in fallback:
+
+            try:
+                if harvest:
+                    model.apply_cut_down_model(plots[position], new_plots[position],
+                                               CUTTYPES_DICT[operation.get_variable('cut_down')],
+                                               operation.get_variable('volumen'), operation.get_variable('time'),
+                                               min, max)
+                else:
+                    model.apply_grow_model(plots[position], new_plots[position], operation.get_variable('time'))
+            except Exception as e:
+                Tools.print_log_line(str(e), logging.ERROR)
+
+        for new_plot in new_plots:
+            result_inventory.add_plot(new_plot)
+
+        return result_inventory
+
     def apply_model(self, model, operation: Operation, inventory: Inventory = None):
 
+        with Tracer.span(operation.name, 'operation', {'action': operation.type.get_code_name()}):
+
+            if self.__memory is None:
+                return self.profile_model(model, operation, inventory)
+
+            with self.__memory.measure(operation.name, operation.type.get_code_name(), type(model).__name__):
+                return self.profile_model(model, operation, inventory)
+
+    def profile_model(self, model, operation: Operation, inventory: Inventory = None):
+
+        if self.__profiler is None:
+            return self.run_model(model, operation, inventory)
+
+        if not isinstance(model, LoadModel):
+            self.__profiler.instrument(model)
+
+        start = time.perf_counter()
+        new_inventory = self.run_model(model, operation, inventory)
+        self.__profiler.add_operation(operation, model, time.perf_counter() - start, inventory, new_inventory)
+
+        return new_inventory
+
+    def run_model(self, model, operation: Operation, inventory: Inventory = None):
+
         new_inventory: Inventory = None
         
-        print('##############################################################################')
-        print('RUN OPERATION: ' + operation.type.get_name())
-        print('##############################################################################')
+        Tools.print_banner('##############################################################################',
+                           'RUN OPERATION: ' + operation.type.get_name(),
+                           '##############################################################################',
+                           level=logging.INFO)
 
         if isinstance(model, LoadModel) and operation.type.action == LOAD:
+            if operation.has('workers'):
+                model.workers = operation.get_variable('workers')
             new_inventory = self.apply_load_model(operation.get_variable('input'), model, operation)
         if isinstance(model, HarvestModel) and operation.type.action == HARVEST:
             new_inventory = self.apply_harvest_model(inventory, model, operation)  
@@ -16,7 +16,6 @@
 # ==============================================================================
 
 from engine.engines.basic_engine import BasicEngine
-from engine.engines.dask_engine import DaskEngine
 from util import Tools
 
 import platform
@@ -51,6 +50,7 @@ class EngineFactory:
                 Tools.print_log_line('Windows os system does not support DASK engine, using default', logging.WARNING)
                 return BasicEngine(configuration)
             else:
+                from engine.engines.dask_engine import DaskEngine
                 return DaskEngine(configuration)
 
         return BasicEngine(configuration)
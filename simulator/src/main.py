@@ -16,24 +16,33 @@
 import argparse
 import logging
 import datetime
-import i18n
-import os
 
 from util.tools import Tools
+from util.profiler import Profiler
+from util.memory import MemoryProfiler
+from util.tracer import Tracer
+from util.plot_cache import PlotCache
+from util.plot_cache import DEFAULT_CACHE_SIZE
+from util.progress import Progress
 from scenario.scenario import Scenario
-from simulation.inventory import Inventory
-from engine import EngineFactory
+from scenario import ScenarioError
+from service.runner import Runner
 from engine import MACHINE
-from engine import CLUSTER
-from engine import SUPER
-from simulation import Simulation
 
-# import time
+import time
+
+
+def partition_size(value: str):
+
+    size = int(value)
+
+    if size < 1:
+        raise argparse.ArgumentTypeError('the partition size must be 1 plot or more, not ' + value)
+
+    return size
 
 
 def main():
-        
-    # start = time.time()
     
     parser = argparse.ArgumentParser(
         description='Simanfor simulator')
@@ -78,58 +87,128 @@ def main():
                         type=int,
                         help="increase output verbosity (DEBUG, INFO, WARNING, ERROR, CRITICAL). "
                              "The default value is None")
+    parser.add_argument('--profile',
+                        metavar='profile_file',
+                        nargs='?',
+                        const='',
+                        default=None,
+                        type=str,
+                        help='time every operation and model call, print a summary at the end of the run '
+                             'and write it as json (default: <output_path>profile.json)')
+    parser.add_argument('--memory',
+                        metavar='memory_file',
+                        nargs='?',
+                        const='',
+                        default=None,
+                        type=str,
+                        help='trace the memory allocated by every operation and the output, print a summary at the '
+                             'end of the run and write it as json (default: <output_path>memory.json)')
+    parser.add_argument('--partition',
+                        metavar='plots',
+                        required=False,
+                        default=None,
+                        type=partition_size,
+                        help='run the scenario on partitions of this many plots, writing the output files of '
+                             'every partition before the next one starts, so memory depends on the partition size')
+    parser.add_argument('--trace',
+                        metavar='trace_file',
+                        required=False,
+                        default=None,
+                        type=str,
+                        help='write a Chrome trace-event file (chrome://tracing, speedscope) of the run')
+    parser.add_argument('--cache',
+                        metavar='cache_path',
+                        required=False,
+                        default=None,
+                        type=str,
+                        help='reuse the plots grown by earlier runs with the same plot, model and variables, '
+                             'stored in this folder (never used for stochastic models)')
+    parser.add_argument('--cache_size',
+                        metavar='megabytes',
+                        required=False,
+                        default=DEFAULT_CACHE_SIZE,
+                        type=int,
+                        help='size of the plot cache, the least recently used plots are removed beyond it')
+
+    parser.add_argument('--progress',
+                        metavar='progress_file',
+                        nargs='?',
+                        const='',
+                        default=None,
+                        type=str,
+                        help='report plots done, trees per second and time left of every operation on a '
+                             'progress line, or as json lines appended to progress_file')
 
     args = parser.parse_args()
 
-    translations_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "translations")
-    i18n.load_path.append(translations_path)
-    i18n.set('locale', args.l)
-    i18n.set('fallback', 'es')
+    Runner.load_translations(args.l)
 
     Tools.load_logger_config(args.logging_config_file, level=args.v)
 
-    inventory: Inventory = None
+    if args.trace is not None:
+        Tracer.start()
+
     configuration = None
 
     scenario: Scenario = Scenario(args.s)
-    simulation = Simulation()
-
-    engine = EngineFactory.load_engine(args.e, configuration)
-    step = 1
-
-    for operation in scenario.operations:
-
-        Tools.print_log_line('Executing operation: ' + operation.name, logging.INFO, name='logger_dev')
-        model = Tools.import_module(operation.model_class, operation.model_path, operation.variables)
-        inventory = engine.apply_model(model, operation, inventory)
-        simulation.add_step(step, inventory, operation, model)
-
-        step += 1
-
-    # mid = time.time()
-    # print("Models executions finished after", (mid - start), "seconds.")
-
-    if args.e == MACHINE:
-        simulation.generate_results(
-            scenario.name,
-            scenario.output_path,
-            scenario.modelo,
-            scenario.ext,
-            scenario.zip_compression,
-            scenario.decimal_numbers)
-    elif args.e in [CLUSTER, SUPER]:
-        simulation.generate_results_parallel(
-            scenario.name,
-            scenario.output_path,
-            scenario.modelo,
-            scenario.ext,
-            scenario.zip_compression,
-            scenario.decimal_numbers)        
-
-    engine.close()
-
-    # end = time.time()
-    # print("Program finished after", (end - start), "seconds.")
+    runner = Runner(args.e, configuration)
+
+    profiler: Profiler = None
+
+    if args.profile is not None:
+        profiler = Profiler()
+        runner.engine.set_profiler(profiler)
+
+    memory: MemoryProfiler = None
+
+    if args.memory is not None:
+        memory = MemoryProfiler()
+        runner.engine.set_memory(memory)
+
+    if args.cache is not None:
+        runner.engine.set_plot_cache(PlotCache(args.cache, args.cache_size))
+
+    if args.progress is not None:
+        runner.engine.set_progress(Progress(args.progress if args.progress != '' else None))
+
+    simulation = None
+
+    try:
+        if args.partition is not None:
+            runner.run_partitioned(scenario, args.partition)  # every partition writes its own output files
+        else:
+            simulation = runner.run(scenario)
+    except ScenarioError as e:
+        Tools.print_log_line(str(e), logging.ERROR)
+        runner.close()
+        parser.exit(1, str(e) + '\n')
+
+    start = time.perf_counter()
+
+    if simulation is not None and memory is not None:
+        with memory.measure('output', 'OUTPUT'):
+            runner.write_results(simulation, scenario)
+    elif simulation is not None:
+        runner.write_results(simulation, scenario)
+
+    if profiler is not None:
+        if simulation is not None:
+            profiler.add_section('output', time.perf_counter() - start)
+        profiler.print_summary()
+        profiler.write_json(args.profile if args.profile != '' else scenario.output_path + 'profile.json')
+
+    if memory is not None:
+        memory.print_summary()
+        memory.write_json(args.memory if args.memory != '' else scenario.output_path + 'memory.json')
+
+    if args.trace is not None:
+        Tracer.write(args.trace)
+
+    if args.cache is not None:
+        Tools.print_log_line('Plot cache: ' + str(runner.engine.plot_cache.hits) + ' hits, ' +
+                             str(runner.engine.plot_cache.misses) + ' misses', logging.INFO)
+
+    runner.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from data import Plot
+
+
+class CompetitionContext:
+    """
+    Competition covariates of the trees of a plot, computed once per plot and step by the engines (see
+    TreeModel.competition_context) and passed to survives and grow, so the per tree work is only the species
+    equation. Every covariate is a numpy array with a value per tree, in the order the trees were given;
+    position(tree) is the index of a tree. A variable a tree does not have is nan, and a ratio whose plot
+    divisor is missing or zero is None, so the equation that reads it fails and is logged by the engine as before.
+
+    bal                 basal area of the larger trees (m2/ha), as left by the last initialize or process_plot
+    bal_ratio           bal / G
+    relative_dbh        dbh / QM_DBH
+    basal_area_ratio    g * 0.01 / G, with g the basal area of the tree (cm2), as the models write g/G
+    """
+
+    def __init__(self, plot: Plot, trees: list):
+
+        import numpy as np
+
+        self.__plot = plot
+        self.__positions = {id(tree): position for position, tree in enumerate(trees)}
+
+        plot_basal_area = plot.basal_area
+        qm_dbh = plot.qm_dbh
+
+        dbh = np.array([tree.dbh for tree in trees], dtype=float)
+        basal_area = np.array([tree.basal_area for tree in trees], dtype=float)
+
+        # the stored bal, which every tree model reads; after a harvest it still counts the trees that were cut
+        self.__bal = np.array([tree.bal for tree in trees], dtype=float)
+
+        self.__bal_ratio = CompetitionContext.divide(self.__bal, plot_basal_area)
+        self.__relative_dbh = CompetitionContext.divide(dbh, qm_dbh)
+        self.__basal_area_ratio = CompetitionContext.divide(basal_area * 0.01, plot_basal_area)
+
+    @staticmethod
+    def divide(values, denominator):
+
+        if denominator is None or denominator == 0:
+            return None
+        return values / denominator
+
+    @property
+    def plot(self):
+        return self.__plot
+
+    @property
+    def bal(self):
+        return self.__bal
+
+    @property
+    def bal_ratio(self):
+        return self.__bal_ratio
+
+    @property
+    def relative_dbh(self):
+        return self.__relative_dbh
+
+    @property
+    def basal_area_ratio(self):
+        return self.__basal_area_ratio
+
+    def __len__(self):
+        return len(self.__positions)
+
+    def __contains__(self, tree):
+        return id(tree) in self.__positions
+
+    def position(self, tree):
+        return self.__positions[id(tree)]
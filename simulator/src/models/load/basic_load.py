@@ -39,4 +39,13 @@ class BasicLoad(LoadModel):
 
         Tools.print_log_line('Generating initial inventory', logging.INFO)
         reader: ExcelReader = ExcelReader(file_path, DEFAULT_EXCEL_FILE_STRUCTURE)
-        return Inventory(reader)
+        return Inventory(reader, workers=self.workers)
+
+    def apply_model_partitions(self, file_path: str, years: int, size: int):
+
+        if file_path is None:
+            return iter(())
+
+        Tools.print_log_line('Generating initial inventory in partitions of %s plots', logging.INFO, args=(size,))
+        reader: ExcelReader = ExcelReader(file_path, DEFAULT_EXCEL_FILE_STRUCTURE)
+        return Inventory.read_partitions(reader, size)
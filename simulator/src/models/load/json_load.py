@@ -21,6 +21,10 @@ from models import LoadModel
 
 from reader import JSONReader
 import json
+from data import Plot
+from data import Tree
+from data.tree import VARIABLE_NAMES
+from constants import PLOT_VARIABLE_NAMES
 from simulation import Inventory
 from util import Tools
 
@@ -41,5 +45,18 @@ class JsonLoad(LoadModel):
             return None
 
         Tools.print_log_line('Generating initial inventory', logging.INFO)
-        reader: JSONReader = JSONReader(input_files)
-        return Inventory(reader)
+        return Inventory(self.reader(input_files), workers=self.workers)
+
+    def apply_model_partitions(self, input_files: list, years: int, size: int):
+
+        if not isinstance(input_files, dict) or len(input_files) < 2:
+            return iter(())
+
+        Tools.print_log_line('Generating initial inventory in partitions of %s plots', logging.INFO, args=(size,))
+        return Inventory.read_partitions(self.reader(input_files), size)
+
+    @staticmethod
+    def reader(input_files: dict):
+        # only the variables Plot and Tree read are kept from the rows
+        return JSONReader(input_files, {'plots': Plot.JSON_VARIABLES + PLOT_VARIABLE_NAMES,
+                                        'trees': Tree.JSON_VARIABLES + VARIABLE_NAMES})
@@ -28,7 +28,8 @@ class LoadModel(metaclass=ABCMeta):
     def __init__(self, name: str, version: int):
         self.__name = name
         self.__version = version
-        Tools.print_log_line("Loading load model " + str(self.name) + "(" + str(self.version) + ")", logging.INFO)
+        self.__workers = 1
+        Tools.print_log_line("Loading load model %s(%s)", logging.INFO, args=(self.name, self.version))
 
     @property
     def name(self):
@@ -38,6 +39,28 @@ class LoadModel(metaclass=ABCMeta):
     def version(self):
         return self.__version
 
+    @property
+    def workers(self):
+        """
+        Processes used to build the inventory, the workers variable of the LOAD operation; see Inventory.
+        """
+        return self.__workers
+
+    @workers.setter
+    def workers(self, workers: int):
+        self.__workers = workers
+
     @abstractmethod
     def apply_model(self, file_path: str, years: int):
         return
+
+    def apply_model_partitions(self, file_path: str, years: int, size: int):
+        """
+        Yields the inventory in partitions of at most size plots. Load models that read the plots as they go
+        override it; by default the whole inventory is loaded and then partitioned.
+        """
+
+        inventory = self.apply_model(file_path, years)
+
+        if inventory is not None:
+            yield from inventory.partitions(size)
@@ -18,9 +18,10 @@
 from models.stand_model import StandModel
 from data import Tree
 from data import Plot
+from data import PlotMatrix
 from data import DESC
 from data import ASC
-# from util import Tools
+from util import Tools
 # from data.search.order_criteria import OrderCriteria
 from constants import CUTTYPES_DICT
 from constants import PLOT_VARIABLE_NAMES
@@ -44,6 +45,8 @@ import os
 
 class Sylves(StandModel):
 
+    batch = True  # apply_grow_model and apply_cut_down_model are also run over all the plots at once
+
     def __init__(self, configuration=None):
         super().__init__(name="Sylves", version=1)
 
@@ -72,9 +75,9 @@ class Sylves(StandModel):
             Ref.: del Río and Montero, 2011        
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('               Pinus sylvestris "SILVES" model (Spain) is running             ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '               Pinus sylvestris "SILVES" model (Spain) is running             ',
+                           '#----------------------------------------------------------------------------#')
 
         try:
 
@@ -234,81 +237,10 @@ class Sylves(StandModel):
 
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('               Pinus sylvestris "SILVES" model (Spain) is running             ')
-        print('#----------------------------------------------------------------------------#')
-
-        if time != 5:
-            print('BE CAREFUL! That model was developed to xx year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (xx year execution). If not, the output values will be not correct.')
-
+        # the equations are those of apply_grow_model_batch, run on this plot alone
         try:
-
-            # new_plot.add_value('AGE', old_plot.age + time)  # store new age in database
-            # BE CAREFUL!! Is not needed to store the new plot age on the 'AGE' variable, the simulator will do it by his own.
-            # if you need to use the "actualised" age, just create another new variable to do it.
-            new_age = old_plot.age + time
-
-            # That line is not needed; at the start, old_plot and new_plot values are the same
-            # new_plot.add_value('SI', old_plot.si)  # store Site Index in database, constant value for each plot
-
-            # Dominant Height
-            parA17 = 1.9962
-            parB17 = 0.2642
-            parC17 = 0.46
-            parA29 = 3.1827
-            parB29 = 0.3431
-            parC29 = 0.3536
-            H0_17 = 10 * parA17 * pow(1 - math.exp(float(-1 * parB17 * new_age / 10)), 1 / parC17)  # Dominant height at plot age if site index was 17
-            H0_29 = 10 * parA29 * pow(1 - math.exp(float(-1 * parB29 * new_age / 10)), 1 / parC29)  # Dominant height at plot age if site index was 29
-            Dom_Height = H0_17 + (H0_29 - H0_17) * ( old_plot.si / 10 - 1.7 ) / 1.2  # Dominant height at plot age for actual site index 
-            new_plot.add_value('DOMINANT_H', Dom_Height)  # store Dominant height in database
-
-            # Basal Area        
-            parA0 = 5.103222
-            parB0 = 1.42706
-            parB1 = 0.388317
-            parB2 = -30.691629
-            parB3 = 1.034549
-            Basal_area =  pow(old_plot.basal_area, old_plot.age/new_age) * math.exp(parA0*(1 - old_plot.age/new_age))  # basal area calculus
-            new_plot.add_value('BASAL_AREA', Basal_area)  # store basal area in database
-
-            # Mortality
-            parA0 = -2.34935
-            parA1 = 0.000000099
-            parA2 = 4.87390
-            TPH = pow( pow( old_plot.density, parA0) + parA1 * ( pow( new_age / 100, parA2) - pow( old_plot.age / 100, parA2 ) ), 1 / parA0 )  # density calculus; new value of trees per hectare
-            new_plot.add_value('DENSITY', TPH)  # store trees per hectare in database
-
-            # VOLUME
-            # Volume_W_Bark_new = math.exp(parB0 + parB1*old_plot.si/10 + parB2/old_plot.age + parB3*math.log(old_plot.basal_area))  # calculate new volume 
-            # Volume_W_Bark = math.exp(parB0 + parB1*old_plot.si/10 + parB2/new_age + parB3*(old_plot.age/new_age)*math.log(old_plot.basal_area) + parB3*parA0*(1 - old_plot.age/new_age))  # calculate new volume
-            # new_plot.add_value('VOL', Volume_W_Bark)  # store total stand volume with bark in database
-
-            # as temporal solution, I used the vol equation changing the values to the new situation, because INIT and CUTS are using the same equation
-            Volume_W_Bark_mix = math.exp(parB0 + parB1*old_plot.si/10 + parB2/new_age + parB3*math.log(new_plot.basal_area))  # calculate new volume 
-            new_plot.add_value('VOL', Volume_W_Bark_mix) 
-
-            # Mean Height 
-            parA0 = -1.155649
-            parA1 = 0.976772
-            H_mean = parA0 + parA1 * new_plot.dominant_h  # calculus of mean height
-            new_plot.add_value('MEAN_H', H_mean)  # store mean height in database
-
-
-            # QUADRATIC Mean Diameter:      
-            MTBA = new_plot.basal_area * 10000 / new_plot.density  # Mean Tree Basal Area
-            QMD  = 2 * math.sqrt( MTBA / math.pi )  # Quadratic mean diameter
-            new_plot.add_value('QM_DBH',  QMD)  # store quadratic mean diameter
-
-            # Reineke Index
-            Reineke = new_plot.density * pow(25 / new_plot.qm_dbh, -1.75)  # Reineke density index
-            new_plot.add_value('REINEKE', Reineke)  # store Reineke index in database
-
-            # Hart index
-            Hart = 10000 / (new_plot.dominant_h * math.sqrt(new_plot.density)) # Hart index
-            new_plot.add_value('HART', Hart)  # Store Hart index in database
-
+            self.run_batch_on_plot(old_plot, new_plot,
+                                   lambda old_plots, new_plots: self.apply_grow_model_batch(old_plots, new_plots, time))
         except Exception:
             self.catch_model_exception()
 
@@ -329,93 +261,150 @@ class Sylves(StandModel):
 
         # trimType values: ( ByTallest, BySmallest, Systematic ) --> Thinning types
         # cutDownType values: ( PercentOfTrees, Volume, Area )   --> Variable used to evaluate the thinning
-        # volume ---> value: (% of "Variable" reduced after the thinning) 
+        # volume ---> value: (% of "Variable" reduced after the thinning)
 
-        print('#----------------------------------------------------------------------------#')
-        print('               Pinus sylvestris "SILVES" model (Spain) is running             ')
-        print('#----------------------------------------------------------------------------#')
+        # the equations are those of apply_cut_down_model_batch, run on this plot alone
+        try:
+            self.run_batch_on_plot(old_plot, new_plot,
+                                   lambda old_plots, new_plots: self.apply_cut_down_model_batch(
+                                       old_plots, new_plots, cut_criteria, volume, time, min_age, max_age))
+        except Exception:
+            self.catch_model_exception()
 
-        if time != 0:
-            print('BE CAREFUL! When you plan a HARVEST the time must be 0, and you wrote a', time, 'years for the harvest period!')
-            print('Please, change your time value to 0 and run your scenario again.')
 
-        try:
+    def apply_grow_model_batch(self, old_plots: PlotMatrix, new_plots: PlotMatrix, time: int):
+        """
+        Growth equations of apply_grow_model over the columns of all the plots; apply_grow_model runs them on one plot.
+        """
 
-            value = volume
-            # new_plot.add_value('VAR_9', value);
-                     
-            # That line is not needed; at the start, old_plot and new_plot values are the same
-            # new_plot.add_value('AGE', old_plot.age)  # store new age in database, it is supposed to be the same
-            # new_plot.add_value('SI', old_plot.si)  # Dominant height at plot age for actual site index 
-
-            # DOMINANT Height  -->  nothing changes with time = 0
-            # parA17 = 1.9962
-            # parB17 = 0.2642
-            # parC17 = 0.46
-            # parA29 = 3.1827
-            # parB29 = 0.3431
-            # parC29 = 0.3536
-            # H0_17 = 10 * parA17 * pow( 1 - math.exp( -1 * parB17 * old_plot.age / 10 ), 1 / parC17 )
-            # H0_29 = 10 * parA29 * pow( 1 - math.exp( -1 * parB29 * old_plot.age / 10 ), 1 / parC29 )
-            # Dom_Height = H0_17 + ( H0_29 - H0_17 ) * ( old_plot.si / 10 - 1.7 ) / 1.2   # Dominant height at plot age for actual site index 
-            # new_plot.add_value('DOMINANT_H', Dom_Height)  # store Dominant height in database
-
-            # Parameter for Volume and Basal Area equations
-            # parA0 = 5.103222
-            parB0 = 1.42706
-            parB1 = 0.388317
-            parB2 = -30.691629
-            parB3 = 1.034549
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '               Pinus sylvestris "SILVES" model (Spain) is running             ',
+                           '#----------------------------------------------------------------------------#')
 
-            # Thinning parameters
-            if cut_criteria == CUTTYPES_DICT['PERCENTOFTREES']:
-                tpuN = value/100  # ratio of thinning trees per hectare and total before thinning
-                TPH = (1 - tpuN)*old_plot.density  # trees per hectare after thinning
-                
-                parC0 = 0.531019
-                parC1 = 0.989792
-                parC2 = 0.517850
-                QMD = parC0 + parC1*old_plot.qm_dbh + parC2*old_plot.qm_dbh*pow(tpuN, 2)  # equation to calculate quadratic mean diameter
-                MTBA = math.pi*pow(QMD/2, 2)  # average mean basal area
-                SBA = MTBA*TPH/10000  # trees per hectare
-                Volume = math.exp(parB0 + parB1*old_plot.si/10 + parB2/old_plot.age + parB3*math.log(SBA))  # equation to calculate volume
-
-                      
-            elif cut_criteria == CUTTYPES_DICT['AREA']:
-                tpuBA = value/100  # ratio of thinning basal area and total before thinning
-                SBA = (1 - tpuBA)*old_plot.basal_area  # basal area after thinning
-                
-                parC0 = 0.144915
-                parC1 = 0.969819
-                parC2 = 0.678010
-                QMD = pow(parC0 + parC1*pow(old_plot.qm_dbh, 0.5) + parC2*tpuBA, 2)  # equation to calculate quadratic mean diameter
-                MTBA = math.pi*pow(QMD/2, 2)  # average mean basal area
-                TPH = SBA * 10000 / MTBA  # trees per hectare
-                Volume = math.exp(parB0 + parB1*old_plot.si/10 + parB2/old_plot.age + parB3*math.log(SBA))  # equation to calculate volume
-
-
-            elif cut_criteria == CUTTYPES_DICT['VOLUME']:
-                tpuVOL = value/100  # ratio of thinning volume and total before thinning
-                Volume = ( 1 - tpuVOL )*old_plot.vol  # volume after thinning
-                
-                ### Provided we do not have equations for thinning by volume, stimations are based on stimations by basal area
-                parC0 = 0.144915
-                parC1 = 0.969819
-                parC2 = 0.678010
-                SBA = math.exp( -1*parB0 - parB1*old_plot.si/10 - parB2/old_plot.age + math.log(Volume)/parB3)  # equation to calculate stand basal area
-                tpuBA = 1 - SBA/old_plot.basal_area  # ratio of thinning basal area and total before thinning
-                QMD = pow(parC0 + parC1*pow(old_plot.qm_dbh, 0.5) + parC2*tpuBA, 2)  # equation to calculate quadratic mean diameter
-                MTBA = math.pi*pow(QMD/2, 2)  # average mean basal area
-                TPH = SBA*10000/MTBA # trees per hectare
-
-            
-            new_plot.add_value('DENSITY', TPH)  # store trees per hectare in database
-            new_plot.add_value('QM_DBH', QMD)  # store quadratic mean diameter
-            new_plot.add_value('BASAL_AREA', SBA)  # store basal area in database
-            new_plot.add_value('VOL', Volume)  # store total stand volume with bark in database
+        if time != 5:
+            Tools.print_banner('BE CAREFUL! That model was developed to xx year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (xx year execution). If not, the output values will be not correct.', level=logging.WARNING)
+
+        age = old_plots['AGE']
+        si = old_plots['SI']
+        new_age = age + time
+
+        # Dominant Height
+        parA17 = 1.9962
+        parB17 = 0.2642
+        parC17 = 0.46
+        parA29 = 3.1827
+        parB29 = 0.3431
+        parC29 = 0.3536
+        H0_17 = 10 * parA17 * np.power(1 - np.exp(-1 * parB17 * new_age / 10), 1 / parC17)
+        H0_29 = 10 * parA29 * np.power(1 - np.exp(-1 * parB29 * new_age / 10), 1 / parC29)
+        new_plots['DOMINANT_H'] = H0_17 + (H0_29 - H0_17) * ( si / 10 - 1.7 ) / 1.2
+
+        # Basal Area
+        parA0 = 5.103222
+        parB0 = 1.42706
+        parB1 = 0.388317
+        parB2 = -30.691629
+        parB3 = 1.034549
+        new_plots['BASAL_AREA'] = np.power(old_plots['BASAL_AREA'], age/new_age) * np.exp(parA0*(1 - age/new_age))
+
+        # Mortality
+        parA0 = -2.34935
+        parA1 = 0.000000099
+        parA2 = 4.87390
+        new_plots['DENSITY'] = np.power( np.power( old_plots['DENSITY'], parA0) + parA1 * ( np.power( new_age / 100, parA2) - np.power( age / 100, parA2 ) ), 1 / parA0 )
+
+        # VOLUME
+        new_plots['VOL'] = np.exp(parB0 + parB1*si/10 + parB2/new_age + parB3*np.log(new_plots['BASAL_AREA']))
+
+        # Mean Height
+        parA0 = -1.155649
+        parA1 = 0.976772
+        new_plots['MEAN_H'] = parA0 + parA1 * new_plots['DOMINANT_H']
+
+        # QUADRATIC Mean Diameter
+        MTBA = new_plots['BASAL_AREA'] * 10000 / new_plots['DENSITY']
+        new_plots['QM_DBH'] = 2 * np.sqrt( MTBA / math.pi )
+
+        # Reineke Index
+        new_plots['REINEKE'] = new_plots['DENSITY'] * np.power(25 / new_plots['QM_DBH'], -1.75)
+
+        # Hart index
+        new_plots['HART'] = 10000 / (new_plots['DOMINANT_H'] * np.sqrt(new_plots['DENSITY']))
+
+
+    def apply_cut_down_model_batch(self, old_plots: PlotMatrix, new_plots: PlotMatrix,
+                                   cut_criteria, volume, time,
+                                   min_age, max_age):
+        """
+        Thinning equations of apply_cut_down_model over the columns of all the plots; apply_cut_down_model runs them
+        on one plot.
+        """
 
-        except Exception:
-            self.catch_model_exception()
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '               Pinus sylvestris "SILVES" model (Spain) is running             ',
+                           '#----------------------------------------------------------------------------#')
+
+        if time != 0:
+            Tools.print_banner('BE CAREFUL! When you plan a HARVEST the time must be 0, and you wrote a ' + str(time) + ' years for the harvest period!',
+                               'Please, change your time value to 0 and run your scenario again.', level=logging.WARNING)
+
+        value = volume
+        age = old_plots['AGE']
+        si = old_plots['SI']
+        qm_dbh = old_plots['QM_DBH']
+
+        # Parameter for Volume and Basal Area equations
+        parB0 = 1.42706
+        parB1 = 0.388317
+        parB2 = -30.691629
+        parB3 = 1.034549
+
+        # Thinning parameters
+        if cut_criteria == CUTTYPES_DICT['PERCENTOFTREES']:
+            tpuN = value/100
+            TPH = (1 - tpuN)*old_plots['DENSITY']
+
+            parC0 = 0.531019
+            parC1 = 0.989792
+            parC2 = 0.517850
+            QMD = parC0 + parC1*qm_dbh + parC2*qm_dbh*pow(tpuN, 2)
+            MTBA = math.pi*np.power(QMD/2, 2)
+            SBA = MTBA*TPH/10000
+            Volume = np.exp(parB0 + parB1*si/10 + parB2/age + parB3*np.log(SBA))
+
+        elif cut_criteria == CUTTYPES_DICT['AREA']:
+            tpuBA = value/100
+            SBA = (1 - tpuBA)*old_plots['BASAL_AREA']
+
+            parC0 = 0.144915
+            parC1 = 0.969819
+            parC2 = 0.678010
+            QMD = np.power(parC0 + parC1*np.power(qm_dbh, 0.5) + parC2*tpuBA, 2)
+            MTBA = math.pi*np.power(QMD/2, 2)
+            TPH = SBA * 10000 / MTBA
+            Volume = np.exp(parB0 + parB1*si/10 + parB2/age + parB3*np.log(SBA))
+
+        elif cut_criteria == CUTTYPES_DICT['VOLUME']:
+            tpuVOL = value/100
+            Volume = ( 1 - tpuVOL )*old_plots['VOL']
+
+            parC0 = 0.144915
+            parC1 = 0.969819
+            parC2 = 0.678010
+            SBA = np.exp( -1*parB0 - parB1*si/10 - parB2/age + np.log(Volume)/parB3)
+            tpuBA = 1 - SBA/old_plots['BASAL_AREA']
+            QMD = np.power(parC0 + parC1*np.power(qm_dbh, 0.5) + parC2*tpuBA, 2)
+            MTBA = math.pi*np.power(QMD/2, 2)
+            TPH = SBA*10000/MTBA
+
+        else:
+            raise ValueError('Sylves has no thinning equations for cut criteria ' + str(cut_criteria))
+
+        new_plots['DENSITY'] = TPH
+        new_plots['QM_DBH'] = QMD
+        new_plots['BASAL_AREA'] = SBA
+        new_plots['VOL'] = Volume
 
 
     def vars():
@@ -20,6 +20,7 @@ from abc import ABCMeta
 from abc import abstractmethod
 from data import Tree
 from data import Plot
+from data import PlotMatrix
 from util import Tools
 
 import logging
@@ -28,6 +29,11 @@ import math
 
 class StandModel(metaclass=ABCMeta):
 
+    # models that only change plot variables can set batch and implement apply_grow_model_batch and
+    # apply_cut_down_model_batch, then the engines run them once over a PlotMatrix of all the plots of the
+    # operation instead of once per plot (see Engine.apply_stand_model_batch)
+    batch = False
+
     def __init__(self, name: str, version: int):
         self.__tree = None
         self.__name = name
@@ -50,3 +56,38 @@ class StandModel(metaclass=ABCMeta):
     @abstractmethod
     def apply_cut_down_model(self, plot: Plot, new_plot: Plot,):
         return
+
+    @staticmethod
+    def run_batch_on_plot(plot: Plot, new_plot: Plot, batch):
+        """
+        Runs batch, a function of (plots, new_plots) such as a batch hook, on one plot, so the per plot methods of the
+        batch models share their equations. The changed values are written to new_plot; if any of them is not
+        finite (e.g. a division by zero) nothing is written and ValueError is raised.
+        """
+
+        import numpy as np
+
+        plots = PlotMatrix([plot])
+        new_plots = PlotMatrix([new_plot])
+
+        with np.errstate(all='ignore'):
+            batch(plots, new_plots)
+
+        if len(new_plots.invalid_rows()) > 0:
+            raise ValueError('Values that are not finite for plot ' + str(plot.id) + ': ' +
+                             ', '.join(new_plots.changed))
+
+        new_plots.write()
+
+    def apply_grow_model_batch(self, plots: PlotMatrix, new_plots: PlotMatrix, years: int):
+        """
+        Batch version of apply_grow_model: plots and new_plots hold a row per plot, new_plots the values to change.
+        """
+        raise NotImplementedError(type(self).__name__ + ' has no batch grow model')
+
+    def apply_cut_down_model_batch(self, plots: PlotMatrix, new_plots: PlotMatrix, cut_criteria, volume, time,
+                                   min_age, max_age):
+        """
+        Batch version of apply_cut_down_model: plots and new_plots hold a row per plot, new_plots the values to change.
+        """
+        raise NotImplementedError(type(self).__name__ + ' has no batch cut down model')
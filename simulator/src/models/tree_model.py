@@ -20,23 +20,26 @@ from abc import ABCMeta
 from abc import abstractmethod
 from data import Tree
 from data import Plot
+from data import TreeColumns
 from util import Tools
-from scipy import integrate
 from models.trees import *
+from models.competition import CompetitionContext
 
 import logging
 import math
-import numpy as np
 
 
 class TreeModel(metaclass=ABCMeta):
 
+    # models that read the CompetitionContext of the plot in survives and grow set it to True, see competition_context
+    competition = False
+
     def __init__(self, name: str, version: int):
         self.__tree = None
         self.__name = name
         self.__version = version
 
-        Tools.print_log_line("Loading model " + str(self.name) + "(" + str(self.version) + ")", logging.INFO)
+        Tools.print_log_line("Loading model %s(%s)", logging.INFO, args=(self.name, self.version))
 
     @property
     def name(self):
@@ -50,6 +53,62 @@ class TreeModel(metaclass=ABCMeta):
     def tree(self):
         return self.__tree
 
+    @property
+    def stochastic(self):
+        """
+        Models whose results depend on random draws return True, so the engines never reuse their results.
+        """
+        return False
+
+    def competition_context(self, plot: Plot, trees: list):
+        """
+        Called by the engines once per plot and step, before survives and grow are called for its trees.
+        Models with competition set get the CompetitionContext of the trees, which the engines pass to survives
+        and grow as their context argument; the others get None and are called without it.
+        """
+        return CompetitionContext(plot, trees) if self.competition else None
+
+    @staticmethod
+    def tree_context(plot: Plot, tree: Tree, context: CompetitionContext = None):
+        """
+        Returns context and the position of tree in it. When the model is called outside the engines, e.g.
+        directly from a test, the context is built from the living trees of plot, and tree.
+        """
+
+        if context is None or tree not in context:
+            trees = [plot_tree for plot_tree in plot.trees if plot_tree.status is None and plot_tree is not tree]
+            context = CompetitionContext(plot, trees + [tree])
+
+        return context, context.position(tree)
+
+    def run_stages(self, plot: Plot, trees: list, stages: list, tree_stages: list = ()):
+        """
+        Columnar version of the per tree loop of initialize and process_plot. Every stage is a function of
+        (plot, columns) that computes tree variables over whole TreeColumns; the results are written back to the
+        trees, and then every tree stage, a per tree hook such as merch_classes, is run on each tree for the work
+        that has no column version. Returns the columns, so the plot totals are column sums of the same pass.
+        Numeric errors raise, as they did in the per tree code, instead of leaving nan values.
+        """
+
+        import numpy as np
+
+        columns = TreeColumns(trees)
+
+        if len(trees) > 0:
+            with np.errstate(divide='raise', over='raise', invalid='raise'):
+                for stage in stages:
+                    stage(plot, columns)
+
+        columns.write()
+
+        if len(tree_stages) > 0:
+            for tree in trees:
+                for tree_stage in tree_stages:
+                    tree_stage(tree)
+            columns.clear()
+
+        return columns
+
     def set_tree(self, tree: Tree):
         Tools.print_log_line("Loading tree (" + tree.id + ") into model" + self.tree + "(" + self.version + ")", logging.INFO)
         self.__tree = tree
@@ -119,7 +178,11 @@ class TreeModel(metaclass=ABCMeta):
         That function must be activated by using merch_classes function on the model, and it will need his taper_equation_with_bark function to calculate it
         """
 
+        from scipy import integrate
+        import numpy as np
+
         ht = tree.height  # total height as ht to simplify
+        taper_equation_with_bark = model().taper_equation_with_bark  # one model instance for every log of the tree
 
         global usage  # share that dictionary to give access in other functions
         usage = {}  # that dictionary will obtain the values of usage acceptability for each tree
@@ -151,17 +214,17 @@ class TreeModel(metaclass=ABCMeta):
             vol = 0
             count += 1  # that variable allow us to go over the lists
             if i == True:  # if the log satisfy the restrictions...
-                dr = model().taper_equation_with_bark(tree, hro)  # diameter of tree at the stump height
+                dr = taper_equation_with_bark(tree, hro)  # diameter of tree at the stump height
                 while dr > class_conditions[count][3] and (hro + 0.05/ht <= 1):  # if the diameter > dmax, and hr <= 1...
                     hro += 0.05 / ht  # we go over the log looking for the part with diameter <= dmax for that usage
-                    dr = model().taper_equation_with_bark(tree, hro)  # we calculate the diameter on the next point, to verify the conditions
+                    dr = taper_equation_with_bark(tree, hro)  # we calculate the diameter on the next point, to verify the conditions
                 while dr >= class_conditions[count][2] and (hro + class_conditions[count][1] <= 1):  # satisfying dmax, if diameter > dmin and hro is between integration limits (0-1)...
                     hro += class_conditions[count][1]  # from the start point on the tree, we add the length of a log with the usage specifications
-                    dr = model().taper_equation_with_bark(tree, hro)  # we again calculate the diameter at this point; the second while condition has sense in here, to not get over 1 integration limit
+                    dr = taper_equation_with_bark(tree, hro)  # we again calculate the diameter at this point; the second while condition has sense in here, to not get over 1 integration limit
                     if dr >= class_conditions[count][2] and hro <= 1:  # as taper equation reduce the diameter, it is not needed to check it
                     # if the log diameter > dmin, and hro doesn't overpass 1 (integration limit)
                         hr = np.arange((hro - class_conditions[count][1]), hro, 0.001)  # integration conditions for taper equation
-                        d = model().taper_equation_with_bark(tree, hr)  # we get the taper equation with the previous conditions
+                        d = taper_equation_with_bark(tree, hr)  # we get the taper equation with the previous conditions
                         f = (d / 20) ** 2  # to calculate the volume (dm3), we change the units of the result and calculate the radius^2 (instead of diameter)
                         vol += math.pi * ht * 10 * (integrate.simps(f, hr))  # volume calculation, using the previous information
                 if i == True:  # once the tree finish all the while conditions, it comes here, because it continues verifying that condition
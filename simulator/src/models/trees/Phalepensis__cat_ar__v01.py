@@ -21,7 +21,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -68,9 +67,9 @@ class PinusHalepensisCataluña(TreeModel):
             Ref.: Montero et al, 2002
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                 Pinus halepensis model (Cataluña) is running                 ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                 Pinus halepensis model (Cataluña) is running                 ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be announced
 
@@ -236,13 +235,13 @@ class PinusHalepensisCataluña(TreeModel):
         The equations on that function are the same that in "initialize" function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                 Pinus halepensis model (Cataluña) is running                 ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                 Pinus halepensis model (Cataluña) is running                 ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != 10:
-            print('BE CAREFUL! That model was developed to 10 year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (10 year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to 10 year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (10 year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be announced
 
@@ -396,6 +395,8 @@ class PinusHalepensisCataluña(TreeModel):
         That function is run by initialize and process_plot functions.
         """
 
+        from scipy import integrate
+
         hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
         dob = self.taper_equation_with_bark(tree, hr)  # diameter over bark using taper equation (cm)
         # dub = self.taper_equation_without_bark(tree, hr)  # diameter under/without bark using taper equation (cm)
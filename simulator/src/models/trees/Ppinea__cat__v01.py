@@ -21,7 +21,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -96,9 +95,9 @@ class PinusPineaCataluña(TreeModel):
             Ref.: Cañadas et al, 2005
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                   Pinus pinea model (Cataluña) is running                    ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                   Pinus pinea model (Cataluña) is running                    ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be announced
             
@@ -270,13 +269,13 @@ class PinusPineaCataluña(TreeModel):
         The equations on that function are the same that in "initialize" function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                   Pinus pinea model (Cataluña) is running                    ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                   Pinus pinea model (Cataluña) is running                    ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != 5:
-            print('BE CAREFUL! That model was developed to 5 year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (5 year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to 5 year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (5 year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be announced
 
@@ -547,6 +546,8 @@ class PinusPineaCataluña(TreeModel):
         That function is run by initialize and process_plot functions.
         """
 
+        from scipy import integrate
+
         hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
         dob = self.taper_equation_with_bark(tree, hr)  # diameter over bark using taper equation (cm)
         dub = self.taper_equation_without_bark(tree, hr)  # diameter under/without bark using taper equation (cm)
@@ -17,11 +17,12 @@
 
 
 from models import TreeModel
+from models.competition import CompetitionContext
 from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
+from data import TreeColumns
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -32,6 +33,8 @@ import logging
 import numpy as np
 import os
 
+from types import SimpleNamespace
+
 # Pinus radiata model (Galicia, Spain), version 01
 # Written by iuFOR
 # Sustainable Forest Management Research Institute UVa-INIA, iuFOR (University of Valladolid-INIA)
@@ -40,6 +43,8 @@ import os
 
 class PinusRadiataGalicia(TreeModel):
 
+    competition = True  # survives and grow read BAL, dbh/Dg and g/G from the CompetitionContext
+
 
     def __init__(self, configuration=None):
         super().__init__(name="Pinus radiata - Galicia", version=1)
@@ -62,9 +67,9 @@ class PinusRadiataGalicia(TreeModel):
             Ref.: Diéguez-Aranda et al, 2006
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                   Pinus radiata model (Galicia) is running                   ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                   Pinus radiata model (Galicia) is running                   ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be announced
             
@@ -78,46 +83,25 @@ class PinusRadiataGalicia(TreeModel):
             plot.add_value('SI', SI)  # Site Index (m) calculation
             
             plot_trees: list[Tree] = plot.short_trees_on_list('dbh', DESC)  # stablish an order to calculate tree variables
-            bal: float = 0
-
-            for tree in plot_trees:  # for each tree...
-
-                #-----------------------------------BASAL AREA-----------------------------------------#
-
-                tree.add_value('bal', bal)  # the first tree must receive 0 value (m2)
-                tree.add_value('basal_area', math.pi * (tree.dbh / 2) ** 2)  # normal (at 1.30m) section (cm2) calculation
-                tree.add_value('ba_ha', tree.basal_area * tree.expan / 10000)  # basimetric area per ha (m2/ha)
-                bal += tree.basal_area * tree.expan / 10000  # then, that value is acumulated
-
-                tree.add_value('hd_ratio', tree.height * 100 / tree.dbh)  # height/diameter ratio (%) calculation
-                tree.add_value('normal_circumference', math.pi * tree.dbh)  # normal (at 1.30m) circumference (cm) calculation
-
-                #-----------------------------------HEIGHT-----------------------------------------#
-
-                if tree.height == 0:  # if the tree hasn't height (m) value, it is calculated
-                    a = 0.0296
-                    b = 1.633
-                    tree.add_value('height', (1.3**b + (plot.dominant_h**b - 1.3**b) * (1 - math.exp(-a*tree.dbh)) / (1 - math.exp(-a*plot.dominant_diameter))**(1/b)))
 
-                #-----------------------------------FUNCTIONS-----------------------------------------#
+            # every stage runs over the columns of all the trees at once; wood uses are still calculated tree by tree
+            columns = self.run_stages(plot, plot_trees,
+                                      [self.basal_area_columns,
+                                       self.height_columns,
+                                       lambda plot, columns: self.crown_columns(plot, columns, 'initialize'),
+                                       self.vol_columns,
+                                       self.biomass_columns],
+                                      [self.merch_classes])
 
-                self.crown(tree, plot, 'initialize')  # activate crown variables calculation
+            self.merch_classes_plot(plot, columns)  # activate wood uses (plot) variables calculation
 
-                self.vol(tree, plot)  # activate volume variables calculation
-                
-                self.merch_classes(tree)  # activate wood uses variables calculation
-
-                self.biomass(tree)  # activate biomass variables calculation
-
-            self.merch_classes_plot(plot)  # activate wood uses (plot) variables calculation
-
-            self.biomass_plot(plot)  # activate biomass (plot) variables calculation         
+            self.biomass_plot(plot, columns)  # activate biomass (plot) variables calculation
 
         except Exception:
             self.catch_model_exception()
 
 
-    def survives(self, time: int, plot: Plot, tree: Tree):
+    def survives(self, time: int, plot: Plot, tree: Tree, context: CompetitionContext = None):
         """
         Survive function. The trees that are death appear on the output with "M" on the "State of the tree" column
         Source:
@@ -125,13 +109,15 @@ class PinusRadiataGalicia(TreeModel):
             Ref.: Crecente-Campo, 2008
         """
 
-        BALMOD = (1 - (1 - (tree.bal/plot.basal_area))) / plot.hart
-        p_survive = 1 / (1 + math.exp(-2.093 - 3.214*(tree.dbh/plot.qm_dbh) - 0.001096*(tree.dbh**2) + 0.03703*plot.basal_area - 0.07873*plot.dominant_h + 0.3036*BALMOD))
+        context, i = self.tree_context(plot, tree, context)
+
+        BALMOD = (1 - (1 - context.bal_ratio[i])) / plot.hart
+        p_survive = 1 / (1 + math.exp(-2.093 - 3.214*context.relative_dbh[i] - 0.001096*(tree.dbh**2) + 0.03703*plot.basal_area - 0.07873*plot.dominant_h + 0.3036*BALMOD))
         
         return p_survive  # calculated to 1 year execution
 
 
-    def grow(self, time: int, plot: Plot, old_tree: Tree, new_tree: Tree):
+    def grow(self, time: int, plot: Plot, old_tree: Tree, new_tree: Tree, context: CompetitionContext = None):
         """
         Function that run the diameter and height growing equations
         Source:
@@ -139,8 +125,10 @@ class PinusRadiataGalicia(TreeModel):
             Ref.: Crecente-Campo, 2008
         """
 
-        BALMOD = (1 - (1 - (old_tree.bal/plot.basal_area))) / plot.hart
-        BAR = (old_tree.basal_area*0.01)/plot.basal_area  # is a basal area ratio (g/G, where g is the basal area of the tree (m2))
+        context, i = self.tree_context(plot, old_tree, context)
+
+        BALMOD = (1 - (1 - context.bal_ratio[i])) / plot.hart
+        BAR = context.basal_area_ratio[i]  # is a basal area ratio (g/G, where g is the basal area of the tree (m2))
 
         ig = 0.3674 * (old_tree.dbh**2.651) * (plot.basal_area**(-0.7540)) * math.exp(-0.05207*old_tree.tree_age - 0.05291*BALMOD -102*BAR)
 
@@ -149,7 +137,7 @@ class PinusRadiataGalicia(TreeModel):
 
 
 
-        RBA_D = ((old_tree.basal_area*0.01)/plot.basal_area) ** (old_tree.dbh/plot.qm_dbh)  # a ratio basal area-diameter ([g/G]d/Dg)
+        RBA_D = context.basal_area_ratio[i] ** context.relative_dbh[i]  # a ratio basal area-diameter ([g/G]d/Dg)
 
         if plot.si == 0:
             htg1: float = 0
@@ -195,46 +183,33 @@ class PinusRadiataGalicia(TreeModel):
         The equations on that function are the same that in "initialize" function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                   Pinus radiata model (Galicia) is running                   ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                   Pinus radiata model (Galicia) is running                   ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != 1:
-            print('BE CAREFUL! That model was developed to 1 year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (1 year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to 1 year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (1 year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be announced
 
             plot_trees: list[Tree] = plot.short_trees_on_list('dbh', DESC)  # stablish an order to calculate tree variables
-            bal: float = 0.0
-
-            for tree in plot_trees:  # for each tree...
-
-                if tree.status is None:  # only update tree alive data
-
-                #-----------------------------------BASAL AREA-----------------------------------------#
+            alive_trees: list[Tree] = [tree for tree in plot_trees if tree.status is None]  # only update tree alive data
 
-                    tree.add_value('bal', bal)  # the first tree must receive 0 value (m2)
-                    tree.add_value('basal_area', math.pi * (tree.dbh / 2) ** 2)  # normal (at 1.30m) section (cm2) calculation
-                    tree.add_value('ba_ha', tree.basal_area * tree.expan / 10000)  # basimetric area per ha (m2/ha)
-                    bal += tree.basal_area * tree.expan / 10000  # then, that value is acumulated
+            # every stage runs over the columns of the alive trees at once; wood uses are still calculated tree by tree
+            columns = self.run_stages(plot, alive_trees,
+                                      [self.basal_area_columns,
+                                       lambda plot, columns: self.crown_columns(plot, columns, 'process_plot'),
+                                       self.vol_columns,
+                                       self.biomass_columns],
+                                      [self.merch_classes])
 
-                    tree.add_value('hd_ratio', tree.height * 100 / tree.dbh)  # height/diameter ratio (%) calculation
-                    tree.add_value('normal_circumference', math.pi * tree.dbh)  # normal (at 1.30m) circumference (cm) calculation
+            if len(alive_trees) < len(plot_trees):  # the plot values are added over all the trees
+                columns = TreeColumns(plot_trees)
 
-                    #-----------------------------------FUNCTIONS-----------------------------------------#
+            self.merch_classes_plot(plot, columns)  # activate wood uses (plot) variables calculation
 
-                    self.crown(tree, plot, 'process_plot')  # activate crown variables calculation
-
-                    self.vol(tree, plot)  # activate volume variables calculation
-                    
-                    self.merch_classes(tree)  # activate wood uses variables calculation
-
-                    self.biomass(tree)  # activate biomass variables calculation
-
-            self.merch_classes_plot(plot)  # activate wood uses (plot) variables calculation
-
-            self.biomass_plot(plot)  # activate biomass (plot) variables calculation       
+            self.biomass_plot(plot, columns)  # activate biomass (plot) variables calculation
 
         except Exception:
             self.catch_model_exception()
@@ -287,21 +262,8 @@ class PinusRadiataGalicia(TreeModel):
         alpha2 = (1 - p2) ** (((b3 - b2) * k) / (b2 * b3))
 
         if isinstance(hr, float) == False:  # on the cases where hr is an array...
-            I1 = []  # we create two lists of values
-            I2 = []
-            for i in hr:  # for each hr value, we calculate the values of the other 2 parameters
-                if p1 <= i and i <= p2:
-                    a = 1
-                else:
-                    a = 0
-                if p2 <= i and i <= 1:
-                    b = 1
-                else:
-                    b = 0
-                I1.append(a)  # we add the parameters to the lists
-                I2.append(b)
-            I1 = np.array(I1)  # when the lists are full, we transform list into array to simplify the following calculations
-            I2 = np.array(I2)
+            I1 = ((p1 <= hr) & (hr <= p2)).astype(int)  # 1 where hr is between p1 and p2, 0 elsewhere
+            I2 = ((p2 <= hr) & (hr <= 1)).astype(int)  # 1 where hr is between p2 and 1, 0 elsewhere
         else:  # on the case we have only 1 value to hr, we add the values to the parameters directly
             if p1 <= hr and hr <= p2:
                 I1 = 1
@@ -317,16 +279,11 @@ class PinusRadiataGalicia(TreeModel):
         ro = (1 - hst / ht) ** (k / b1)
         r1 = (1 - p1) ** (k / b1)
         r2 = (1 - p2) ** (k / b2)
-        c1 = math.sqrt((ao * (dbh ** a1) * (h ** (a2 - (k / b1))) / (b1 * (ro - r1) + b2 * (r1 - alpha1 * r2) + b3 * alpha1 * r2)))
-
-        if isinstance(hr, float) == False:  # on the cases where hr is an array...    
-            dob = []
-            counter = 0
-            for x in hr:  # for each hr value, we calculate the values of dob
-                d = (c1 * (math.sqrt(ht ** ((k - b1) / b1) * (1 - hr[counter]) ** ((k - beta[counter]) / beta[counter]) * alpha1 ** (I1[counter] + I2[counter]) * alpha2 ** (I2[counter]))))
-                dob.append(d)  # we add the value to a list
-                counter += 1
-            dob = np.array(dob)  # and transform the list to an array 
+        c1 = np.sqrt((ao * (dbh ** a1) * (h ** (a2 - (k / b1))) / (b1 * (ro - r1) + b2 * (r1 - alpha1 * r2) + b3 * alpha1 * r2)))
+
+        if isinstance(hr, float) == False:  # on the cases where hr is an array, dob is calculated for every hr value at once
+            # dbh and ht can also be columns of trees (see vol_columns), then dob has one row per tree
+            dob = c1 * np.sqrt(ht ** ((k - b1) / b1) * (1 - hr) ** ((k - beta) / beta) * alpha1 ** (I1 + I2) * alpha2 ** (I2))
         else:  # on the case we have only 1 value to hr, we calculate dob directly
             dob = (c1 * (math.sqrt(ht ** ((k - b1) / b1) * (1 - hr) ** ((k - beta) / beta) * alpha1 ** (I1 + I2) * alpha2 ** (I2))))
  
@@ -382,17 +339,22 @@ class PinusRadiataGalicia(TreeModel):
             tree.add_value(k, merch_list[counter])  # add merch_list values to each usage
 
 
-    def merch_classes_plot(self, plot: Plot):
+    def merch_classes_plot(self, plot: Plot, columns: TreeColumns = None):
         """
         Function to calculate the wood uses values to the plot.
         That function is run by initialize and process_plot functions.
+        With the columns of run_stages, the plot values are the sums of the columns.
         """
 
-        plot_trees: list[Tree] = plot.short_trees_on_list('dbh', DESC)  # stablish an order to calculate tree variables
-
         plot_unwinding = plot_veneer = plot_saw_big = plot_saw_small = plot_saw_canter = plot_post = plot_stake = plot_chips =  0
 
-        for tree in plot_trees:  # for each tree, we are going to add the simple values to the plot value
+        if columns is not None:
+            plot_saw_big = columns.sum('saw_big')
+            plot_saw_small = columns.sum('saw_small')
+            plot_saw_canter = columns.sum('saw_canter')
+            plot_chips = columns.sum('chips')
+
+        for tree in (plot.short_trees_on_list('dbh', DESC) if columns is None else []):  # for each tree, we are going to add the simple values to the plot value
 
             # plot_unwinding += tree.unwinding
             # plot_veneer += tree.veneer 
@@ -413,6 +375,90 @@ class PinusRadiataGalicia(TreeModel):
         plot.add_value('CHIPS', plot_chips/1000)
 
 
+    def basal_area_columns(self, plot: Plot, columns: TreeColumns):
+        """
+        Basal area stage of run_stages: the trees must be sorted by dbh (DESC) to accumulate bal.
+        """
+
+        dbh = columns['dbh']
+
+        columns['basal_area'] = math.pi * (dbh / 2) ** 2  # normal (at 1.30m) section (cm2) calculation
+        columns['ba_ha'] = columns['basal_area'] * columns['expan'] / 10000  # basimetric area per ha (m2/ha)
+        columns['bal'] = np.concatenate(([0.0], np.cumsum(columns['ba_ha'])[:-1]))  # basal area of the bigger trees (m2), 0 to the first tree
+
+        columns['hd_ratio'] = columns['height'] * 100 / dbh  # height/diameter ratio (%) calculation
+        columns['normal_circumference'] = math.pi * dbh  # normal (at 1.30m) circumference (cm) calculation
+
+
+    def height_columns(self, plot: Plot, columns: TreeColumns):
+        """
+        Height stage of run_stages, the column version of the height equation of initialize.
+        """
+
+        a = 0.0296
+        b = 1.633
+        height = columns['height']
+
+        if (height == 0).any():  # if the tree hasn't height (m) value, it is calculated
+            columns['height'] = np.where(height == 0, (1.3**b + (plot.dominant_h**b - 1.3**b) * (1 - np.exp(-a*columns['dbh'])) / (1 - math.exp(-a*plot.dominant_diameter))**(1/b)), height)
+
+
+    def crown_columns(self, plot: Plot, columns: TreeColumns, func):
+        """
+        Crown stage of run_stages, the column version of crown.
+        """
+
+        dbh = columns['dbh']
+        height = columns['height']
+        tree_age = columns['tree_age']
+
+        hlcw = - 4.7570 - 0.08092*dbh + 0.6408*height + 0.1881*tree_age + 0.1998*plot.si
+        hcb = - 3.265 - 0.1415*dbh + 0.5117*height + 0.1430*tree_age + 0.1691*plot.dominant_h
+
+        if func == 'initialize':  # the inventory values are kept, only the missing ones (0) are calculated
+            hlcw = np.where(columns['hlcw'] == 0, hlcw, columns['hlcw'])
+            hcb = np.where(columns['hcb'] == 0, hcb, columns['hcb'])
+
+        columns['hlcw'] = hlcw  # height of maximum crown-width (m)
+        columns['hcb'] = hcb  # basal crown height (m)
+        columns['cr'] = 1 - hcb / height  # crown ratio calculation (%)
+        columns['lcw'] = 0.06185*(dbh**1.185)*math.exp(-0.009319*plot.basal_area -0.009502*plot.age)  # maximum crown-width (m) calculation
+
+
+    def vol_columns(self, plot: Plot, columns: TreeColumns):
+        """
+        Volume stage of run_stages, the column version of vol.
+        taper_equation_with_bark only reads dbh and height, so it runs on the columns of all the trees at once.
+        """
+
+        from scipy import integrate
+
+        hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
+        trees = SimpleNamespace(dbh=columns['dbh'][:, np.newaxis], height=columns['height'][:, np.newaxis])
+        dob = self.taper_equation_with_bark(trees, hr)  # diameter over bark using taper equation (cm), one row per tree
+        fwb = (dob / 20) ** 2  # radius^2 using dob (dm2)
+        columns['vol'] = math.pi * columns['height'] * 10 * integrate.simps(fwb, hr, axis=1)  # volume over bark using simpson integration (dm3)
+        columns['vol_ha'] = columns['vol'] * columns['expan'] / 1000  # volume over bark per ha (m3/ha)
+
+
+    def biomass_columns(self, plot: Plot, columns: TreeColumns):
+        """
+        Biomass stage of run_stages, the column version of biomass.
+        """
+
+        dbh = columns['dbh']
+        height = columns['height']
+
+        columns['wstb'] = 0.01230*(dbh**1.604)*(height**1.413)  # wstb = wsw + wthickb, stem + branches >7 cm (Kg)
+        columns['wsb'] = 0.003600*(dbh**2.656)  # wsb = stem bark (Kg)
+        columns['wb2_7'] = 1.938 + 0.001065*(dbh**2)*height  # wb2_7 = branches (2-7 cm) (Kg)
+        columns['wthinb'] = 0.03630*(dbh**2.609)*(height**(-0.9417))  # wthinb = Thin branches (2-0.5 cm) (Kg)
+        columns['wb05'] = 0.007800*(dbh**1.961)  # wb05 = thinniest branches (<0.5 cm) (Kg)
+        columns['wl'] = 0.04230*(dbh**1.714)  # wl = leaves (Kg)
+        columns['wr'] = 0.06174*(dbh**2.144)  # wr = roots (Kg)
+        columns['wt'] = columns['wstb'] + columns['wsb'] + columns['wb2_7'] + columns['wthinb'] + columns['wb05'] + columns['wl'] + columns['wr']  # wt = biomasa total (Kg)
+
+
     def crown(self, tree: Tree, plot: Plot, func):
         """
         Function to calculate crown variables for each tree.
@@ -441,6 +487,8 @@ class PinusRadiataGalicia(TreeModel):
         That function is run by initialize and process_plot functions.
         """
 
+        from scipy import integrate
+
         hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
         dob = self.taper_equation_with_bark(tree, hr)  # diameter over bark using taper equation (cm)
         # dub = self.taper_equation_without_bark(tree, hr)  # diameter under/without bark using taper equation (cm)
@@ -486,17 +534,25 @@ class PinusRadiataGalicia(TreeModel):
         tree.add_value('wt', wt)  # wt = biomasa total (Kg)
 
 
-    def biomass_plot(self, plot: Plot):
+    def biomass_plot(self, plot: Plot, columns: TreeColumns = None):
         """
         Function to calculate the wood uses values to the plot.
         That function is run by initialize and process_plot functions.
+        With the columns of run_stages, the plot values are the sums of the columns.
         """
 
-        plot_trees: list[Tree] = plot.short_trees_on_list('dbh', DESC)  # stablish an order to calculate tree variables
-
         plot_wsw = plot_wsb = plot_w_cork = plot_wthickb = plot_wstb = plot_wb2_7 = plot_wb2_t = plot_wthinb = plot_wl = plot_wtbl = plot_wbl0_7 = plot_wr = plot_wt =  0
 
-        for tree in plot_trees:  # for each tree, we are going to add the simple values to the plot value
+        if columns is not None:
+            plot_wsb = columns.sum('wsb')
+            plot_wstb = columns.sum('wstb')
+            plot_wb2_7 = columns.sum('wb2_7')
+            plot_wthinb = columns.sum('wthinb')
+            plot_wl = columns.sum('wl')
+            plot_wr = columns.sum('wr')
+            plot_wt = columns.sum('wt')
+
+        for tree in (plot.short_trees_on_list('dbh', DESC) if columns is None else []):  # for each tree, we are going to add the simple values to the plot value
 
             # plot_wsw += tree.wsw
             plot_wsb += tree.wsb 
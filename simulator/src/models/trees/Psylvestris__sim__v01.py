@@ -21,7 +21,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -64,9 +63,9 @@ class PinusSylvestrisSIM(TreeModel):
             Ref.: Bravo and Montero, 2001
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('        Pinus sylvestris model (Sistema Ibérico Meridional) is running        ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '        Pinus sylvestris model (Sistema Ibérico Meridional) is running        ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be announced
             
@@ -203,13 +202,13 @@ class PinusSylvestrisSIM(TreeModel):
         The equations on that function are the same that in "initialize" function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('        Pinus sylvestris model (Sistema Ibérico Meridional) is running        ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '        Pinus sylvestris model (Sistema Ibérico Meridional) is running        ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != 5:
-            print('BE CAREFUL! That model was developed to 5 year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (5 year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to 5 year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (5 year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be announced
 
@@ -429,6 +428,8 @@ class PinusSylvestrisSIM(TreeModel):
         That function is run by initialize and process_plot functions.
         """
 
+        from scipy import integrate
+
         hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
         dob = self.taper_equation_with_bark(tree, hr)  # diameter over bark using taper equation (cm)
         dub = self.taper_equation_without_bark(tree, hr)  # diameter under/without bark using taper equation (cm)
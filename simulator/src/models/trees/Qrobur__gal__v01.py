@@ -21,7 +21,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -62,9 +61,9 @@ class QuercusRoburGalicia(TreeModel):
             Ref.: Barrio-Anta and Diéguez-Aranda, 2005
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                   Quercus robur model (Galicia) is running                   ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                   Quercus robur model (Galicia) is running                   ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be announced
             
@@ -168,13 +167,13 @@ class QuercusRoburGalicia(TreeModel):
         The equations on that function are the same that in "initialize" function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                   Quercus robur model (Galicia) is running                   ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                   Quercus robur model (Galicia) is running                   ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != '':
-            print('BE CAREFUL! That model was developed to xx year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (xx year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to xx year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (xx year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be announced
  
@@ -364,6 +363,8 @@ class QuercusRoburGalicia(TreeModel):
         That function is run by initialize and process_plot functions.
         """
 
+        from scipy import integrate
+
         hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
         dob = self.taper_equation_with_bark(tree, hr)  # diameter over bark using taper equation (cm)
         # dub = self.taper_equation_without_bark(tree, hr)  # diameter under/without bark using taper equation (cm)
@@ -21,7 +21,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -71,9 +70,9 @@ class QuercusSuberCataluña(TreeModel):
             Ref.: Sánchez-González et al, 2007
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                  Quercus suber model (Cataluña) is running                   ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                  Quercus suber model (Cataluña) is running                   ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be announced
             
@@ -209,13 +208,13 @@ class QuercusSuberCataluña(TreeModel):
         The equations on that function are the same that in "initialize" function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                  Quercus suber model (Cataluña) is running                   ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                  Quercus suber model (Cataluña) is running                   ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != 1:
-            print('BE CAREFUL! That model was developed to 1 year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (1 year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to 1 year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (1 year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be announced
 
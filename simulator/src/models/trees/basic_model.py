@@ -20,7 +20,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -28,7 +27,6 @@ from constants import PLOT_VARIABLE_NAMES
 import math
 import sys
 import logging
-import numpy as np
 import os
 
 class BasicTreeModel(TreeModel):
@@ -20,7 +20,6 @@ from data import Distribution
 from data import DESC
 from data import Plot
 from data import Tree
-from scipy import integrate
 from util import Tools
 from data.tree import VARIABLE_NAMES
 from constants import PLOT_VARIABLE_NAMES
@@ -55,9 +54,9 @@ class BasicTreeModel(TreeModel):
         Function that update the gaps on the information with the inventory data
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                    BasicTreeModel model (xx) is running                      ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                    BasicTreeModel model (xx) is running                      ',
+                           '#----------------------------------------------------------------------------#')
 
         try:  # errors inside that construction will be annodbhced
 
@@ -149,13 +148,13 @@ class BasicTreeModel(TreeModel):
         The equations on that Function are the same that in "initialize" Function
         """
 
-        print('#----------------------------------------------------------------------------#')
-        print('                     BasicTreeModel model (xx) is running                     ')
-        print('#----------------------------------------------------------------------------#')
+        Tools.print_banner('#----------------------------------------------------------------------------#',
+                           '                     BasicTreeModel model (xx) is running                     ',
+                           '#----------------------------------------------------------------------------#')
 
         if time != '':
-            print('BE CAREFUL! That model was developed to xx year execution, and you are trying to make a', time, 'years execution!')
-            print('Please, change your execution conditions to the recommended (xx year execution). If not, the output values will be not correct.')
+            Tools.print_banner('BE CAREFUL! That model was developed to xx year execution, and you are trying to make a ' + str(time) + ' years execution!',
+                               'Please, change your execution conditions to the recommended (xx year execution). If not, the output values will be not correct.', level=logging.WARNING)
 
         try:  # errors inside that construction will be annodbhced
 
@@ -277,6 +276,8 @@ class BasicTreeModel(TreeModel):
         That function is run by initialize and process_plot functions.
         """
 
+        from scipy import integrate
+
         hr = np.arange(0, 1, 0.001)  # that line stablish the integrate conditions for volume calculation
         # dob = self.taper_equation_with_bark(tree, hr)  # diameter over bark using taper equation (cm)
         # dub = self.taper_equation_without_bark(tree, hr)  # diameter under/without bark using taper equation (cm)
@@ -16,6 +16,7 @@
 # ==============================================================================
 
 from .reader import Reader
+from .schema import Schema
 from .csv_reader import CSVReader
 from .excel_reader import ExcelReader
 from .json_reader import JSONReader
\ No newline at end of file
@@ -16,21 +16,26 @@
 # ==============================================================================
 
 import os
-import xlrd
 import logging
 
 from .reader import Reader
 from util import Tools
+from util import Tracer
 
 
 class ExcelReader(Reader):
 
+    random_access = True
+
     def __init__(self, filename, sheets):
         if not os.path.exists(filename):
             Tools.print_log_line('filename ' + filename + " does not exists.", logging.ERROR)
             exit(-1)
 
-        self.__document = xlrd.open_workbook(filename)
+        import xlrd
+
+        with Tracer.span('open ' + os.path.basename(filename), 'load'):
+            self.__document = xlrd.open_workbook(filename)
         self.__cursor = 0
         self.__sheet = None
         self.__sheets = {j: i for i, j in enumerate(sheets)}
@@ -42,6 +47,10 @@ class ExcelReader(Reader):
     def document(self):
         return self.__document
 
+    @property
+    def columns(self):
+        return self.__headers
+
     def choose_sheet(self, sheet, has_header=False):
         self.__sheet = self.__document.sheet_by_index(self.__sheets[sheet])
         self.__cursor = -1
@@ -54,6 +63,26 @@ class ExcelReader(Reader):
             for item in header:
                 self.__headers.append(item.value)
 
+    def sheet(self, sheet):
+
+        document_sheet = self.__document.sheet_by_index(self.__sheets[sheet])
+        headers = document_sheet.row_values(0)
+
+        return headers, (dict(zip(headers, document_sheet.row_values(position)))
+                         for position in range(1, document_sheet.nrows))
+
+    def column(self, sheet, name: str):
+        document_sheet = self.__document.sheet_by_index(self.__sheets[sheet])
+        return document_sheet.col_values(document_sheet.row_values(0).index(name), 1)
+
+    def rows_at(self, sheet, positions: list):
+
+        document_sheet = self.__document.sheet_by_index(self.__sheets[sheet])
+        headers = document_sheet.row_values(0)
+
+        for position in positions:
+            yield dict(zip(headers, document_sheet.row_values(position + 1)))
+
     def __iter__(self):
         return self
 
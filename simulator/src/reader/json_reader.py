@@ -15,51 +15,121 @@
 # limitations under the License.
 # ==============================================================================
 
-import json
 import logging
+import queue
+import threading
 import os
 
 from .reader import Reader
+from .sparql_stream import SparqlStream
 from util import Tools
+from util import Tracer
 
 
-class JSONReader(Reader):
+ROWS_BATCH = 512  # rows a loading thread hands over at once
+ROWS_QUEUE_SIZE = 8  # batches a loading thread reads ahead of the inventory
 
-    def __init__(self, input_files: list):
 
-        self.__documents = dict()
-        self.__cursor = 0
+class JSONReader(Reader):
+    """
+    Reads the SPARQL JSON results of the plots and the trees. Every file is read by its own thread from the moment
+    the reader is created, so the files are read at the same time, and each thread reads at most ROWS_QUEUE_SIZE
+    batches of rows ahead of choose_sheet and __next__, so memory does not grow with the size of the files.
+    variables maps a sheet to the variables to read from it (all of them when the sheet is not in variables).
+    """
+
+    def __init__(self, input_files: dict, variables: dict = None):
+
+        self.__files = dict()
+        self.__variables = dict() if variables is None else variables
+        self.__streams = dict()
         self.__sheet = None
         self.__headers = None
-        
+
         for filetype, filename in input_files.items():
-            
+
             if not os.path.exists(filename):
                 Tools.print_log_line('filename ' + filename + " does not exists.", logging.ERROR)
                 exit(-1)
 
-            with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+            self.__files[filetype] = filename
 
-                self.__documents[filetype] = json.loads(f.read())
-                Tools.print_log_line('Inventory file ' + filename + ' loaded', logging.INFO)
+        for filetype in self.__files.keys():
+            self.__streams[filetype] = self.__start(filetype)
 
     @property
     def document(self):
         return self.__document
 
-    def choose_sheet(self, sheet, has_header=False):
-        
-        idx = 0 if sheet == 'plots' else 1
-        self.__sheet = self.__documents[sheet]
-        self.__cursor = -1
+    @property
+    def columns(self):
+        return self.__headers
+
+    def __start(self, sheet):
+
+        rows = queue.Queue(ROWS_QUEUE_SIZE)
+        thread = threading.Thread(target=self.__read_file, args=(self.__files[sheet], self.__variables.get(sheet), rows),
+                                  name='JSONReader-' + str(sheet), daemon=True)
+        thread.start()
+
+        return rows
+
+    @staticmethod
+    def __read_file(filename, variables, rows):
+        """
+        Puts on rows the columns of the file, then its rows in batches, then None. An error is put before None.
+        """
+
+        try:
+            with open(filename, 'r', encoding='utf-8', errors='ignore') as f, \
+                    Tracer.span('open ' + os.path.basename(filename), 'load'):
+
+                stream = SparqlStream(f, variables)
+                rows.put(stream.read_head())
+
+                batch = list()
+                for row in stream:
+                    batch.append(row)
+                    if len(batch) == ROWS_BATCH:
+                        rows.put(batch)
+                        batch = list()
+                rows.put(batch)
+
+            Tools.print_log_line('Inventory file ' + filename + ' loaded', logging.INFO)
+
+        except Exception as e:
+            rows.put(e)
 
-        if has_header:
-            self.__cursor = 0
-            self.__headers = list()
-            header = self.__sheet['head']['vars']
+        finally:
+            rows.put(None)
 
-            for item in header:
-                self.__headers.append(item)
+    @staticmethod
+    def __take(rows):
+
+        item = rows.get()
+
+        if isinstance(item, Exception):
+            raise item
+
+        return item
+
+    def __batches(self, rows):
+
+        batch = self.__take(rows)
+
+        while batch is not None:
+            yield from batch
+            batch = self.__take(rows)
+
+    def sheet(self, sheet):
+        # the rows of a sheet are read once, a sheet read again is read again from its file
+        rows = self.__streams.pop(sheet) if sheet in self.__streams else self.__start(sheet)
+        return list(self.__take(rows)), self.__batches(rows)
+
+    def choose_sheet(self, sheet, has_header=False):
+
+        columns, self.__sheet = self.sheet(sheet)
+        self.__headers = columns if has_header else None
 
     def __iter__(self):
         return self
@@ -70,24 +140,7 @@ class JSONReader(Reader):
             Tools.print_log_line("No sheet have been chosen.", logging.ERROR)
             raise StopIteration
 
-        if len(self.__sheet['results']['bindings']) <= self.__cursor:
-            raise StopIteration
-        else:
-            result = {}
-            data = self.__sheet['results']['bindings'][self.__cursor]
-
-            if self.__headers is None:
-                for i in range(len(data)):
-                    result[i] = data[i].value
-            else:
-                for i in range(len(data)):
-                    result[self.__headers[i]] = data[self.__headers[i]]['value']
-
-            self.__cursor = self.__cursor + 1
-
-            return result
-
-        raise StopIteration
+        return next(self.__sheet)
 
     def read(self):
         return self.__next__()
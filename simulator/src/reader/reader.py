@@ -17,10 +17,59 @@
 
 from abc import ABCMeta
 from abc import abstractmethod
+from util import Tools
+
+from .schema import Schema
+
+import logging
 
 
 class Reader(metaclass=ABCMeta):
 
+    # the rows of a sheet can be read by position, in any order and by forked workers, see rows_at
+    random_access = False
+
     @abstractmethod
     def read(self):
         return
+
+    def sheet(self, sheet):
+        """
+        Returns the columns of sheet, from its header, and an iterator over its rows, as the dicts __next__ returns.
+        It does not change the chosen sheet, so a sheet can be read while another one is.
+        """
+        raise NotImplementedError
+
+    def column(self, sheet, name: str):
+        """
+        Values of the column name in the rows of sheet, in the order of the rows. Only for random_access readers.
+        """
+        raise NotImplementedError
+
+    def rows_at(self, sheet, positions: list):
+        """
+        Rows of sheet at positions (0 is the first row after the header), as the dicts __next__ returns.
+        Only for random_access readers; it does not change the chosen sheet.
+        """
+        raise NotImplementedError
+
+    @property
+    def columns(self):
+        """
+        Columns of the chosen sheet, from its header; None when the sheet was chosen without header.
+        """
+        return None
+
+    def schema(self, names: list, sheet: str = '', columns: list = None):
+        """
+        Resolves names against the columns of the chosen sheet (or columns) and logs the missing ones, once per sheet.
+        """
+
+        columns = self.columns if columns is None else columns
+        schema = Schema(names, columns, sheet)
+
+        if len(schema.missing) > 0 and columns is not None:
+            Tools.print_log_line('%s variables are not in sheet %s, they are set to their default value: %s',
+                                 logging.WARNING, args=(len(schema.missing), sheet, ', '.join(schema.missing)))
+
+        return schema
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+class Schema:
+    """
+    The variables a Tree or a Plot reads (names) resolved against the columns of a sheet, once per sheet:
+    present are the variables the sheet has, missing the ones that are filled with their default value.
+    A row matches the schema when it has every column of the sheet, which is how the readers build them;
+    rows that do not (e.g. a SPARQL binding without some variable) are read variable by variable as before.
+    The names are kept as they were when the schema was resolved, as the models remove variables from them.
+    """
+
+    def __init__(self, names: list, columns: list, sheet: str = ''):
+
+        columns = set() if columns is None else set(columns)
+
+        self.__sheet = sheet
+        self.__names = list(names)
+        self.__width = len(columns)
+        self.__present = [name for name in names if name in columns]
+        self.__missing = [name for name in names if name not in columns]
+
+    @property
+    def sheet(self):
+        return self.__sheet
+
+    @property
+    def names(self):
+        return self.__names
+
+    @property
+    def present(self):
+        return self.__present
+
+    @property
+    def missing(self):
+        return self.__missing
+
+    def matches(self, row: dict):
+        return self.__width > 0 and len(row) == self.__width
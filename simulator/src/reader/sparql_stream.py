@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import json
+
+
+CHUNK_SIZE = 65536
+WHITESPACE = ' \t\r\n'
+
+
+class SparqlStream:
+    """
+    Reads a SPARQL JSON results document ({"head": {"vars": [...]}, "results": {"bindings": [...]}}) from a file
+    a chunk at a time, decoding the bindings one by one, so memory does not grow with the number of bindings.
+    Iterating the stream yields the rows of the document as dicts of {variable: value}, with the variables of
+    columns, which are the variables of the head that are in names (all of them when names is None).
+    """
+
+    def __init__(self, file, names: list = None, chunk_size: int = CHUNK_SIZE):
+
+        self.__file = file
+        self.__names = None if names is None else set(names)
+        self.__chunk_size = chunk_size
+        self.__decoder = json.JSONDecoder()
+        self.__buffer = ''
+        self.__position = 0
+        self.__eof = False
+        self.__columns = None
+        self.__pending = list()  # bindings found before the head, see read_head
+        self.__events_iterator = None
+
+    @property
+    def columns(self):
+        """
+        Variables of the rows, known once the head has been read; see read_head.
+        """
+        return self.__columns
+
+    def __fill(self):
+
+        if self.__eof:
+            return False
+
+        chunk = self.__file.read(self.__chunk_size)
+
+        if not chunk:
+            self.__eof = True
+            return False
+
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+        return True
+
+    def __peek(self):
+
+        while True:
+            buffer = self.__buffer
+            position = self.__position
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            self.__position = position
+
+            if position < len(buffer):
+                return buffer[position]
+            if not self.__fill():
+                raise ValueError('Unexpected end of SPARQL JSON document')
+
+    def __expect(self, chars: str):
+
+        char = self.__peek()
+
+        if char not in chars:
+            raise ValueError('Expected ' + ' or '.join(chars) + ' at SPARQL JSON document, found ' + char)
+
+        self.__position += 1
+        return char
+
+    def __value(self):
+
+        self.__peek()
+
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__position)
+                # a number at the end of the buffer may go on in the next chunk
+                if end < len(self.__buffer) or self.__eof:
+                    self.__position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+
+            self.__fill()
+
+    def __members(self):
+        """
+        Keys of the object that starts at the current position; the caller reads the value of each key.
+        """
+
+        self.__expect('{')
+
+        if self.__peek() == '}':
+            self.__position += 1
+            return
+
+        while True:
+            key = self.__value()
+            self.__expect(':')
+            yield key
+            if self.__expect(',}') == '}':
+                return
+
+    def __bindings(self):
+
+        self.__expect('[')
+
+        if self.__peek() == ']':
+            self.__position += 1
+            return
+
+        while True:
+            yield self.__value()
+            if self.__expect(',]') == ']':
+                return
+
+    def __head(self, head: dict):
+
+        variables = head.get('vars', [])
+        self.__columns = [variable for variable in variables if self.__names is None or variable in self.__names]
+
+    def __events(self):
+        """
+        Walks the document, yielding every binding; the head is read on the way.
+        """
+
+        for key in self.__members():
+            if key == 'head':
+                self.__head(self.__value())
+            elif key == 'results':
+                for result in self.__members():
+                    if result == 'bindings':
+                        yield from self.__bindings()
+                    else:
+                        self.__value()
+            else:
+                self.__value()
+
+    def read_head(self):
+        """
+        Reads the document up to its head and returns the columns. Bindings found before the head (the head
+        goes first in the SPARQL JSON format, but JSON does not order keys) are kept until the rows are read.
+        """
+
+        self.__events_iterator = self.__events()
+
+        while self.__columns is None:
+            try:
+                self.__pending.append(next(self.__events_iterator))
+            except StopIteration:
+                if self.__columns is None:
+                    self.__columns = list()
+
+        return self.__columns
+
+    def __iter__(self):
+
+        if self.__columns is None:
+            self.read_head()
+
+        columns = self.__columns
+
+        for binding in self.__pending:
+            yield {column: binding[column]['value'] for column in columns if column in binding}
+        self.__pending = list()
+
+        for binding in self.__events_iterator:
+            yield {column: binding[column]['value'] for column in columns if column in binding}
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import argparse
+import os
+
+from util.tools import Tools
+from util.progress import Progress
+from scenario.scenario import Scenario
+from service.runner import Runner
+from service.replicates import ReplicateRunner
+from service.replicates import REPLICATE_VARIABLES
+from service.replicates import DEFAULT_QUANTILES
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description='Simanfor replicates: runs a scenario many times drawing tree mortality at random '
+                    'and summarises the plots of every step with quantiles')
+
+    parser.add_argument('-s',
+                        metavar='scenario_file',
+                        required=True,
+                        default=None,
+                        type=str,
+                        help='scenario file (json format)')
+    parser.add_argument('-n',
+                        metavar='replicates',
+                        default=100,
+                        type=int,
+                        help='number of replicates')
+    parser.add_argument('--seed',
+                        metavar='seed',
+                        default=0,
+                        type=int,
+                        help='seed of the replicates, the same seed gives the same results')
+    parser.add_argument('--variables',
+                        metavar='variable',
+                        nargs='+',
+                        default=REPLICATE_VARIABLES,
+                        type=str,
+                        help='plot variables summarised')
+    parser.add_argument('-q',
+                        metavar='quantile',
+                        nargs='+',
+                        default=DEFAULT_QUANTILES,
+                        type=float,
+                        help='quantiles of every variable')
+    parser.add_argument('-w',
+                        metavar='workers',
+                        default=os.cpu_count(),
+                        type=int,
+                        help='number of replicates run in parallel')
+    parser.add_argument('--progress',
+                        metavar='progress_file',
+                        nargs='?',
+                        const='',
+                        default=None,
+                        type=str,
+                        help='report plots done, trees per second and time left of every operation on a '
+                             'progress line, or as json lines appended to progress_file')
+    parser.add_argument('-l',
+                        metavar='language',
+                        required=False,
+                        default='es',
+                        type=str,
+                        help='printing language')
+    parser.add_argument('-logging_config_file',
+                        metavar='logging_config_file',
+                        help='log config_file',
+                        type=str,
+                        default='../config_files/logging.conf')
+    parser.add_argument("-v",
+                        metavar='verbosity_level',
+                        default=0,
+                        type=int,
+                        help="increase output verbosity (DEBUG, INFO, WARNING, ERROR, CRITICAL). "
+                             "The default value is None")
+
+    args = parser.parse_args()
+
+    Runner.load_translations(args.l)
+    Tools.load_logger_config(args.logging_config_file, level=args.v)
+
+    runner = ReplicateRunner(args.n, args.seed, args.w, args.variables, args.q)
+
+    if args.progress is not None:
+        runner.engine.set_progress(Progress(args.progress if args.progress != '' else None))
+
+    file_path = runner.run_summary(Scenario(args.s))
+    runner.close()
+
+    print('{} replicates summarised in {}'.format(args.n, file_path))
+
+
+if __name__ == "__main__":
+    main()
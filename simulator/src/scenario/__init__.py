@@ -18,6 +18,10 @@
 from .scenario import Scenario
 from .operation import Operation
 from .operation import OperationType
+from .compiler import ScenarioCompiler
+from .compiler import ScenarioError
+from .compiler import ExecutionPlan
+from .compiler import PlanStep
 
 from .operation import NOOP
 from .operation import LOAD
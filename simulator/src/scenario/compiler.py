@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .operation import Operation
+from .operation import LOAD
+from .operation import INIT
+from .operation import EXECUTION
+from .operation import HARVEST
+from constants import CUTTYPES_DICT
+from util import Tools
+
+import importlib.util
+import numbers
+import ast
+
+
+# variables every operation type reads
+REQUIRED_VARIABLES = {
+    LOAD: ['init', 'input'],
+    INIT: ['time'],
+    EXECUTION: ['time'],
+    HARVEST: ['time', 'cut_down', 'volumen']
+}
+
+NUMERIC_VARIABLES = ['init', 'time', 'volumen', 'min_age', 'max_age']
+
+
+class ScenarioError(Exception):
+    """
+    Raised when a scenario can not be run. errors holds every problem found, one line each.
+    """
+
+    def __init__(self, name: str, errors: list):
+
+        super().__init__('Scenario ' + str(name) + ' is not valid:\n  ' + '\n  '.join(errors))
+        self.__errors = errors
+
+    @property
+    def errors(self):
+        return self.__errors
+
+
+class PlanStep:
+    """
+    Operation of an execution plan, with the file its model is defined in.
+    """
+
+    def __init__(self, operation: Operation, model_file: str = None):
+
+        self.__operation = operation
+        self.__model_file = model_file
+
+    @property
+    def operation(self):
+        return self.__operation
+
+    @property
+    def model_file(self):
+        return self.__model_file
+
+
+class ExecutionPlan:
+
+    def __init__(self, steps: list):
+        self.__steps = steps
+
+    @property
+    def steps(self):
+        return self.__steps
+
+    def __len__(self):
+        return len(self.__steps)
+
+    def __iter__(self):
+        return iter(self.__steps)
+
+
+class ScenarioCompiler:
+    """
+    Checks the operations of a scenario before anything runs and turns them into an ExecutionPlan,
+    so a wrong variable or model stops the simulation before LOAD instead of being logged plot by plot.
+    Growth model modules trim the global variable lists when they are imported (see Runner.model_key), which
+    changes what LOAD reads, so models are looked up in their source code here and only imported by the runner
+    right before their operation, as always.
+    """
+
+    # classes defined by every model module, parsed once per process
+    __classes = dict()
+
+    @staticmethod
+    def model_types(action: int):
+
+        from models import LoadModel
+        from models import TreeModel
+        from models import StandModel
+        from models import HarvestModel
+
+        return {
+            LOAD: (LoadModel,),
+            INIT: (TreeModel, StandModel),
+            EXECUTION: (TreeModel, StandModel),
+            HARVEST: (HarvestModel, StandModel)
+        }[action]
+
+    @staticmethod
+    def find_model(model_path: str):
+        """
+        Returns the file of a model module and the names of the classes it defines or imports, without importing it.
+        """
+
+        if model_path not in ScenarioCompiler.__classes:
+
+            # find_spec imports the parents of the name, so a .py suffix would import the model module itself
+            spec = importlib.util.find_spec(Tools.module_name(model_path))
+            if spec is None or spec.origin is None:
+                raise ImportError('model module ' + str(model_path) + ' not found')
+
+            with open(spec.origin, 'rb') as source:
+                tree = ast.parse(source.read(), spec.origin)
+
+            names = set()
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    names.add(node.name)
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):  # classes imported from other modules
+                    names.update(alias.asname or alias.name for alias in node.names)
+
+            ScenarioCompiler.__classes[model_path] = (spec.origin, names)
+
+        return ScenarioCompiler.__classes[model_path]
+
+    @staticmethod
+    def check_operation(operation: Operation, first: bool = False):
+        """
+        Returns the problems of an operation, found without importing its model.
+        """
+
+        errors = list()
+        name = 'operation ' + str(operation.name) + ': '
+        action = operation.type.action
+
+        if action not in REQUIRED_VARIABLES:
+            return [name + 'unknown operation type']
+
+        if first != (action == LOAD):
+            errors.append(name + ('scenarios must start with a LOAD operation' if first
+                                  else 'LOAD is only allowed as the first operation'))
+
+        for variable in REQUIRED_VARIABLES[action]:
+            if not operation.has(variable) or operation.get_variable(variable) is None:
+                errors.append(name + 'missing variable ' + variable)
+
+        for variable in NUMERIC_VARIABLES:
+            if operation.has(variable) and operation.variables[variable] is not None and \
+                    not isinstance(operation.variables[variable], numbers.Number):
+                errors.append(name + variable + ' must be a number, not ' + repr(operation.variables[variable]))
+
+        if action == HARVEST and operation.has('cut_down') and operation.variables['cut_down'] not in CUTTYPES_DICT:
+            errors.append(name + 'unknown cut_down ' + repr(operation.variables['cut_down']) +
+                          ', expected one of ' + ', '.join(CUTTYPES_DICT.keys()))
+
+        min_age, max_age = operation.age_window
+        if isinstance(min_age, numbers.Number) and isinstance(max_age, numbers.Number) and min_age > max_age:
+            errors.append(name + 'min_age ' + str(min_age) + ' is greater than max_age ' + str(max_age))
+
+        try:
+            model_file, classes = ScenarioCompiler.find_model(operation.model_path)
+            if operation.model_class not in classes:
+                errors.append(name + 'model class ' + str(operation.model_class) + ' not found in ' + model_file)
+        except (ImportError, SyntaxError, ValueError, AttributeError, TypeError, OSError) as e:
+            errors.append(name + str(e))
+
+        return errors
+
+    @staticmethod
+    def check(scenario):
+        """
+        Raises a ScenarioError with every problem found in the scenario.
+        """
+
+        errors = list()
+
+        if len(scenario.operations) == 0:
+            errors.append('the scenario has no operations')
+
+        for position, operation in enumerate(scenario.operations):
+            errors.extend(ScenarioCompiler.check_operation(operation, position == 0))
+
+        if len(errors) > 0:
+            raise ScenarioError(scenario.name, errors)
+
+    @staticmethod
+    def check_model(scenario_name: str, operation: Operation, model):
+        """
+        Raises a ScenarioError if model, loaded for operation, can not run it.
+        """
+
+        if model is None:
+            raise ScenarioError(scenario_name, ['operation ' + str(operation.name) + ': ' +
+                                                str(operation.model_class) + ' is not a class'])
+
+        if not isinstance(model, ScenarioCompiler.model_types(operation.type.action)):
+            raise ScenarioError(scenario_name, ['operation ' + str(operation.name) + ': ' + type(model).__name__ +
+                                                ' can not run a ' + operation.type.get_code_name() + ' operation'])
+
+    @staticmethod
+    def compile(scenario, operations: list = None):
+        """
+        Checks the scenario and returns its plan. operations compiles only part of the scenario,
+        e.g. what is left after some shared steps. Raises a ScenarioError with every problem found.
+        """
+
+        ScenarioCompiler.check(scenario)
+
+        return ExecutionPlan([PlanStep(operation, ScenarioCompiler.find_model(operation.model_path)[0])
+                              for operation in (scenario.operations if operations is None else operations)])
@@ -16,6 +16,7 @@
 # ==============================================================================
 
 from util import Tools
+from constants import AGE_WINDOW
 
 import logging
 
@@ -101,7 +102,7 @@ class Operation:
     def get_variable(self, name):
         if name in self.__variables.keys():
             return self.__variables[name]
-        Tools.print_log_line('Variable ' + name + ' is not defined into operation ' + self.__name, logging.INFO)
+        Tools.print_log_line('Variable %s is not defined into operation %s', logging.INFO, args=(name, self.__name))
         return None
 
     def add_variable(self, variable, value):
@@ -109,3 +110,11 @@ class Operation:
 
     def has(self, variable):
         return variable in self.__variables.keys()
+
+    @property
+    def age_window(self):
+        """
+        Returns (min_age, max_age), the ages of the plots the operation is applied to.
+        """
+        return (self.__variables['min_age'] if 'min_age' in self.__variables else AGE_WINDOW[0],
+                self.__variables['max_age'] if 'max_age' in self.__variables else AGE_WINDOW[1])
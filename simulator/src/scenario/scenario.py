@@ -24,27 +24,28 @@ import json
 
 class Scenario:
 
-    def __init__(self, configuration_file=None):
+    def __init__(self, configuration_file=None, configuration: dict = None):
 
         self.__operations = list()
 
         if configuration_file is not None:
             with open(configuration_file, 'r', encoding='utf-8', errors='ignore') as f:
-
                 configuration = json.loads(f.read())
 
-                self.__name = configuration['name']
-                self.__overwrite_output_file = True if configuration['operations'] == "YES" else False
-                self.__output_path = configuration['output_path']
-                self.__zip_compression = True if configuration['zip_compression'] == "YES" else False
-                #TODO: THE VALUE 0 MUST A GLOBAL VALUE
-                self.__ext = 0 if 'output_type' not in configuration.keys() else configuration['output_type']
-                self.__decimal_numbers = configuration['decimal_numbers']
-
-                for item in configuration['operations'].values():
-                    self.__operations.append(Operation(item))
-                    if item['operation'] == 'INIT':
-                        self.__modelo = item['model_path']
+        if configuration is not None:
+
+            self.__name = configuration['name']
+            self.__overwrite_output_file = True if configuration['operations'] == "YES" else False
+            self.__output_path = configuration['output_path']
+            self.__zip_compression = True if configuration['zip_compression'] == "YES" else False
+            #TODO: THE VALUE 0 MUST A GLOBAL VALUE
+            self.__ext = 0 if 'output_type' not in configuration.keys() else configuration['output_type']
+            self.__decimal_numbers = configuration['decimal_numbers']
+
+            for item in configuration['operations'].values():
+                self.__operations.append(Operation(item))
+                if item['operation'] == 'INIT':
+                    self.__modelo = item['model_path']
         else:
             Tools.print_log_line('No configuration file provided.', logging.WARNING)
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import argparse
+import os
+
+from util.tools import Tools
+from service.runner import Runner
+from service.server import SimulationServer
+from service.server import DEFAULT_PORT
+from service.server import DEFAULT_INVENTORIES
+from service.server import DEFAULT_POOLS
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description='Simanfor simulation server')
+
+    parser.add_argument('--host',
+                        metavar='host',
+                        default='localhost',
+                        type=str,
+                        help='address to listen on')
+    parser.add_argument('--port',
+                        metavar='port',
+                        default=DEFAULT_PORT,
+                        type=int,
+                        help='port to listen on')
+    parser.add_argument('--socket',
+                        metavar='socket_path',
+                        default=None,
+                        type=str,
+                        help='listen on this unix socket instead of host:port')
+    parser.add_argument('-w',
+                        metavar='workers',
+                        default=os.cpu_count(),
+                        type=int,
+                        help='number of worker processes')
+    parser.add_argument('-i',
+                        metavar='inventories',
+                        default=DEFAULT_INVENTORIES,
+                        type=int,
+                        help='loaded inventories kept in memory by every worker')
+    parser.add_argument('-p',
+                        metavar='pools',
+                        default=DEFAULT_POOLS,
+                        type=int,
+                        help='worker pools kept alive, one per set of growth models')
+    parser.add_argument('-l',
+                        metavar='language',
+                        required=False,
+                        default='es',
+                        type=str,
+                        help='printing language')
+    parser.add_argument('-logging_config_file',
+                        metavar='logging_config_file',
+                        help='log config_file',
+                        type=str,
+                        default='../config_files/logging.conf')
+    parser.add_argument("-v",
+                        metavar='verbosity_level',
+                        default=0,
+                        type=int,
+                        help="increase output verbosity (DEBUG, INFO, WARNING, ERROR, CRITICAL). "
+                             "The default value is None")
+
+    args = parser.parse_args()
+
+    Runner.load_translations(args.l)
+    Tools.load_logger_config(args.logging_config_file, level=args.v)
+
+    server = SimulationServer(args.host, args.port, args.socket, args.w, args.l,
+                              os.path.abspath(args.logging_config_file), args.v, args.i, args.p)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .runner import Runner
+from .planner import ScenarioPlanner
+from util import Tools
+from scenario.scenario import Scenario
+from scenario import Operation
+from scenario import ScenarioError
+from simulation import Simulation
+from engine import MACHINE
+
+from collections import OrderedDict
+
+import multiprocessing
+import itertools
+import platform
+import logging
+import copy
+import json
+import time
+import os
+
+# operations that run once and are shared by every scenario of a batch that starts with the same ones
+SHARED_OPERATIONS = ['LOAD', 'INIT']
+
+
+# runner and simulations of the shared operations, inherited by the forked workers
+batch_state = None
+
+
+def run_batch_member(key: str, configuration: dict):
+
+    runner, prefixes = batch_state
+
+    try:
+        start = time.perf_counter()
+
+        scenario = Scenario(configuration=configuration)
+        simulation = prefixes[key].copy()
+        runner.run_operations(scenario.operations[simulation.number_steps:], simulation)
+        runner.write_results(simulation, scenario)
+
+        return {
+            'status': 'done',
+            'name': scenario.name,
+            'output_path': scenario.output_path,
+            'files': simulation.get_output_files(scenario.output_path, scenario.ext),
+            'time': time.perf_counter() - start
+        }
+    except Exception as e:
+        Tools.print_log_line('Scenario ' + str(configuration.get('name')) + ' failed: ' + repr(e), logging.ERROR)
+        return {'status': 'error', 'name': configuration.get('name'), 'error': repr(e)}
+
+
+class BatchRunner(Runner):
+    """
+    Runs many scenarios that start from the same inventory. The leading LOAD and INIT operations are run once per
+    distinct prefix, and the rest of every scenario runs in a forked worker that inherits the initialized inventory.
+    Engines never modify the inventory they receive, so all the scenarios can start from the same one.
+    With plan set, the scenarios run in a single process as a ScenarioPlanner tree instead, sharing every
+    operation they have in common and not only LOAD and INIT.
+    """
+
+    def __init__(self, workers: int = None, plan: bool = False):
+
+        super().__init__(MACHINE)
+
+        self.__workers = workers if workers is not None else os.cpu_count()
+        self.__plan = plan
+
+    @staticmethod
+    def shared_prefix(configuration: dict):
+
+        prefix = list()
+
+        for item in configuration['operations'].values():
+            if item['operation'].upper() not in SHARED_OPERATIONS:
+                break
+            prefix.append(item)
+
+        return prefix
+
+    @staticmethod
+    def expand_grid(template: dict, grid: dict):
+        """
+        Builds one scenario per combination of the grid values. Grid keys are <operation key>.<variable>,
+        e.g. {"operation_4.volumen": [10, 20, 30]}, and every scenario gets its own name and output path.
+        """
+
+        parameters = list()
+
+        for key in grid.keys():
+            operation, _, variable = key.partition('.')
+            if operation not in template['operations'] or variable == '':
+                raise ValueError('Grid parameter ' + key + ' does not match any operation of the template')
+            parameters.append((operation, variable))
+
+        configurations = list()
+
+        for values in itertools.product(*grid.values()):
+
+            configuration = copy.deepcopy(template)
+            suffix = list()
+
+            for (operation, variable), value in zip(parameters, values):
+                configuration['operations'][operation]['variables'][variable] = value
+                suffix.append(variable + '-' + str(value))
+
+            configuration['name'] = template['name'] + ' (' + ', '.join(suffix) + ')'
+            configuration['output_path'] = template['output_path'] + '_'.join(suffix) + '_'
+            configurations.append(configuration)
+
+        return configurations
+
+    def run_batch(self, configurations: list):
+        """
+        Runs the scenarios and returns their results in the same order. Scenarios of different growth models can
+        not share a process (see Runner.model_key), so every set of growth models runs in its own forked process.
+        """
+
+        models = OrderedDict()
+
+        for index, configuration in enumerate(configurations):
+            key = Runner.model_key(Scenario(configuration=configuration))
+            models.setdefault(key, list()).append((index, configuration))
+
+        results = [None] * len(configurations)
+
+        if platform.system() == 'Windows':
+            if len(models) > 1:
+                raise ValueError('All the scenarios of a batch must use the same growth models on Windows')
+            for members in models.values():
+                for index, result in self.run_model_batch(members):
+                    results[index] = result
+            return results
+
+        context = multiprocessing.get_context('fork')
+
+        for key, members in models.items():
+
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=self.send_model_batch, args=(members, sender))
+            process.start()
+            sender.close()
+
+            try:
+                for index, result in receiver.recv():
+                    results[index] = result
+            except EOFError:
+                for index, configuration in members:
+                    results[index] = {'status': 'error', 'name': configuration.get('name'),
+                                      'error': 'batch process of ' + key + ' died'}
+
+            process.join()
+
+        return results
+
+    def send_model_batch(self, members: list, connection):
+
+        try:
+            connection.send(self.run_model_batch(members))
+        finally:
+            connection.close()
+
+    def run_model_batch(self, members: list):
+        """
+        Runs scenarios of the same growth models: the shared operations once per distinct prefix,
+        and the rest of every scenario in a pool of forked workers.
+        """
+
+        global batch_state
+
+        results = list()
+        valid = list()
+
+        # every scenario is checked before the shared operations run, so a wrong one fails at once
+        for index, configuration in members:
+            try:
+                self.compile(Scenario(configuration=configuration))
+                valid.append((index, configuration))
+            except ScenarioError as e:
+                Tools.print_log_line(str(e), logging.ERROR)
+                results.append((index, {'status': 'error', 'name': configuration.get('name'), 'error': str(e)}))
+
+        members = valid
+
+        if self.__plan:
+            planner = ScenarioPlanner([Scenario(configuration=configuration) for index, configuration in members])
+            return results + [(index, result) for (index, configuration), result in zip(members, planner.run(self))]
+
+        groups = OrderedDict()
+
+        for index, configuration in members:
+            key = json.dumps(BatchRunner.shared_prefix(configuration), sort_keys=True)
+            groups.setdefault(key, list()).append((index, configuration))
+
+        prefixes = dict()
+
+        for key in groups.keys():
+            Tools.print_log_line('Running shared operations for ' + str(len(groups[key])) + ' scenarios',
+                                 logging.INFO)
+            operations = [Operation(item) for item in json.loads(key)]
+            prefixes[key] = self.run_operations(operations, Simulation())
+
+        batch_state = (self, prefixes)
+
+        try:
+            if self.__workers > 1 and platform.system() != 'Windows':
+                with Tools.fork_executor(self.__workers) as pool:
+                    futures = list()
+                    for key, group in groups.items():
+                        for index, configuration in group:
+                            futures.append((index, pool.submit(run_batch_member, key, configuration)))
+                    for index, future in futures:
+                        results.append((index, future.result()))
+            else:
+                for key, group in groups.items():
+                    for index, configuration in group:
+                        results.append((index, run_batch_member(key, configuration)))
+        finally:
+            batch_state = None
+
+        return results
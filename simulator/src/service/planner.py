@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .runner import Runner
+from util import Tools
+from scenario.scenario import Scenario
+from scenario import Operation
+from simulation import Simulation
+
+from collections import OrderedDict
+
+import logging
+import json
+import time
+
+
+class PlanNode:
+    """
+    Operation of the scenario tree. Its children are the different operations that follow it in the scenarios
+    going through it, and scenarios holds the index of the scenarios whose last operation is this one.
+    """
+
+    def __init__(self, key: str = None, operation: Operation = None, depth: int = 0):
+
+        self.__key = key
+        self.__operation = operation
+        self.__depth = depth
+        self.__children = OrderedDict()
+        self.__scenarios = list()
+
+    @property
+    def key(self):
+        return self.__key
+
+    @property
+    def operation(self):
+        return self.__operation
+
+    @property
+    def depth(self):
+        return self.__depth
+
+    @property
+    def children(self):
+        return self.__children.values()
+
+    @property
+    def scenarios(self):
+        return self.__scenarios
+
+    def get_child(self, key: str):
+        return self.__children.get(key)
+
+    def add_child(self, node):
+        self.__children[node.key] = node
+        return node
+
+    def count_nodes(self):
+        return sum(child.count_nodes() + 1 for child in self.__children.values())
+
+
+class ScenarioPlanner:
+    """
+    Merges the operations of a set of scenarios into a tree, so operations shared by the start of several
+    scenarios run only once and their inventory is handed to every branch. Engines never modify the inventory
+    they receive, so the branches can start from the same one. Every scenario still gets its own Simulation
+    (with its own operations) and its own output files.
+    """
+
+    def __init__(self, scenarios: list):
+
+        self.__scenarios = scenarios
+        self.__root = PlanNode()
+
+        for index, scenario in enumerate(scenarios):
+
+            node = self.__root
+
+            for operation in scenario.operations:
+                key = ScenarioPlanner.operation_key(operation)
+                child = node.get_child(key)
+                if child is None:
+                    child = node.add_child(PlanNode(key, operation, node.depth + 1))
+                node = child
+
+            node.scenarios.append(index)
+
+    @staticmethod
+    def operation_key(operation: Operation):
+        return json.dumps([operation.type.get_code_name(), operation.model_path, operation.model_class,
+                           operation.variables], sort_keys=True)
+
+    @property
+    def root(self):
+        return self.__root
+
+    @property
+    def scenarios(self):
+        return self.__scenarios
+
+    def count_operations(self):
+        """
+        Returns the number of operations of the scenarios and the number of them the plan actually runs.
+        """
+        return sum(len(scenario.operations) for scenario in self.__scenarios), self.__root.count_nodes()
+
+    def run(self, runner: Runner):
+        """
+        Runs the plan depth first with the models and engine of runner and writes the results of every scenario
+        as soon as its last operation is done. Returns a result per scenario, in the order they were given;
+        as operations are shared, the time of a result is only the time spent writing its files. An operation
+        that fails ends only the scenarios going through it, which get an error result; the other branches go on.
+        """
+
+        total, planned = self.count_operations()
+        Tools.print_log_line('Running ' + str(planned) + ' operations for ' + str(total) + ' scenario operations',
+                             logging.INFO)
+
+        results = [None] * len(self.__scenarios)
+        self.__run_node(runner, self.__root, list(), results)
+
+        return results
+
+    def __run_node(self, runner: Runner, node: PlanNode, path: list, results: list):
+        """
+        path holds the (inventory, model) produced by each operation from the root down to node.
+        """
+
+        for index in node.scenarios:
+            results[index] = self.__write_scenario(runner, self.__scenarios[index], path)
+
+        inventory = None if len(path) == 0 else path[-1][0]
+
+        for child in node.children:
+
+            Tools.print_log_line('Executing operation: ' + child.operation.name, logging.INFO, name='logger_dev')
+
+            try:
+                model = runner.load_model(child.operation)
+                path.append((runner.apply_model(model, child.operation, inventory), model))
+            except Exception as e:
+                Tools.print_log_line('Operation ' + str(child.operation.name) + ' failed: ' + repr(e), logging.ERROR)
+                for index in ScenarioPlanner.subtree_scenarios(child):
+                    results[index] = {'status': 'error', 'name': self.__scenarios[index].name, 'error': repr(e)}
+                continue
+
+            self.__run_node(runner, child, path, results)
+
+            path.pop()
+
+    @staticmethod
+    def subtree_scenarios(node: PlanNode):
+        """
+        Index of the scenarios whose operations go through node.
+        """
+
+        scenarios = list(node.scenarios)
+
+        for child in node.children:
+            scenarios.extend(ScenarioPlanner.subtree_scenarios(child))
+
+        return scenarios
+
+    @staticmethod
+    def __write_scenario(runner: Runner, scenario: Scenario, path: list):
+
+        try:
+            start = time.perf_counter()
+
+            simulation = Simulation()
+            for step, (operation, (inventory, model)) in enumerate(zip(scenario.operations, path)):
+                simulation.add_step(step + 1, inventory, operation, model)
+
+            runner.write_results(simulation, scenario)
+
+            return {
+                'status': 'done',
+                'name': scenario.name,
+                'output_path': scenario.output_path,
+                'files': simulation.get_output_files(scenario.output_path, scenario.ext),
+                'time': time.perf_counter() - start
+            }
+        except Exception as e:
+            Tools.print_log_line('Scenario ' + str(scenario.name) + ' failed: ' + repr(e), logging.ERROR)
+            return {'status': 'error', 'name': scenario.name, 'error': repr(e)}
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .runner import Runner
+from .batch import SHARED_OPERATIONS
+from util import Tools
+from scenario.scenario import Scenario
+from simulation import Simulation
+from engine import MACHINE
+
+from collections import OrderedDict
+
+import platform
+import logging
+import random
+import os
+
+# plot variables summarised by default
+REPLICATE_VARIABLES = ['DENSITY', 'BASAL_AREA', 'MEAN_DBH', 'QM_DBH', 'DOMINANT_H', 'VOL', 'WT']
+DEFAULT_QUANTILES = [0.05, 0.5, 0.95]
+
+REPLICATES_FILE = 'replicates.xlsx'
+
+
+# runner, scenario and simulation of the shared operations, inherited by the forked workers
+replicate_state = None
+
+
+def run_replicate_member(index: int):
+
+    runner, scenario, prefix = replicate_state
+    return runner.run_replicate(scenario, prefix, index)
+
+
+class ReplicateRunner(Runner):
+    """
+    Runs seeded replicates of a scenario in which every tree lives or dies with the survival probability of the
+    model (see Engine.set_random), and summarises the plot variables of every step with quantiles over the
+    replicates instead of writing a workbook per replicate. The leading LOAD and INIT operations are deterministic,
+    so they run once and the replicates are spread over forked workers from there.
+    """
+
+    def __init__(self, replicates: int, seed: int = 0, workers: int = None, variables: list = None,
+                 quantiles: list = None):
+
+        super().__init__(MACHINE)
+
+        self.__replicates = replicates
+        self.__seed = seed
+        self.__workers = workers if workers is not None else os.cpu_count()
+        self.__variables = variables if variables is not None else REPLICATE_VARIABLES
+        self.__quantiles = quantiles if quantiles is not None else DEFAULT_QUANTILES
+
+    @property
+    def replicates(self):
+        return self.__replicates
+
+    @property
+    def variables(self):
+        return self.__variables
+
+    @property
+    def quantiles(self):
+        return self.__quantiles
+
+    def random_state(self, index: int):
+        # string seeds are hashed with sha512, so a replicate of a given seed always draws the same numbers
+        return random.Random(str(self.__seed) + ':' + str(index))
+
+    def run_replicate(self, scenario: Scenario, prefix: Simulation, index: int):
+        """
+        Runs the rest of the scenario after the shared operations and returns the age of every step and the values
+        of the summarised variables by (step, plot id).
+        """
+
+        self.engine.set_random(self.random_state(index))
+
+        try:
+            simulation = self.run_operations(scenario.operations[prefix.number_steps:], prefix.copy())
+        finally:
+            self.engine.set_random(None)
+
+        ages = list()
+        values = OrderedDict()
+
+        for position in range(simulation.number_steps):
+            step = simulation.get_step(position)
+            ages.append(step.age)
+            for plot in step.inventory.plots:
+                values[(position, plot.id)] = [plot.values.get(variable) for variable in self.__variables]
+
+        return ages, values
+
+    def run_replicates(self, scenario: Scenario):
+        """
+        Runs all the replicates and returns the (ages, values) of every one, see run_replicate.
+        Raises a ScenarioError before running anything if the scenario is not valid.
+        """
+
+        global replicate_state
+
+        self.compile(scenario)
+
+        shared = list()
+        for operation in scenario.operations:
+            if operation.type.get_code_name() not in SHARED_OPERATIONS:
+                break
+            shared.append(operation)
+
+        replicate_state = (self, scenario, self.run_operations(shared, Simulation()))
+
+        Tools.print_log_line('Running ' + str(self.__replicates) + ' replicates of ' + scenario.name, logging.INFO)
+
+        try:
+            if self.__workers > 1 and platform.system() != 'Windows':
+                with Tools.fork_executor(self.__workers) as pool:
+                    return list(pool.map(run_replicate_member, range(self.__replicates)))
+            return [run_replicate_member(index) for index in range(self.__replicates)]
+        finally:
+            replicate_state = None
+
+    def summarise(self, replicates: list):
+        """
+        Returns a row per (step, plot id, variable) with the age of the step, the number of replicates that have
+        a value, the mean and the quantiles.
+        """
+
+        import numpy as np
+
+        keys = OrderedDict()
+        for ages, values in replicates:
+            for key in values.keys():
+                keys[key] = ages[key[0]]
+
+        rows = list()
+
+        for (position, plot_id), age in keys.items():
+            for column, variable in enumerate(self.__variables):
+
+                samples = [values[(position, plot_id)][column] for ages, values in replicates
+                           if (position, plot_id) in values and values[(position, plot_id)][column] is not None]
+
+                if len(samples) == 0:
+                    continue
+
+                samples = np.array(samples, dtype=float)
+                rows.append([position, age, plot_id, variable, len(samples), float(samples.mean())] +
+                            [float(value) for value in np.quantile(samples, self.__quantiles)])
+
+        return rows
+
+    def write_summary(self, file_path: str, rows: list, scenario: Scenario):
+
+        from openpyxl import Workbook
+
+        quantile_names = ['Q' + format(quantile * 100, 'g') for quantile in self.__quantiles]
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('replicates')
+        sheet.append(['STEP', 'AGE', 'OPERATION', 'PLOT_ID', 'VARIABLE', 'N', 'MEAN'] + quantile_names)
+
+        for row in rows:
+            sheet.append([row[0] + 1, row[1], scenario.operations[row[0]].description] + row[2:])
+
+        workbook.save(file_path)
+
+    def run_summary(self, scenario: Scenario):
+        """
+        Runs the replicates of the scenario and writes their summary to <output_path>replicates.xlsx.
+        Returns the path of the summary.
+        """
+
+        file_path = scenario.output_path + REPLICATES_FILE
+        self.write_summary(file_path, self.summarise(self.run_replicates(scenario)), scenario)
+
+        return file_path
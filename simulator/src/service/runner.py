@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from util import Tools
+from scenario.scenario import Scenario
+from scenario import Operation
+from scenario import ScenarioCompiler
+from scenario import ExecutionPlan
+from scenario import PlanStep
+from scenario import INIT
+from scenario import EXECUTION
+from simulation import Simulation
+from simulation.inventory import Inventory
+from engine import EngineFactory
+from engine import MACHINE
+from engine import CLUSTER
+from engine import SUPER
+
+import logging
+import i18n
+import os
+
+TRANSLATIONS_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'translations')
+
+
+class Runner:
+    """
+    Runs the operations of a scenario on an engine and writes the results.
+    main.py runs one scenario with it, the simulation service keeps one alive to run many.
+    """
+
+    def __init__(self, engine_type: int = MACHINE, configuration=None):
+
+        self.__engine_type = engine_type
+        self.__engine = EngineFactory.load_engine(engine_type, configuration)
+
+    @property
+    def engine(self):
+        return self.__engine
+
+    @property
+    def engine_type(self):
+        return self.__engine_type
+
+    @staticmethod
+    def load_translations(language: str):
+
+        if TRANSLATIONS_PATH not in i18n.load_path:
+            i18n.load_path.append(TRANSLATIONS_PATH)
+        i18n.set('locale', language)
+        i18n.set('fallback', 'es')
+
+    @staticmethod
+    def model_key(scenario: Scenario):
+        """
+        Growth model modules trim the global variable lists (PLOT_VARIABLE_NAMES) when they are imported,
+        so a process can only run the scenarios of one set of growth models. This returns that set.
+        """
+
+        paths = set()
+        for operation in scenario.operations:
+            if operation.type.action in [INIT, EXECUTION]:
+                paths.add(operation.model_path)
+
+        return ','.join(sorted(paths))
+
+    def load_model(self, operation: Operation):
+        return Tools.import_module(operation.model_class, operation.model_path, operation.variables)
+
+    def apply_model(self, model, operation: Operation, inventory: Inventory = None):
+        return self.__engine.apply_model(model, operation, inventory)
+
+    def compile(self, scenario: Scenario, operations: list = None):
+        return ScenarioCompiler.compile(scenario, operations)
+
+    def run(self, scenario: Scenario):
+        return self.run_plan(self.compile(scenario), Simulation(), scenario.name)
+
+    def run_operations(self, operations: list, simulation: Simulation):
+        return self.run_plan(ExecutionPlan([PlanStep(operation) for operation in operations]), simulation)
+
+    def run_plan(self, plan: ExecutionPlan, simulation: Simulation, scenario_name: str = None):
+        """
+        Runs the plan on top of the steps already in simulation, starting from the inventory of its last step.
+        """
+
+        inventory: Inventory = None if simulation.number_steps == 0 else simulation.get_last().inventory
+        step = simulation.number_steps + 1
+
+        for plan_step in plan:
+
+            operation = plan_step.operation
+
+            Tools.print_log_line('Executing operation: ' + operation.name, logging.INFO, name='logger_dev')
+            model = self.load_model(operation)
+            ScenarioCompiler.check_model(scenario_name, operation, model)
+            inventory = self.apply_model(model, operation, inventory)
+            simulation.add_step(step, inventory, operation, model)
+
+            if self.__engine.memory is not None:
+                self.__engine.memory.add_history(simulation)
+
+            step += 1
+
+        return simulation
+
+    def run_partitioned(self, scenario: Scenario, size: int):
+        """
+        Runs the scenario on partitions of at most size plots: the LOAD model reads one partition at a time (see
+        LoadModel.apply_model_partitions), and every partition runs the rest of the operations and writes its
+        output files before the next one is read, so only one partition and its steps are kept in memory.
+        Plots do not depend on each other and every plot has its own output file, so the files are the same as
+        in a full run. Returns the output files.
+        """
+
+        if size < 1:
+            raise ValueError('The size of a partition must be 1 plot or more, not ' + str(size))
+
+        plan = self.compile(scenario)
+
+        load_operation = plan.steps[0].operation
+        model = self.load_model(load_operation)
+        ScenarioCompiler.check_model(scenario.name, load_operation, model)
+
+        partitions = model.apply_model_partitions(load_operation.get_variable('input'),
+                                                  load_operation.get_variable('init'), size)
+        files = list()
+
+        for number, partition in enumerate(partitions):
+
+            Tools.print_log_line('Running partition %s (%s plots)', logging.INFO,
+                                 args=(number + 1, partition.get_number_plots()))
+
+            simulation = Simulation()
+            simulation.add_step(1, partition, load_operation, model)
+
+            self.run_plan(ExecutionPlan(plan.steps[1:]), simulation, scenario.name)
+            self.write_results(simulation, scenario)
+
+            files.extend(simulation.get_output_files(scenario.output_path, scenario.ext))
+
+        return files
+
+    def write_results(self, simulation: Simulation, scenario: Scenario):
+
+        if self.__engine_type == MACHINE:
+            simulation.generate_results(
+                scenario.name,
+                scenario.output_path,
+                scenario.modelo,
+                scenario.ext,
+                scenario.zip_compression,
+                scenario.decimal_numbers)
+        elif self.__engine_type in [CLUSTER, SUPER]:
+            simulation.generate_results_parallel(
+                scenario.name,
+                scenario.output_path,
+                scenario.modelo,
+                scenario.ext,
+                scenario.zip_compression,
+                scenario.decimal_numbers)
+
+    def close(self):
+        self.__engine.close()
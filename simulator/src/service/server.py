@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .runner import Runner
+from util import Tools
+from scenario.scenario import Scenario
+from scenario import ScenarioCompiler
+from scenario import ScenarioError
+from scenario import Operation
+from scenario import LOAD
+from simulation.inventory import Inventory
+from engine import MACHINE
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+import socketserver
+import threading
+import logging
+import json
+import time
+import os
+
+try:
+    from http.server import ThreadingHTTPServer
+except ImportError:  # Python 3.6, the class of http.server from 3.7
+    class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+DEFAULT_PORT = 8765
+DEFAULT_INVENTORIES = 8
+DEFAULT_POOLS = 2
+
+
+class SimulationService(Runner):
+    """
+    Runner that keeps its models and the last loaded inventories between jobs.
+    Engines never modify the inventory they receive, so a loaded inventory can be shared by every job that loads
+    the same input file, as long as the file has not changed on disk.
+    """
+
+    def __init__(self, max_inventories: int = DEFAULT_INVENTORIES):
+
+        super().__init__(MACHINE)
+
+        self.__models = dict()
+        self.__inventories = OrderedDict()
+        self.__max_inventories = max_inventories
+
+    @property
+    def models(self):
+        return self.__models
+
+    @property
+    def inventories(self):
+        return self.__inventories
+
+    def load_model(self, operation: Operation):
+
+        key = (operation.model_path, operation.model_class, json.dumps(operation.variables, sort_keys=True))
+
+        if key not in self.__models:
+            self.__models[key] = super().load_model(operation)
+
+        return self.__models[key]
+
+    @staticmethod
+    def inventory_key(operation: Operation):
+
+        input = operation.get_variable('input')
+        files = list(input.values()) if isinstance(input, dict) else [input]
+        stamps = tuple(os.path.getmtime(file) if isinstance(file, str) and os.path.exists(file) else None
+                       for file in files)
+
+        return (operation.model_path, operation.model_class, json.dumps(input, sort_keys=True),
+                operation.get_variable('init'), stamps)
+
+    def apply_model(self, model, operation: Operation, inventory: Inventory = None):
+
+        if operation.type.action != LOAD or self.__max_inventories <= 0:
+            return super().apply_model(model, operation, inventory)
+
+        key = SimulationService.inventory_key(operation)
+
+        if key in self.__inventories:
+            self.__inventories.move_to_end(key)
+            Tools.print_log_line('Inventory ' + str(operation.get_variable('input')) + ' taken from cache',
+                                 logging.INFO)
+            return self.__inventories[key]
+
+        inventory = super().apply_model(model, operation, inventory)
+
+        self.__inventories[key] = inventory
+        while len(self.__inventories) > self.__max_inventories:
+            self.__inventories.popitem(last=False)
+
+        return inventory
+
+    def run_job(self, configuration: dict):
+
+        start = time.perf_counter()
+
+        scenario = Scenario(configuration=configuration)
+        simulation = self.run(scenario)
+        self.write_results(simulation, scenario)
+
+        return {
+            'name': scenario.name,
+            'output_path': scenario.output_path,
+            'files': simulation.get_output_files(scenario.output_path, scenario.ext),
+            'time': time.perf_counter() - start
+        }
+
+
+# every worker process of the pool owns one service, so its caches live as long as the worker
+worker_service: SimulationService = None
+
+
+def init_worker(language: str, logging_config_file: str, level: int, max_inventories: int):
+
+    global worker_service
+
+    Runner.load_translations(language)
+    if logging_config_file is not None:
+        Tools.load_logger_config(logging_config_file, level=level)
+
+    worker_service = SimulationService(max_inventories)
+
+
+def run_worker_job(configuration: dict, worker_arguments: tuple):
+    """
+    Runs a job in a worker of the pool, initializing the worker with init_worker(*worker_arguments) on its first
+    job (ProcessPoolExecutor takes an initializer only from Python 3.7).
+    """
+
+    if worker_service is None:
+        init_worker(*worker_arguments)
+
+    try:
+        return dict(status='done', **worker_service.run_job(configuration))
+    except Exception as e:
+        Tools.print_log_line('Job ' + str(configuration.get('name')) + ' failed: ' + repr(e), logging.ERROR)
+        return {'status': 'error', 'name': configuration.get('name'), 'error': repr(e)}
+
+
+class SimulationRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /simulations with a scenario (json) runs it and streams json lines back: one when the job is accepted
+    and one with the output files when it finishes. GET /health reports the state of the server.
+    """
+
+    def address_string(self):
+        # unix sockets have no client address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'local'
+
+    def log_message(self, format, *args):
+        Tools.print_log_line(self.address_string() + ' ' + (format % args), logging.INFO)
+
+    def send_json(self, code: int, content: dict):
+
+        body = json.dumps(content).encode('utf-8')
+
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_line(self, content: dict):
+        self.wfile.write(json.dumps(content).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def do_GET(self):
+
+        if self.path != '/health':
+            self.send_json(404, {'status': 'error', 'error': 'unknown path ' + self.path})
+            return
+
+        self.send_json(200, {'status': 'ok', 'workers': self.server.workers, 'jobs': self.server.jobs})
+
+    def do_POST(self):
+
+        if self.path != '/simulations':
+            self.send_json(404, {'status': 'error', 'error': 'unknown path ' + self.path})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            configuration = json.loads(self.rfile.read(length).decode('utf-8'))
+            ScenarioCompiler.check(Scenario(configuration=configuration))
+        except ScenarioError as e:
+            self.send_json(400, {'status': 'error', 'error': str(e), 'errors': e.errors})
+            return
+        except Exception as e:
+            self.send_json(400, {'status': 'error', 'error': 'invalid scenario: ' + repr(e)})
+            return
+
+        try:
+            job, future = self.server.submit(configuration)
+        except Exception as e:
+            self.send_json(503, {'status': 'error', 'error': 'the job could not be submitted: ' + repr(e)})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        self.send_line({'status': 'accepted', 'job': job, 'name': configuration['name']})
+        self.send_line(dict(job=job, **future.result()))
+
+        self.close_connection = True
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    daemon_threads = True
+
+
+class SimulationServer:
+    """
+    Long running simulation server. Jobs run on pools of worker processes that stay alive between jobs,
+    so imports, translations, models and inventories are loaded once per worker instead of once per scenario.
+    There is one pool per set of growth models (see Runner.model_key), created when its first job arrives; at most
+    max_pools are kept, the least recently used one is shut down (once its jobs have finished) to make room.
+    Listens on localhost (host, port) or, when socket_path is given, on a unix socket.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = DEFAULT_PORT, socket_path: str = None,
+                 workers: int = None, language: str = 'es', logging_config_file: str = None,
+                 level: int = logging.DEBUG, max_inventories: int = DEFAULT_INVENTORIES,
+                 max_pools: int = DEFAULT_POOLS):
+
+        self.__workers = workers if workers is not None else os.cpu_count()
+        self.__worker_arguments = (language, logging_config_file, level, max_inventories)
+        self.__pools = OrderedDict()
+        self.__max_pools = max(max_pools, 1)
+        self.__jobs = 0
+        self.__lock = threading.Lock()
+
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.__http = ThreadingUnixHTTPServer(socket_path, SimulationRequestHandler)
+        else:
+            self.__http = ThreadingHTTPServer((host, port), SimulationRequestHandler)
+
+        self.__http.workers = self.__workers
+        self.__http.jobs = 0
+        self.__http.submit = self.submit
+
+        self.__socket_path = socket_path
+
+    @property
+    def address(self):
+        return self.__http.server_address
+
+    @property
+    def pools(self):
+        return self.__pools
+
+    def pool(self, key):
+        """
+        Returns the pool of the set of growth models key, creating it if needed. Must be called holding the lock.
+        """
+
+        if key in self.__pools:
+            self.__pools.move_to_end(key)
+            return self.__pools[key]
+
+        self.__pools[key] = ProcessPoolExecutor(max_workers=self.__workers)
+
+        while len(self.__pools) > self.__max_pools:
+            _, pool = self.__pools.popitem(last=False)
+            pool.shutdown(wait=False)  # the jobs already submitted are run before the workers exit
+
+        return self.__pools[key]
+
+    def submit(self, configuration: dict):
+
+        key = Runner.model_key(Scenario(configuration=configuration))
+
+        with self.__lock:
+            self.__jobs += 1
+            self.__http.jobs = self.__jobs
+            job = self.__jobs
+
+            # submitted holding the lock, so another job can not shut the pool down before
+            return job, self.pool(key).submit(run_worker_job, configuration, self.__worker_arguments)
+
+    def serve_forever(self):
+
+        Tools.print_log_line('Simulation server listening on ' + str(self.address), logging.INFO)
+
+        try:
+            self.__http.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        self.__http.shutdown()
+
+    def close(self):
+
+        self.__http.server_close()
+
+        for pool in self.__pools.values():
+            pool.shutdown(wait=True)
+
+        if self.__socket_path is not None and os.path.exists(self.__socket_path):
+            os.remove(self.__socket_path)
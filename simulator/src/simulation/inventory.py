@@ -16,62 +16,164 @@
 # ==============================================================================
 
 from data import Tree
+from data.tree import VARIABLE_NAMES
 from util import Tools
+from util import Tracer
 from data import Plot
+from data import PlotMatrix
 from datetime import datetime
 from reader import ExcelReader, JSONReader
 
 import logging
 
 from scenario import Operation
+from constants import INDEXED_PLOT_VARIABLES
+from constants import PLOT_VARIABLE_NAMES
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+import itertools
+import platform
 
 
 PARCEL_CODE = 'Parcelas'
 TREE_CODE = 'PiesMayores'
 
 
+# reader, sheet, schema, shards and json flag of the trees being loaded, inherited by the forked workers
+load_state = None
+
+
+def group_trees(rows, schema, json: bool):
+    """
+    Builds a tree from every row and returns them grouped by plot id, in the order of the rows.
+    """
+
+    trees = dict()
+
+    for data in rows:
+        tree = Tree(data, schema)
+        plot_trees = trees.get(tree.get_value('PLOT_ID', json))
+        if plot_trees is None:
+            trees[tree.get_value('PLOT_ID', json)] = [tree]
+        else:
+            plot_trees.append(tree)
+
+    return trees
+
+
+def tree_plot_id(data: dict, json: bool):
+    """
+    Plot id of a tree row, as Tree.get_value('PLOT_ID', json) returns it once the tree is built.
+    """
+
+    if json:
+        return data.get('plot')
+
+    try:
+        return int(data.get('PLOT_ID'))
+    except (TypeError, ValueError):
+        return None
+
+
+def load_tree_shard(index: int):
+
+    reader, sheet, schema, shards, json = load_state
+    return group_trees(reader.rows_at(sheet, shards[index]), schema, json)
+
+
 class Inventory:
 
-    def __init__(self, reader=None, date=datetime.now()):
+    def __init__(self, reader=None, date=datetime.now(), workers: int = 1):
 
         self.__date = date
         self.__plots = dict()
         self.__plots_to_print = dict()
+        self.__indexes = dict()  # indexes of INDEXED_PLOT_VARIABLES, built when first used, see plots_by_age
 
         if reader is None:
             Tools.print_log_line("No reader information, generated empty plots list", logging.WARNING)
 
         elif isinstance(reader, ExcelReader):
-            reader.choose_sheet(PARCEL_CODE, True)
+            self.__load(reader, PARCEL_CODE, TREE_CODE, False, workers)
 
-            for plot in reader:
-                p = Plot(plot)
-                self.__plots[p.id] = p
-                self.__plots_to_print[p.id] = True
+        elif isinstance(reader, JSONReader):
+            self.__load(reader, 'plots', 'trees', True, workers)  # True, PLOT_ID is in json format
 
-            reader.choose_sheet(TREE_CODE, True)
+    def __load(self, reader, plots_sheet: str, trees_sheet: str, json: bool, workers: int):
+        """
+        Reads the plots and then the trees of the inventory. With more than one worker and a random_access reader,
+        the trees are built by forked workers, in shards of whole plots, while the plots are read.
+        """
 
-            for data in reader:
-                tree = Tree(data)
-                plot_id = tree.get_value('PLOT_ID')
-                self.__plots[plot_id].add_tree(tree)
+        shards = self.__tree_shards(reader, trees_sheet, workers)
 
-        elif isinstance(reader, JSONReader):
+        if shards is None:
+            self.__load_plots(reader, plots_sheet)
 
-            reader.choose_sheet('plots', True)
+            with Tracer.span('parse ' + trees_sheet, 'load'):
+                reader.choose_sheet(trees_sheet, True)
+                schema = reader.schema(VARIABLE_NAMES, trees_sheet)
+                self.__add_trees(group_trees(reader, schema, json))
+            return
 
-            for plot in reader:
-                p = Plot(plot)
-                self.__plots[p.id] = p
-                self.__plots_to_print[p.id] = True
+        global load_state
+
+        reader.choose_sheet(trees_sheet, True)
+        load_state = (reader, trees_sheet, reader.schema(VARIABLE_NAMES, trees_sheet), shards, json)
+
+        Tools.print_log_line('Reading %s trees in %s shards', logging.INFO, args=(sum(map(len, shards)), len(shards)))
+
+        try:
+            with Tools.fork_executor(len(shards)) as pool:
+                trees = pool.map(load_tree_shard, range(len(shards)))
+
+                self.__load_plots(reader, plots_sheet)
+
+                with Tracer.span('parse ' + trees_sheet, 'load'):
+                    for shard in trees:
+                        self.__add_trees(shard)
+        finally:
+            load_state = None
+
+    @staticmethod
+    def __tree_shards(reader, sheet: str, workers: int):
+        """
+        Positions of the tree rows split in shards of whole plots, by PLOT_ID, or None to read them in this process.
+        """
+
+        if workers is None or workers <= 1 or not reader.random_access or platform.system() == 'Windows':
+            return None
 
-            reader.choose_sheet('trees', True)
+        plots = dict()  # plot id: positions of its trees
 
-            for data in reader:
-                tree = Tree(data)
-                plot_id = tree.get_value('PLOT_ID', True) # True, it's in json format
-                self.__plots[plot_id].add_tree(tree)
+        for position, plot_id in enumerate(reader.column(sheet, 'PLOT_ID')):
+            plots.setdefault(plot_id, list()).append(position)
 
+        if len(plots) < 2:
+            return None
+
+        count = min(workers, len(plots))
+        shards = [list() for _ in range(count)]
+
+        for index, positions in enumerate(plots.values()):
+            shards[index % count].extend(positions)
+
+        return shards
+
+    def __load_plots(self, reader, sheet: str):
+
+        with Tracer.span('parse ' + sheet, 'load'):
+            reader.choose_sheet(sheet, True)
+            schema = reader.schema(PLOT_VARIABLE_NAMES, sheet)
+
+            for plot in reader:
+                self.add_plot(Plot(plot, schema))
+
+    def __add_trees(self, trees: dict):
+        for plot_id, plot_trees in trees.items():
+            self.__plots[plot_id].add_trees(plot_trees)
 
     @property
     def plots(self):
@@ -97,6 +199,72 @@ class Inventory:
     def add_plot(self, plot: Plot, print: bool = True):
         self.__plots[plot.id] = plot
         self.__plots_to_print[plot.id] = print
+        plot.add_owner(self)
+        self.__indexes.clear()
+
+    def plot_changed(self, variable: str):
+        """
+        Called by the plots of the inventory when an indexed variable changes, so its index is built again.
+        """
+        self.__indexes.pop(variable, None)
+
+    def age_index(self):
+        """
+        Returns the ages of the plots sorted, with the position every plot was added in and the plots in the
+        same order, or None when the ages can not be sorted (e.g. a plot without age).
+        """
+
+        if 'AGE' not in self.__indexes:
+
+            try:
+                entries = sorted((plot.age, position, plot) for position, plot in enumerate(self.__plots.values())
+                                 if plot.age == plot.age)  # nan ages are never in a window
+                self.__indexes['AGE'] = ([entry[0] for entry in entries], [entry[1] for entry in entries],
+                                         [entry[2] for entry in entries])
+            except TypeError:
+                self.__indexes['AGE'] = None
+
+        return self.__indexes['AGE']
+
+    def plots_by_age(self, min_age, max_age):
+        """
+        Returns the plots with min_age <= AGE <= max_age, in the order they were added, found with a range query
+        on the age index instead of testing every plot.
+        """
+
+        index = self.age_index()
+
+        if index is None:
+            return [plot for plot in self.__plots.values() if min_age <= plot.age <= max_age]
+
+        ages, positions, plots = index
+
+        low = bisect_left(ages, min_age)
+        high = bisect_right(ages, max_age)
+
+        if low == 0 and high == len(self.__plots):
+            return list(self.__plots.values())
+
+        return [plots[i] for i in sorted(range(low, high), key=positions.__getitem__)]
+
+    def plots_by(self, variable: str, value):
+        """
+        Returns the plots whose variable is value, in the order they were added. The variables of
+        INDEXED_PLOT_VARIABLES are looked up in an index; any other variable is searched plot by plot.
+        """
+
+        if variable not in INDEXED_PLOT_VARIABLES:
+            return [plot for plot in self.__plots.values() if plot.get_value(variable) == value]
+
+        if variable not in self.__indexes:
+
+            index = dict()
+            for plot in self.__plots.values():
+                index.setdefault(plot.get_value(variable), list()).append(plot)
+
+            self.__indexes[variable] = index
+
+        return list(self.__indexes[variable].get(value, []))
 
 
     def add_plots(self, plots: list):
@@ -109,6 +277,80 @@ class Inventory:
         return self
 
 
+    def partitions(self, size: int):
+        """
+        Yields inventories of at most size plots, in the order they were added. The plots are taken out of this
+        inventory as they are yielded, so every partition can be released once it has been used.
+        """
+
+        if size < 1:
+            raise ValueError('The size of a partition must be 1 plot or more, not ' + str(size))
+
+        while len(self.__plots) > 0:
+
+            partition = Inventory(None, self.__date)
+
+            for plot_id in list(itertools.islice(self.__plots.keys(), size)):
+                plot = self.__plots.pop(plot_id)
+                plot.remove_owner(self)
+                partition.add_plot(plot, self.__plots_to_print.pop(plot_id))
+
+            self.__indexes.clear()
+
+            yield partition
+
+    @staticmethod
+    def read_partitions(reader, size: int, date=datetime.now()):
+        """
+        Yields the inventory of reader in partitions of at most size plots, like partitions, without reading the
+        whole inventory first: the plots of a partition are taken from the plots sheet, and then only their trees
+        from the trees sheet, which is read again for every partition. Only one partition is kept in memory.
+        """
+
+        if size < 1:
+            raise ValueError('The size of a partition must be 1 plot or more, not ' + str(size))
+
+        if isinstance(reader, ExcelReader):
+            plots_sheet, trees_sheet, json = PARCEL_CODE, TREE_CODE, False
+        elif isinstance(reader, JSONReader):
+            plots_sheet, trees_sheet, json = 'plots', 'trees', True
+        else:
+            Tools.print_log_line("No reader information, generated empty plots list", logging.WARNING)
+            return
+
+        columns, plots = reader.sheet(plots_sheet)
+        plot_schema = reader.schema(PLOT_VARIABLE_NAMES, plots_sheet, columns)
+        tree_schema = None
+
+        while True:
+
+            partition = Inventory(None, date)
+
+            with Tracer.span('parse ' + plots_sheet, 'load'):
+                for data in itertools.islice(plots, size):
+                    partition.add_plot(Plot(data, plot_schema))
+
+            if partition.empty:
+                return
+
+            with Tracer.span('parse ' + trees_sheet, 'load'):
+                columns, trees = reader.sheet(trees_sheet)
+                if tree_schema is None:
+                    tree_schema = reader.schema(VARIABLE_NAMES, trees_sheet, columns)
+
+                plot_ids = set(partition.get_plot_ids())
+                trees = (data for data in trees if tree_plot_id(data, json) in plot_ids)
+                partition.__add_trees(group_trees(trees, tree_schema, json))
+
+            yield partition
+
+    def plot_matrix(self, names: list = None):
+        """
+        Returns the variables of the plots as a PlotMatrix, one row per plot in the order they were added and
+        one column per variable of names (PLOT_VARIABLE_NAMES by default).
+        """
+        return PlotMatrix(list(self.__plots.values()), names)
+
     def get_plot(self, position: int):
         if self.get_number_plots() > position:
             count: int = 0
@@ -141,27 +383,26 @@ class Inventory:
         if inventory is None:
             return
 
-        min = operation.get_variable('min_age') if operation.has('min_age') else 0
-        max = operation.get_variable('max_age') if operation.has('max_age') else 1000
-        time = 0
+        min, max = operation.age_window
+        time = operation.get_variable('time')
+
+        window = inventory.plots_by_age(min, max)  # the plots the operation was applied to get its time
+        in_window = set(id(plot) for plot in window)
 
         for plot in inventory.plots:
 
-            if min <= plot.age <= max:
-                time = operation.get_variable('time')
-                
             if plot.id not in self.__plots.keys():
 
                 new_plot = Plot()
-                new_plot.clone(plot, True)
-                new_plot.sum_value('AGE', time)
+                new_plot.share(plot)  # the operation left the plot as it was, its trees are not copied
+                if id(plot) in in_window:
+                    new_plot.sum_value('AGE', time)
 
-                self.__plots_to_print[plot.id] = False
-                self.__plots[plot.id] = new_plot
+                self.add_plot(new_plot, False)
 
+        for plot in window:
             self.__plots[plot.id].sum_value('AGE', time)
             # self.__plots[plot.id].update_trees({'AGE': time}, 1)
-            time = 0
 
     def to_json(self, plot_id: int , node):
 
@@ -18,12 +18,10 @@
 from data import Tree
 from .step import Step
 from util import Tools
+from util import Tracer
 from datetime import datetime
 from .inventory import Inventory
 from scenario import Operation
-from openpyxl import Workbook
-from openpyxl import drawing
-from openpyxl.styles import Alignment
 from models import HarvestModel
 from constants import OUTPUT_FILE_BASE
 from constants import OUTPUT_EXTENSION
@@ -35,8 +33,6 @@ import os
 import i18n
 import json
 
-from dask import delayed
-
 XLSX = 0
 JSON = 1
 
@@ -69,6 +65,19 @@ class Simulation:
         self.__steps.append(Step(step_id, inventory, operation.type, operation.description, 
                                  age, min_age, max_age, operation, model_name))
 
+    @property
+    def number_steps(self):
+        return len(self.__steps)
+
+    def copy(self):
+        """
+        Returns a simulation with the same steps, so more steps can be added to it without touching this one.
+        """
+
+        simulation = Simulation(self.__date)
+        simulation.__steps = list(self.__steps)
+        return simulation
+
     def get_step(self, position):
         if position < len(self.__steps):
             return self.__steps[position]
@@ -115,7 +124,9 @@ class Simulation:
 
 
     def resumen_merged_header(self, sheet, cell_range, row, col, val):
-        
+
+        from openpyxl.styles import Alignment
+
         sheet.merge_cells(cell_range)
         cell = sheet.cell(row = row, column = col)
         cell.value = val
@@ -126,7 +137,10 @@ class Simulation:
     def generate_xslt_file(self, name: str, labels: dict, file_path: str, plot, modelo: str, zip_compression: bool = False, 
                            type: int = JSON, decimals: int = 2):
 
-        Tools.print_log_line('Generating xslf file for plot ' + str(plot.id), logging.INFO)
+        from openpyxl import Workbook
+        from openpyxl import drawing
+
+        Tools.print_log_line('Generating xslf file for plot %s', logging.INFO, args=(plot.id,))
 
         workbook = Workbook()
 
@@ -223,6 +237,12 @@ class Simulation:
         return plot
 
 
+    def write_xslt_file(self, name: str, labels: dict, file_path: str, plot, modelo: str, decimals: int = 2):
+
+        with Tracer.span('write ' + os.path.basename(file_path), 'output', {'plot': str(plot.id)}):
+            return self.generate_xslt_file(name, labels, file_path, plot, modelo, decimals=decimals)
+
+
     def get_labels(self):
  
         labels = dict()
@@ -301,6 +321,15 @@ class Simulation:
         return labels
 
 
+    def get_output_file(self, file_path: str, plot, type: int = XLSX):
+
+        if isinstance(plot.id, str): # json input
+            return file_path + OUTPUT_FILE_BASE + os.path.split(plot.id)[1] + '.' + OUTPUT_EXTENSION[type]
+        return file_path + OUTPUT_FILE_BASE + str(plot.id) + '.' + OUTPUT_EXTENSION[type]
+
+    def get_output_files(self, file_path: str, type: int = XLSX):
+        return [self.get_output_file(file_path, plot, type) for plot in self.get_first_step().inventory.plots]
+
     def generate_results(self, name: str, file_path: str, modelo: str, type: int = XLSX, zip_compression: bool = False, 
                          decimals: int = 2):
 
@@ -310,14 +339,11 @@ class Simulation:
 
         for plot in plots:
 
-            if isinstance(plot.id, str): # json input
-                filename = file_path + OUTPUT_FILE_BASE + os.path.split(plot.id)[1] + '.' + OUTPUT_EXTENSION[type]
-            else:
-                filename = file_path + OUTPUT_FILE_BASE + str(plot.id) + '.' + OUTPUT_EXTENSION[type]
+            filename = self.get_output_file(file_path, plot, type)
 
             if type == XLSX:
 
-                self.generate_xslt_file(
+                self.write_xslt_file(
                     name, labels,
                     filename,
                     plot, modelo, decimals=decimals)
@@ -342,6 +368,8 @@ class Simulation:
     def generate_results_parallel(self, name: str, file_path: str, modelo: str, type: int = XLSX, zip_compression: bool = False, 
                          decimals: int = 2):
 
+        from dask import delayed
+
         labels = self.get_labels()
         # plot_labels['simanfor.general.Summary'] = i18n.t('simanfor.general.Summary')
 
@@ -349,16 +377,25 @@ class Simulation:
 
         outfile_list = []
 
+        # when tracing, every task returns the spans recorded on its worker instead of the plot
+        write_file = self.write_xslt_file if not Tracer.enabled() else Tracer.collect(self.write_xslt_file)
+
         for plot in plots:
             if type == XLSX:
                 # recalc_list.append(self.recalculate_process(new_plot, model, 
                 #         operation.get_variable('time'), result_pies_mayores, result_inventory))
 
-                outfile_list.append(delayed(self.generate_xslt_file)(name, labels,
+                outfile_list.append(delayed(write_file)(name, labels,
                     file_path + OUTPUT_FILE_BASE + str(plot.id) + '.' + OUTPUT_EXTENSION[type], 
                     plot, modelo, decimals=decimals))
 
         # result_inventory = (delayed(result_inventory.add_plots)(recalc_list)).compute(scheduler="distributed") # default, same as empty ""
-        nbr_plots = delayed(self.print_plots)(outfile_list).compute(scheduler="distributed")
+        if Tracer.enabled():
+            worker_events = delayed(list)(outfile_list).compute(scheduler="distributed")
+            for events in worker_events:
+                Tracer.add_events(events)
+            nbr_plots = len(worker_events)
+        else:
+            nbr_plots = delayed(self.print_plots)(outfile_list).compute(scheduler="distributed")
         # nbr_plots = delayed(self.print_plots)(outfile_list).compute(scheduler="single-threaded")
         print("Printed", nbr_plots, "output files.")
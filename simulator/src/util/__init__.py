@@ -1,4 +1,9 @@
 # __init__.py
 
 from .config import ConfigHandler
-from .tools import Tools
\ No newline at end of file
+from .tools import Tools
+from .profiler import Profiler
+from .tracer import Tracer
+from .plot_cache import PlotCache
+from .progress import Progress
+from .memory import MemoryProfiler
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .tools import Tools
+
+from contextlib import contextmanager
+
+import tracemalloc
+import logging
+import json
+import sys
+import gc
+import os
+
+MEGABYTE = 1024 * 1024
+
+# allocation sites listed in the summary
+TOP_ALLOCATIONS = 10
+
+
+class MemoryProfiler:
+    """
+    Measures the memory of every Engine.apply_model call with tracemalloc: what the call left allocated (delta, the
+    plots and trees cloned into the new inventory) and the most it had allocated at once (peak). After every step the
+    runner adds the size of the simulation history and the number of live Tree and Plot objects, and main.py measures
+    the output workbooks as one more section, so the summary shows whether memory goes to the step history, the
+    clones of a step or the output. Tracing slows the run down, so it is only started when somebody asks for it.
+    """
+
+    def __init__(self, frames: int = 1):
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+        self.__records = list()
+
+    @property
+    def records(self):
+        return self.__records
+
+    @staticmethod
+    def rss():
+        """
+        Resident memory of the process in bytes, or None where /proc is not available.
+        """
+
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError, AttributeError):
+            return None
+
+    @staticmethod
+    def peak_rss():
+        """
+        Most resident memory the process has had in bytes (its high-water mark, VmHWM), which can be higher than
+        every rss sampled after the steps. Read from getrusage where /proc is not available, or None.
+        """
+
+        try:
+            with open('/proc/self/status') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, kilobytes elsewhere
+        except (ImportError, OSError):
+            return None
+
+    @staticmethod
+    def count_objects():
+        """
+        Returns the number of live Tree and Plot objects, after collecting the garbage.
+        """
+
+        from data import Tree
+        from data import Plot
+
+        gc.collect()
+
+        trees = plots = 0
+        for item in gc.get_objects():
+            if isinstance(item, Tree):
+                trees += 1
+            elif isinstance(item, Plot):
+                plots += 1
+
+        return trees, plots
+
+    @contextmanager
+    def measure(self, name: str, action: str, model: str = ''):
+
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.__records.append({
+                'operation': name,
+                'action': action,
+                'model': model,
+                'delta': current - before,
+                'peak': peak - before,
+                'current': current,
+                'rss': MemoryProfiler.rss()
+            })
+
+    def add_history(self, simulation):
+        """
+        Adds to the last record the steps of simulation, the distinct plots and trees they keep alive,
+        and the live Tree and Plot objects.
+        """
+
+        plots = set()
+        trees = set()
+
+        for position in range(simulation.number_steps):
+            for plot in simulation.get_step(position).inventory.plots:
+                if id(plot) not in plots:
+                    plots.add(id(plot))
+                    trees.update(id(tree) for tree in plot.trees)
+
+        live_trees, live_plots = MemoryProfiler.count_objects()
+
+        self.__records[-1].update({
+            'steps': simulation.number_steps,
+            'history_plots': len(plots),
+            'history_trees': len(trees),
+            'live_plots': live_plots,
+            'live_trees': live_trees
+        })
+
+    @staticmethod
+    def top_allocations(limit: int = TOP_ALLOCATIONS):
+
+        statistics = tracemalloc.take_snapshot().statistics('filename')
+
+        return [{'file': statistic.traceback[0].filename, 'size': statistic.size, 'count': statistic.count}
+                for statistic in statistics[:limit]]
+
+    def to_json(self):
+
+        return {
+            'peak_rss': MemoryProfiler.peak_rss(),
+            'operations': self.__records,
+            'allocations': MemoryProfiler.top_allocations()
+        }
+
+    def write_json(self, file_path: str):
+
+        with open(file_path, 'w') as outfile:
+            json.dump(self.to_json(), outfile, indent=2)
+
+        Tools.print_log_line('Memory profile written to ' + file_path, logging.INFO)
+
+    def summary(self):
+
+        lines = list()
+
+        lines.append('{:<4} {:<28} {:<10} {:>10} {:>10} {:>10} {:>10} {:>6} {:>10} {:>10}'.format(
+            'Step', 'Operation', 'Action', 'Delta (MB)', 'Peak (MB)', 'Total (MB)', 'RSS (MB)', 'Steps',
+            'Kept trees', 'Live trees'))
+
+        step = 1
+        for record in self.__records:
+            lines.append('{:<4} {:<28} {:<10} {:>10.2f} {:>10.2f} {:>10.2f} {:>10} {:>6} {:>10} {:>10}'.format(
+                step, record['operation'][:28], record['action'][:10], record['delta'] / MEGABYTE,
+                record['peak'] / MEGABYTE, record['current'] / MEGABYTE,
+                '' if record['rss'] is None else '{:.2f}'.format(record['rss'] / MEGABYTE),
+                record.get('steps', ''), record.get('history_trees', ''), record.get('live_trees', '')))
+            step += 1
+
+        lines.append('')
+        lines.append('{:<70} {:>10} {:>10}'.format('Allocated by', 'Size (MB)', 'Blocks'))
+
+        for allocation in MemoryProfiler.top_allocations():
+            lines.append('{:<70} {:>10.2f} {:>10}'.format(
+                allocation['file'][-70:], allocation['size'] / MEGABYTE, allocation['count']))
+
+        return '\n'.join(lines)
+
+    def print_summary(self):
+        print(self.summary())
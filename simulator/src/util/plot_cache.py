@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .tools import Tools
+
+from collections import OrderedDict
+
+import tempfile
+import hashlib
+import inspect
+import logging
+import pickle
+import json
+import os
+
+# megabytes kept on disk before the least recently used plots are removed
+DEFAULT_CACHE_SIZE = 512
+
+CACHE_EXTENSION = '.plot'
+
+# file of the cache directory with the stamp of the sources its plots were computed with
+STAMP_FILE = 'sources.stamp'
+
+# the simulator sources: models, engines, Plot, Tree... every plot depends on
+SOURCE_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PlotCache:
+    """
+    Disk cache of the plots produced by an operation. A plot is stored under the hash of the plot it was grown from,
+    the model (module, class and source code) and the operation variables, so running the same operation on the
+    same plot again reads the result instead of computing it. When the cache is over max_size megabytes the least
+    recently used plots are removed. Several processes can share the same directory; each one only evicts the
+    plots it knows about. The results also depend on code shared by every model (TreeModel, the engines, Plot,
+    Tree...), so the keys include a stamp of the simulator sources, and the directory is cleared when it was
+    filled with other sources, e.g. after an upgrade or a local change.
+    """
+
+    # hash of the source file of every model class, computed once per process
+    __sources = dict()
+
+    def __init__(self, path: str, max_size: int = DEFAULT_CACHE_SIZE, sources: str = SOURCE_FOLDER):
+
+        self.__path = path
+        self.__max_size = max_size * 1024 * 1024
+        self.__entries = OrderedDict()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__stamp = PlotCache.source_stamp(sources)
+
+        os.makedirs(path, exist_ok=True)
+
+        self.__check_stamp()
+
+        files = list()
+        for file_name in os.listdir(path):
+            if file_name.endswith(CACHE_EXTENSION):
+                stat = os.stat(os.path.join(path, file_name))
+                files.append((stat.st_mtime, file_name[:-len(CACHE_EXTENSION)], stat.st_size))
+
+        for mtime, key, size in sorted(files):
+            self.__entries[key] = size
+            self.__size += size
+
+    @staticmethod
+    def source_stamp(folder: str):
+        """
+        Hash of the path and content of every python file under folder.
+        """
+
+        digest = hashlib.sha256()
+
+        for root, folders, files in os.walk(folder):
+            folders[:] = sorted(name for name in folders if name != '__pycache__')
+            for file_name in sorted(files):
+                if file_name.endswith('.py'):
+                    file_path = os.path.join(root, file_name)
+                    digest.update(os.path.relpath(file_path, folder).encode())
+                    with open(file_path, 'rb') as source:
+                        digest.update(source.read())
+
+        return digest.hexdigest()
+
+    def __check_stamp(self):
+        """
+        Removes the plots of the directory when they were computed with other sources, and writes the stamp.
+        """
+
+        stamp_path = os.path.join(self.__path, STAMP_FILE)
+
+        try:
+            with open(stamp_path, 'r') as f:
+                stamp = f.read().strip()
+        except OSError:
+            stamp = None
+
+        if stamp == self.__stamp:
+            return
+
+        removed = 0
+        for file_name in os.listdir(self.__path):
+            if file_name.endswith(CACHE_EXTENSION):
+                try:
+                    os.remove(os.path.join(self.__path, file_name))
+                    removed += 1
+                except OSError:
+                    pass
+
+        if removed > 0:
+            Tools.print_log_line('Plot cache cleared, %s plots were computed with other simulator sources',
+                                 logging.INFO, args=(removed,))
+
+        try:
+            with open(stamp_path, 'w') as f:
+                f.write(self.__stamp)
+        except OSError as e:
+            Tools.print_log_line('Plot cache stamp could not be written: ' + str(e), logging.WARNING)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def stamp(self):
+        return self.__stamp
+
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @staticmethod
+    def plot_hash(plot):
+        """
+        Hash of the plot variables and its living trees, the state an operation reads.
+        """
+
+        state = (plot.values, [tree.values for tree in plot.trees])
+        return hashlib.sha256(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    @staticmethod
+    def model_hash(model):
+
+        model_class = type(model)
+        name = model_class.__module__ + '.' + model_class.__qualname__
+
+        if name not in PlotCache.__sources:
+            try:
+                with open(inspect.getfile(model_class), 'rb') as source:
+                    PlotCache.__sources[name] = hashlib.sha256(source.read()).hexdigest()
+            except (OSError, TypeError):
+                PlotCache.__sources[name] = ''
+
+        return name + ':' + PlotCache.__sources[name]
+
+    def key(self, plot, model, operation):
+
+        operation_data = json.dumps([operation.type.get_code_name(), operation.variables], sort_keys=True, default=str)
+
+        digest = hashlib.sha256()
+        digest.update(self.__stamp.encode())
+        digest.update(PlotCache.plot_hash(plot).encode())
+        digest.update(PlotCache.model_hash(model).encode())
+        digest.update(operation_data.encode())
+
+        return digest.hexdigest()
+
+    def file_path(self, key: str):
+        return os.path.join(self.__path, key + CACHE_EXTENSION)
+
+    def get(self, key: str):
+        """
+        Returns the plot stored under key, or None if there is none.
+        """
+
+        file_path = self.file_path(key)
+
+        try:
+            with open(file_path, 'rb') as f:
+                plot = pickle.load(f)
+            os.utime(file_path)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            if not isinstance(e, FileNotFoundError):
+                Tools.print_log_line('Plot cache entry ' + key + ' could not be read: ' + str(e), logging.WARNING)
+            self.__forget(key)
+            self.__misses += 1
+            return None
+
+        if key not in self.__entries:
+            self.__entries[key] = os.path.getsize(file_path)
+            self.__size += self.__entries[key]
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+
+        return plot
+
+    def put(self, key: str, plot):
+
+        data = pickle.dumps(plot, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # written to a temporary file first, so other processes never read a half written plot
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.__path, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temporary_path, self.file_path(key))
+        except OSError as e:
+            Tools.print_log_line('Plot cache entry ' + key + ' could not be written: ' + str(e), logging.WARNING)
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return
+
+        self.__forget(key)
+        self.__entries[key] = len(data)
+        self.__size += len(data)
+
+        while self.__size > self.__max_size and len(self.__entries) > 1:
+            oldest = next(iter(self.__entries))
+            self.__forget(oldest)
+            try:
+                os.remove(self.file_path(oldest))
+            except OSError:
+                pass
+
+    def clear(self):
+
+        for key in list(self.__entries.keys()):
+            self.__forget(key)
+            try:
+                os.remove(self.file_path(key))
+            except OSError:
+                pass
+
+    def __forget(self, key: str):
+
+        if key in self.__entries:
+            self.__size -= self.__entries.pop(key)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .tools import Tools
+
+import functools
+import logging
+import json
+import time
+
+
+PLOT = 'plot'
+TREE = 'tree'
+
+# Model hooks instrumented by the profiler and what each call is counted as.
+MODEL_HOOKS = {
+    'initialize': PLOT,
+    'survives': TREE,
+    'grow': TREE,
+    'add_tree': PLOT,
+    'process_plot': PLOT,
+    'apply_grow_model': PLOT,
+    'apply_cut_down_model': PLOT,
+    'apply_model': PLOT
+}
+
+
+class Profiler:
+
+    def __init__(self):
+
+        self.__start = time.perf_counter()
+        self.__operations = list()
+        self.__models = dict()
+
+    @property
+    def operations(self):
+        return self.__operations
+
+    @property
+    def models(self):
+        return self.__models
+
+    @staticmethod
+    def count_trees(inventory):
+
+        if inventory is None:
+            return 0
+
+        trees = 0
+        for plot in inventory.plots:
+            trees += plot.get_number_trees()
+        return trees
+
+    def instrument(self, model):
+        """
+        Wraps the hooks of a model instance so every call is timed and counted.
+        The wrappers live on the instance, so the model class is left untouched.
+        """
+
+        if model is None or getattr(model, '_profiled', False):
+            return model
+
+        model_name = type(model).__name__
+
+        for hook, unit in MODEL_HOOKS.items():
+            method = getattr(model, hook, None)
+            if method is not None and callable(method):
+                setattr(model, hook, self.__wrap(model_name, hook, unit, method))
+
+        model._profiled = True
+
+        return model
+
+    def __wrap(self, model_name: str, hook: str, unit: str, method):
+
+        record = self.__models.setdefault(model_name + '.' + hook, {
+            'model': model_name,
+            'hook': hook,
+            'calls': 0,
+            'time': 0.0,
+            'plots': 0,
+            'trees': 0
+        })
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record['time'] += time.perf_counter() - start
+                record['calls'] += 1
+                if unit == TREE:
+                    record['trees'] += 1
+                else:
+                    record['plots'] += 1
+                    record['trees'] += Profiler.__hook_trees(hook, args)
+
+        return wrapper
+
+    @staticmethod
+    def __hook_trees(hook: str, args):
+
+        if hook == 'process_plot' and len(args) > 2:
+            return len(args[2])
+        if hook in ['initialize', 'apply_model'] and len(args) > 0 and hasattr(args[0], 'get_number_trees'):
+            return args[0].get_number_trees()
+        return 0
+
+    def add_operation(self, operation, model, elapsed: float, inventory=None, new_inventory=None):
+
+        self.__operations.append({
+            'operation': operation.name,
+            'action': operation.type.get_code_name(),
+            'model': type(model).__name__,
+            'time': elapsed,
+            'plots_in': 0 if inventory is None else inventory.get_number_plots(),
+            'plots_out': 0 if new_inventory is None else new_inventory.get_number_plots(),
+            'trees_in': Profiler.count_trees(inventory),
+            'trees_out': Profiler.count_trees(new_inventory)
+        })
+
+    def add_section(self, name: str, elapsed: float):
+
+        self.__operations.append({
+            'operation': name,
+            'action': name.upper(),
+            'model': '',
+            'time': elapsed,
+            'plots_in': 0,
+            'plots_out': 0,
+            'trees_in': 0,
+            'trees_out': 0
+        })
+
+    def to_json(self):
+
+        return {
+            'total_time': time.perf_counter() - self.__start,
+            'operations': self.__operations,
+            'models': [record for record in self.__models.values() if record['calls'] > 0]
+        }
+
+    def write_json(self, file_path: str):
+
+        with open(file_path, 'w') as outfile:
+            json.dump(self.to_json(), outfile, indent=2)
+
+        Tools.print_log_line('Profile written to ' + file_path, logging.INFO)
+
+    def summary(self):
+
+        lines = list()
+
+        lines.append('{:<4} {:<28} {:<10} {:<28} {:>10} {:>8} {:>10}'.format(
+            'Step', 'Operation', 'Action', 'Model', 'Time (s)', 'Plots', 'Trees'))
+
+        step = 1
+        for operation in self.__operations:
+            lines.append('{:<4} {:<28} {:<10} {:<28} {:>10.3f} {:>8} {:>10}'.format(
+                step, operation['operation'][:28], operation['action'][:10], operation['model'][:28],
+                operation['time'], operation['plots_out'], operation['trees_out']))
+            step += 1
+
+        lines.append('')
+        lines.append('{:<28} {:<22} {:>10} {:>10} {:>12} {:>8} {:>10}'.format(
+            'Model', 'Hook', 'Calls', 'Time (s)', 'Per call (ms)', 'Plots', 'Trees'))
+
+        for record in sorted(self.__models.values(), key=lambda item: item['time'], reverse=True):
+            if record['calls'] == 0:
+                continue
+            per_call = record['time'] * 1000 / record['calls'] if record['calls'] > 0 else 0
+            lines.append('{:<28} {:<22} {:>10} {:>10.3f} {:>12.4f} {:>8} {:>10}'.format(
+                record['model'][:28], record['hook'], record['calls'], record['time'], per_call,
+                record['plots'], record['trees']))
+
+        lines.append('')
+        lines.append('Total time: {:.3f} s'.format(time.perf_counter() - self.__start))
+
+        return '\n'.join(lines)
+
+    def print_summary(self):
+        print(self.summary())
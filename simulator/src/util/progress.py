@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import datetime
+import json
+import time
+import sys
+import os
+
+# seconds between two reports of the same operation
+DEFAULT_INTERVAL = 1.0
+
+
+class Progress:
+    """
+    Reports how the running operation goes: plots done out of the total, trees per second and the estimated time
+    left. The engines count every plot they finish in Engine.trace_plots, so reporting needs no extra pass over
+    the inventory. Without file_path a progress line is rewritten on stream (stderr by default); with it a JSON
+    line is appended to the file every interval seconds and when the operation ends, for schedulers to read.
+    Forked workers (batch and replicate runs) inherit the reporter and write their own lines, tagged with their pid.
+    """
+
+    def __init__(self, file_path: str = None, interval: float = DEFAULT_INTERVAL, stream=None):
+
+        self.__file_path = file_path
+        self.__interval = interval
+        self.__stream = stream
+        self.__file = None
+        self.__pid = None
+
+        self.__operation = None
+        self.__action = None
+        self.__plots = 0
+        self.__done = 0
+        self.__trees = 0
+        self.__start = 0.0
+        self.__reported = 0.0
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def plots(self):
+        return self.__plots
+
+    @property
+    def done(self):
+        return self.__done
+
+    @property
+    def trees(self):
+        return self.__trees
+
+    def start(self, operation, plots: int):
+
+        self.__operation = operation.name
+        self.__action = operation.type.get_code_name()
+        self.__plots = plots
+        self.__done = 0
+        self.__trees = 0
+        self.__start = self.__reported = time.monotonic()
+
+    def update(self, trees: int):
+        """
+        Counts one more plot done, with the trees it had, and reports if interval seconds went by since the last time.
+        The last plot is reported by finish.
+        """
+
+        self.__done += 1
+        self.__trees += trees
+
+        now = time.monotonic()
+        if now - self.__reported >= self.__interval and self.__done < self.__plots:
+            self.__reported = now
+            self.report(False)
+
+    def finish(self):
+        self.report(True)
+
+    def record(self, finished: bool = False):
+        """
+        Returns the state of the running operation as a dict, the content of a JSON line.
+        """
+
+        elapsed = time.monotonic() - self.__start
+        speed = self.__done / elapsed if elapsed > 0 else 0.0
+
+        return {
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+            'operation': self.__operation,
+            'action': self.__action,
+            'plots_done': self.__done,
+            'plots': self.__plots,
+            'trees': self.__trees,
+            'trees_per_second': self.__trees / elapsed if elapsed > 0 else 0.0,
+            'elapsed': elapsed,
+            'eta': (self.__plots - self.__done) / speed if speed > 0 else None,
+            'finished': finished
+        }
+
+    def report(self, finished: bool = False):
+
+        record = self.record(finished)
+
+        if self.__file_path is not None:
+            self.__json_file().write(json.dumps(record) + '\n')
+            self.__file.flush()
+            return
+
+        stream = self.__stream if self.__stream is not None else sys.stderr
+        stream.write('\r' + Progress.format_line(record) + ('\n' if finished else ''))
+        stream.flush()
+
+    @staticmethod
+    def format_line(record: dict):
+
+        eta = '--:--:--' if record['eta'] is None else str(datetime.timedelta(seconds=round(record['eta'])))
+
+        return '{}: {}/{} plots, {:.0f} trees/s, ETA {}'.format(
+            record['operation'], record['plots_done'], record['plots'], record['trees_per_second'], eta)
+
+    def __json_file(self):
+
+        # a forked worker opens its own file, so buffers are never shared between processes
+        if self.__file is None or self.__pid != os.getpid():
+            self.__file = open(self.__file_path, 'a', encoding='utf-8')
+            self.__pid = os.getpid()
+
+        return self.__file
+
+    def close(self):
+
+        if self.__file is not None and self.__pid == os.getpid():
+            self.__file.close()
+        self.__file = None
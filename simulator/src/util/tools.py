@@ -17,51 +17,142 @@
 
 import importlib
 import logging.config
+import threading
 import inspect
 import i18n
+import sys
+
+# logger of the banners printed by the engine and the models, configured in logging.conf
+BANNER_LOGGER = 'logger_banner'
+
+# times the same warning or error is logged before it is silenced
+REPEATED_LOGS = 10
+
+# logging takes stacklevel from Python 3.8; before it, records point at print_log_line
+STACKLEVEL = sys.version_info >= (3, 8)
 
 
 class Tools:
 
+    # loggers by name, so hot paths do not go through logging.getLogger and its lock on every line
+    __loggers = dict()
+
+    # (logger, level, message, args) of the warnings and errors logged, with the times they were logged
+    __repeats = dict()
+    __repeats_lock = threading.Lock()
+
     @staticmethod
     def import_module(class_name, class_path, configuration=None):
 
-        module_loaded = importlib.import_module(class_path)
+        module_loaded = importlib.import_module(Tools.module_name(class_path))
         class_definition = getattr(module_loaded, class_name)
         if inspect.isclass(class_definition):
             return class_definition(configuration)
 
         return None
 
+    @staticmethod
+    def module_name(class_path: str):
+        """
+        Module of a model_path, which some scenarios write as the file of the module (e.g. models.stand.model.py).
+        """
+
+        return class_path[:-len('.py')] if class_path.endswith('.py') else class_path
+
+    @staticmethod
+    def fork_executor(max_workers: int):
+        """
+        ProcessPoolExecutor whose workers are forked, so they inherit the state of the module that runs the jobs.
+        mp_context exists from Python 3.7; before it the pools always used the default start method, fork on posix
+        (the callers do not fork on Windows).
+        """
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        if sys.version_info >= (3, 7):
+            import multiprocessing
+            return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('fork'))
+
+        return ProcessPoolExecutor(max_workers=max_workers)
+
     @staticmethod
     def load_logger_config(config_file, level=logging.DEBUG, name=None):
         logger_name = 'logger_'  if name is None else name
         logging.config.fileConfig(config_file, disable_existing_loggers=False)
         logger = logging.getLogger(logger_name)
         logger.setLevel(level)
+        if name is None and level > logging.NOTSET:
+            logging.getLogger(BANNER_LOGGER).setLevel(level)
+        Tools.reset_repeated_logs()
 
     @staticmethod
-    def get_logger():
-        return logging.getLogger('logger_')
+    def get_logger(name='logger_'):
+
+        logger = Tools.__loggers.get(name)
+        if logger is None:
+            logger = Tools.__loggers.setdefault(name, logging.getLogger(name))
+        return logger
 
     @staticmethod
     def shutdown_logger():
         logging.shutdown()
 
     @staticmethod
-    def print_log_line(message, level=logging.DEBUG, name='logger_'):
+    def reset_repeated_logs():
+        with Tools.__repeats_lock:
+            Tools.__repeats.clear()
 
-        logger_name = 'logger_' if name is None else name
-        logger = logging.getLogger(logger_name)
+    @staticmethod
+    def count_repeated_log(key):
+        """
+        Counts one more time the warning or error identified by key and returns how many times it has been logged.
+        """
+
+        with Tools.__repeats_lock:
+            times = Tools.__repeats.get(key, 0) + 1
+            Tools.__repeats[key] = times
+        return times
+
+    @staticmethod
+    def print_log_line(message, level=logging.DEBUG, name='logger_', args: tuple = (), stacklevel: int = 2):
+        """
+        Logs message % args. Nothing is formatted when the logger does not log level, so hot paths should pass
+        the variable parts of the message in args. The same warning or error is logged REPEATED_LOGS times at most.
+        stacklevel is passed to logging where it is supported (STACKLEVEL), so records point at the caller and not
+        at this function.
+        """
+
+        logger = Tools.get_logger('logger_' if name is None else name)
+
+        if not logger.isEnabledFor(level):
+            return
+
+        if level >= logging.WARNING:
+
+            try:
+                times = Tools.count_repeated_log((logger.name, level, message, args))
+            except TypeError:  # unhashable args
+                times = Tools.count_repeated_log((logger.name, level, message, repr(args)))
+
+            if times > REPEATED_LOGS:
+                return
+            if times == REPEATED_LOGS:
+                message = str(message) + ' (logged ' + str(REPEATED_LOGS) + ' times, it will not be logged again)'
+
+        if STACKLEVEL:
+            logger.log(level, message, *args, stacklevel=stacklevel)
+        else:
+            logger.log(level, message, *args)
+
+    @staticmethod
+    def print_banner(*lines, level=logging.DEBUG):
+        """
+        Prints the banner lines of the engine and the models through the BANNER_LOGGER logger, so they are only
+        printed when it logs level.
+        """
 
-        if level == logging.INFO:
-            logger.info(message)
-        if level == logging.DEBUG:
-            logger.debug(message)
-        if level == logging.WARNING:
-            logger.warning(message)
-        if level == logging.ERROR:
-            logger.error(message)
-        if level == logging.CRITICAL:
-            logger.error(message)
+        logger = Tools.get_logger(BANNER_LOGGER)
 
+        if logger.isEnabledFor(level):
+            for line in lines:
+                Tools.print_log_line(line, level, BANNER_LOGGER, stacklevel=3)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moises Martinez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from .tools import Tools
+
+from contextlib import contextmanager
+
+import functools
+import threading
+import logging
+import json
+import time
+import os
+
+
+class Tracer:
+    """
+    Collects spans in Chrome trace-event format (also readable by speedscope).
+    Tracing is process wide and disabled until start() is called, so span() is almost free otherwise.
+    """
+
+    __events = None
+    __local = threading.local()
+
+    @staticmethod
+    def start():
+        Tracer.__events = list()
+
+    @staticmethod
+    def stop():
+        events = Tracer.__events
+        Tracer.__events = None
+        return events
+
+    @staticmethod
+    def enabled():
+        return Tracer.__events is not None or getattr(Tracer.__local, 'events', None) is not None
+
+    @staticmethod
+    def add_events(events: list):
+        if Tracer.__events is not None and events is not None:
+            Tracer.__events.extend(events)
+
+    @staticmethod
+    def __buffer():
+        events = getattr(Tracer.__local, 'events', None)
+        return events if events is not None else Tracer.__events
+
+    @staticmethod
+    @contextmanager
+    def span(name: str, category: str = 'simanfor', args: dict = None):
+
+        events = Tracer.__buffer()
+
+        if events is None:
+            yield
+            return
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            thread = threading.current_thread()
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': start * 1000000,
+                'dur': (time.time() - start) * 1000000,
+                'pid': os.getpid(),
+                'tid': thread.ident,
+                'args': {'thread': thread.name}
+            }
+            if args is not None:
+                event['args'].update(args)
+            events.append(event)
+
+    @staticmethod
+    def traced(name: str, category: str = 'simanfor'):
+        """
+        Decorator version of span(), for functions that must always be traced when tracing is on.
+        """
+
+        def decorator(function):
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not Tracer.enabled():
+                    return function(*args, **kwargs)
+                with Tracer.span(name, category):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def collect(function):
+        """
+        Wraps a function that runs on a worker (thread or process) so it traces into a private buffer
+        and returns the collected events instead of its result. The caller merges them with add_events().
+        """
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            Tracer.__local.events = list()
+            try:
+                function(*args, **kwargs)
+                return Tracer.__local.events
+            finally:
+                Tracer.__local.events = None
+
+        return wrapper
+
+    @staticmethod
+    def to_json(events: list):
+
+        content = list()
+        threads = dict()
+
+        for event in events:
+            threads[(event['pid'], event['tid'])] = event['args'].get('thread', '')
+            content.append(event)
+
+        for (pid, tid), name in threads.items():
+            content.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+
+        for pid in set(pid for pid, tid in threads.keys()):
+            content.append({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                            'args': {'name': 'simanfor' if pid == os.getpid() else 'worker ' + str(pid)}})
+
+        return {'traceEvents': content, 'displayTimeUnit': 'ms'}
+
+    @staticmethod
+    def write(file_path: str):
+
+        events = Tracer.stop()
+
+        if events is None:
+            return
+
+        with open(file_path, 'w') as outfile:
+            json.dump(Tracer.to_json(events), outfile)
+
+        Tools.print_log_line('Trace written to ' + file_path, logging.INFO)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+
+from scenario.scenario import Scenario
+from service import BatchRunner
+from service import Runner
+
+
+def operation(action: str, model_path: str, variables: dict):
+    return {'name': action, 'description': action, 'model_path': model_path, 'model_class': 'Model',
+            'operation': action, 'variables': variables}
+
+
+TEMPLATE = {
+    'name': 'Sweep',
+    'overwrite_output_file': 'YES',
+    'output_path': 'out/sweep_',
+    'decimal_numbers': 2,
+    'zip_compression': 'NO',
+    'operations': {
+        'operation_0': operation('LOAD', 'models.load.basic_load', {'init': 25, 'time': 0, 'input': 'file.xlsx'}),
+        'operation_1': operation('INIT', 'models.trees.model', {'time': 0}),
+        'operation_2': operation('EXECUTION', 'models.trees.model', {'time': 5}),
+        'operation_3': operation('HARVEST', 'models.harvest.cut_down_by_smallest',
+                                 {'time': 0, 'cut_down': 'PERCENTOFTREES', 'volumen': 10})
+    }
+}
+
+
+def test_shared_prefix():
+
+    prefix = BatchRunner.shared_prefix(TEMPLATE)
+
+    assert [item['operation'] for item in prefix] == ['LOAD', 'INIT']
+
+
+def test_expand_grid():
+
+    configurations = BatchRunner.expand_grid(TEMPLATE, {'operation_3.volumen': [10, 20], 'operation_2.time': [5, 10]})
+
+    assert len(configurations) == 4
+    assert configurations[1]['operations']['operation_3']['variables']['volumen'] == 10
+    assert configurations[1]['operations']['operation_2']['variables']['time'] == 10
+    assert configurations[1]['output_path'] == 'out/sweep_volumen-10_time-10_'
+    assert TEMPLATE['operations']['operation_3']['variables']['volumen'] == 10
+    assert len(set(configuration['name'] for configuration in configurations)) == 4
+
+    for configuration in configurations:
+        assert BatchRunner.shared_prefix(configuration) == BatchRunner.shared_prefix(TEMPLATE)
+
+
+def test_expand_grid_unknown_operation():
+
+    with pytest.raises(ValueError):
+        BatchRunner.expand_grid(TEMPLATE, {'operation_9.volumen': [10]})
+
+
+def test_model_key_ignores_load_and_harvest():
+
+    assert Runner.model_key(Scenario(configuration=TEMPLATE)) == 'models.trees.model'
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from micro import build_plot
+from engine import BasicEngine
+from models import TreeModel
+from models.competition import CompetitionContext
+from scenario import Operation
+from service import Runner
+from data.tree import VARIABLE_NAMES
+from constants import PLOT_VARIABLE_NAMES
+
+
+class CompetitionModel(TreeModel):
+
+    competition = True
+
+    def __init__(self, configuration=None):
+        super().__init__('competition', 1)
+        self.contexts = list()
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree, context=None):
+        context, i = self.tree_context(plot, tree, context)
+        self.contexts.append(context)
+        return 1.0
+
+    def grow(self, years, plot, old_tree, new_tree, context=None):
+        context, i = self.tree_context(plot, old_tree, context)
+        self.contexts.append(context)
+        new_tree.add_value('dbh', old_tree.dbh + context.relative_dbh[i])
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+def test_covariates_match_the_model_expressions():
+
+    plot = build_plot(20)
+    trees = list(plot.trees)
+    for position, tree in enumerate(trees):
+        tree.add_value('bal', float(position))
+        tree.add_value('basal_area', 100.0 + position)
+    plot.add_value('QM_DBH', 25.0)
+    plot.add_value('BASAL_AREA', 30.0)
+
+    context = CompetitionContext(plot, trees)
+
+    for tree in trees:
+        i = context.position(tree)
+        assert context.bal_ratio[i] == tree.bal / plot.basal_area
+        assert context.relative_dbh[i] == tree.dbh / plot.qm_dbh
+        assert context.basal_area_ratio[i] == (tree.basal_area * 0.01) / plot.basal_area
+
+
+def test_zero_divisors_are_none():
+
+    plot = build_plot(2)
+    plot.add_value('QM_DBH', 0.0)
+
+    context = CompetitionContext(plot, list(plot.trees))
+
+    assert context.relative_dbh is None
+
+
+def test_engine_builds_one_context_per_plot():
+
+    model = CompetitionModel()
+    inventory = build_inventory(5)
+    operation = Operation({'name': 'grow', 'description': 'grow', 'model_path': '', 'model_class': '',
+                           'operation': 'EXECUTION', 'variables': {'time': 5}})
+
+    BasicEngine(None).apply_tree_model(inventory, model, operation)
+
+    assert len(model.contexts) == 2 * sum(plot.get_number_trees() for plot in inventory.plots)
+    assert len(set(id(context) for context in model.contexts)) == inventory.get_number_plots()
+
+
+def test_model_called_outside_the_engine_builds_its_own_context():
+
+    model = CompetitionModel()
+    plot = build_plot(3)
+    tree = next(iter(plot.trees))
+
+    model.survives(5, plot, tree)
+
+    assert len(model.contexts[0]) == 3 and tree in model.contexts[0]
+
+
+def operation(action: str, model_path: str, model_class: str, variables: dict):
+    return Operation({'name': action, 'description': action, 'model_path': model_path, 'model_class': model_class,
+                      'operation': action, 'variables': variables})
+
+
+@pytest.fixture
+def variable_names():
+    # importing a model trims the variable lists, which the other tests read
+    names, plot_names = list(VARIABLE_NAMES), list(PLOT_VARIABLE_NAMES)
+    yield
+    VARIABLE_NAMES[:], PLOT_VARIABLE_NAMES[:] = names, plot_names
+
+
+def test_radiata_growth_after_a_thinning_from_above_is_unchanged(variable_names):
+
+    inventory = None
+    runner = Runner()
+
+    # values of the models before the CompetitionContext, which read the bal left by INIT after the cut
+    for step in [operation('LOAD', 'models.load.basic_load', 'BasicLoad',
+                           {'init': 25, 'time': 0, 'input': os.path.join(ROOT_FOLDER, '..', 'data',
+                                                                         'data_sm4.2015.1p_eng.xlsx')}),
+                 operation('INIT', 'models.trees.Pradiata__gal__v01', 'PinusRadiataGalicia', {'time': 0}),
+                 operation('HARVEST', 'models.harvest.cut_down_by_tallest', 'CutDownByTallest',
+                           {'time': 0, 'cut_down': 'PERCENTOFTREES', 'volumen': 30}),
+                 operation('EXECUTION', 'models.trees.Pradiata__gal__v01', 'PinusRadiataGalicia', {'time': 5})]:
+        inventory = runner.apply_model(runner.load_model(step), step, inventory)
+
+    plot = inventory.get_first_plot()
+    trees = sorted(plot.trees, key=lambda tree: tree.tree_id)[:4]
+
+    assert len(plot.trees) == 25
+    assert plot.basal_area == pytest.approx(64.45770952126799, rel=1e-12)
+    assert [tree.tree_id for tree in trees] == [2, 4, 7, 9]
+    assert [tree.dbh for tree in trees] == pytest.approx(
+        [13.20719135246763, 19.250875324459752, 14.674559725826349, 12.82017553256463], rel=1e-12)
+    assert [tree.expan for tree in trees] == pytest.approx(
+        [141.82552975666232, 123.89783859868375, 141.8554297305973, 141.81528456632913], rel=1e-12)
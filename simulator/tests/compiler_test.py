@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+
+from models import TreeModel
+from scenario import Scenario
+from scenario import ScenarioCompiler
+from scenario import ScenarioError
+from constants import PLOT_VARIABLE_NAMES
+
+
+def operation(action: str, model_path: str, model_class: str, variables: dict):
+    return {'name': action, 'description': action, 'model_path': model_path, 'model_class': model_class,
+            'operation': action, 'variables': variables}
+
+
+def configuration(operations: list):
+    return {'name': 'Checked', 'overwrite_output_file': 'YES', 'output_path': 'out/checked_', 'decimal_numbers': 2,
+            'zip_compression': 'NO',
+            'operations': {'operation_' + str(index): item for index, item in enumerate(operations)}}
+
+
+LOAD = operation('LOAD', 'models.load.basic_load', 'BasicLoad', {'init': 25, 'time': 0, 'input': 'file.xlsx'})
+INIT = operation('INIT', 'models.trees.Psylvestris__sim__v01', 'PinusSylvestrisSIM', {'time': 0})
+HARVEST = operation('HARVEST', 'models.harvest.cut_down_by_smallest', 'CutDownBySmallest',
+                    {'time': 0, 'cut_down': 'PERCENTOFTREES', 'volumen': 10, 'min_age': 20, 'max_age': 60})
+
+
+class DummyTreeModel(TreeModel):
+
+    def __init__(self, configuration=None):
+        super().__init__('dummy', 1)
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree):
+        return 1.0
+
+    def grow(self, years, plot, old_tree, new_tree):
+        return
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+def test_compile_valid_scenario():
+
+    scenario = Scenario(configuration=configuration([LOAD, INIT, HARVEST]))
+    plan = ScenarioCompiler.compile(scenario)
+
+    assert len(plan) == 3
+    assert [step.operation for step in plan] == scenario.operations
+    assert plan.steps[1].model_file.endswith('Psylvestris__sim__v01.py')
+    assert scenario.operations[2].age_window == (20, 60)
+    assert scenario.operations[1].age_window == (0, 1000)
+
+
+def test_compile_reports_every_error():
+
+    harvest = operation('HARVEST', 'models.harvest.cut_down_by_smallest', 'CutDownBySmallest',
+                        {'time': 0, 'cut_down': 'HALF', 'min_age': 60, 'max_age': 20})
+    execution = operation('EXECUTION', 'models.trees.Psylvestris__sim__v01', 'Nope', {'time': 'five'})
+
+    with pytest.raises(ScenarioError) as error:
+        ScenarioCompiler.compile(Scenario(configuration=configuration([INIT, LOAD, execution, harvest])))
+
+    assert sorted(error.value.errors) == sorted([
+        'operation INIT: scenarios must start with a LOAD operation',
+        'operation LOAD: LOAD is only allowed as the first operation',
+        'operation EXECUTION: time must be a number, not \'five\'',
+        'operation EXECUTION: model class Nope not found in ' + ScenarioCompiler.find_model(INIT['model_path'])[0],
+        'operation HARVEST: missing variable volumen',
+        'operation HARVEST: unknown cut_down \'HALF\', expected one of PERCENTOFTREES, VOLUME, AREA',
+        'operation HARVEST: min_age 60 is greater than max_age 20'
+    ])
+
+
+def test_unknown_model_module():
+
+    missing = operation('INIT', 'models.trees.missing_model', 'Missing', {'time': 0})
+
+    with pytest.raises(ScenarioError) as error:
+        ScenarioCompiler.check(Scenario(configuration=configuration([LOAD, missing])))
+
+    assert error.value.errors == ['operation INIT: model module models.trees.missing_model not found']
+
+
+def test_model_files_are_found_without_importing_them(monkeypatch):
+
+    module = 'models.stand.Psylvestris_stand__SILVES__mad__v01'
+    monkeypatch.delitem(sys.modules, module, raising=False)
+    names = list(PLOT_VARIABLE_NAMES)
+
+    init = operation('INIT', module + '.py', 'Sylves', {'time': 0})
+    plan = ScenarioCompiler.compile(Scenario(configuration=configuration([LOAD, init])))
+
+    assert plan.steps[1].model_file.endswith('Psylvestris_stand__SILVES__mad__v01.py')
+    assert module not in sys.modules  # importing it would trim PLOT_VARIABLE_NAMES
+    assert PLOT_VARIABLE_NAMES == names
+
+
+def test_check_model_type():
+
+    scenario = Scenario(configuration=configuration([LOAD, INIT, HARVEST]))
+
+    ScenarioCompiler.check_model(scenario.name, scenario.operations[1], DummyTreeModel())
+
+    with pytest.raises(ScenarioError):
+        ScenarioCompiler.check_model(scenario.name, scenario.operations[2], DummyTreeModel())
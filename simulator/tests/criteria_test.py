@@ -24,7 +24,11 @@ import pytest
 ROOT_FOLDER = os.getcwd()
 
 sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
 
+from micro import build_plot
+from data import Tree
+from data.search import SearchCriteria
 from data.search import Criteria
 from data.search import EQUAL
 from data.search import LESS
@@ -119,3 +123,18 @@ def test_is_not_valid():
     expected_output: bool = False
 
     assert real_output == expected_output
+
+
+def test_compiled_search_criteria_check_every_criteria():
+
+    trees = list(build_plot(20).trees)
+    trees[3].add_value('status', 'M')
+
+    tmp_search_criteria = SearchCriteria()
+    tmp_search_criteria.add_criteria('status', None, EQUAL)
+    tmp_search_criteria.add_criteria('dbh', 20.0, GREATEREQUAL)
+
+    real_output: list = Tree.get_sord_and_order_tree_list(trees, search_criteria=tmp_search_criteria)
+    expected_output: list = [tree for tree in trees if tree.status is None and tree.dbh >= 20.0]
+
+    assert real_output == expected_output
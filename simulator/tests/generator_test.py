@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from generator import generate_inventory
+from scenarios import build_scenario
+from scenarios import MODELS
+from simulation.inventory import Inventory
+from reader import ExcelReader
+
+
+def test_generated_inventory_is_loaded(tmp_path):
+
+    file_path = generate_inventory(str(tmp_path / 'inventory.xlsx'), 3, 5, ['Pinus pinaster', 'Pinus sylvestris'])
+
+    inventory = Inventory(ExcelReader(file_path, ['Parcelas', 'PiesMayores']))
+
+    assert inventory.get_number_plots() == 3
+    for plot in inventory.plots:
+        assert plot.get_number_trees() == 5
+
+    assert inventory.get_plot(0).get_value('SPECIE_IFN_ID') == 26
+    assert inventory.get_plot(1).get_value('SPECIE_IFN_ID') == 21
+
+
+def test_generator_is_deterministic(tmp_path):
+
+    first = Inventory(ExcelReader(generate_inventory(str(tmp_path / 'a.xlsx'), 2, 4, seed=7),
+                                  ['Parcelas', 'PiesMayores']))
+    second = Inventory(ExcelReader(generate_inventory(str(tmp_path / 'b.xlsx'), 2, 4, seed=7),
+                                   ['Parcelas', 'PiesMayores']))
+
+    for plot in first.plots:
+        assert plot.get_value('DOMINANT_H') == second.get_plot(plot.id - 1).get_value('DOMINANT_H')
+
+
+def test_unknown_specie():
+
+    with pytest.raises(ValueError):
+        generate_inventory('unused.xlsx', 1, 1, ['Pinus unknown'])
+
+
+def test_scenario_templates():
+
+    for model in MODELS.keys():
+        scenario = build_scenario(model, 'inventory.xlsx', 'output_', steps=3)
+        operations = [operation['operation'] for operation in scenario['operations'].values()]
+        assert operations == ['LOAD', 'INIT', 'EXECUTION', 'EXECUTION', 'EXECUTION', 'HARVEST']
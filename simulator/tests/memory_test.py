@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import json
+import tracemalloc
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from engine import BasicEngine
+from models import TreeModel
+from scenario import Operation
+from simulation import Simulation
+from util import MemoryProfiler
+
+
+class GrowModel(TreeModel):
+
+    def __init__(self, configuration=None):
+        super().__init__('grow', 1)
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree):
+        return 1.0
+
+    def grow(self, years, plot, old_tree, new_tree):
+        new_tree.add_value('dbh', old_tree.dbh + years)
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+def operation(action: str, variables: dict):
+    return Operation({'name': action, 'description': action, 'model_path': '', 'model_class': '',
+                      'operation': action, 'variables': variables})
+
+
+@pytest.fixture
+def memory():
+    tracing = tracemalloc.is_tracing()
+    yield MemoryProfiler()
+    if not tracing:
+        tracemalloc.stop()
+
+
+def test_measure_records_delta_and_peak(memory):
+
+    kept = None
+    with memory.measure('allocate', 'TEST'):
+        temporary = bytearray(4 * 1024 * 1024)
+        kept = bytearray(1024 * 1024)
+        del temporary
+
+    record = memory.records[0]
+
+    assert record['operation'] == 'allocate' and record['action'] == 'TEST'
+    assert 1024 * 1024 <= record['delta'] < 2 * 1024 * 1024
+    assert record['peak'] >= 5 * 1024 * 1024
+    assert len(kept) == 1024 * 1024
+
+
+def test_engine_measures_every_operation(memory, tmp_path):
+
+    engine = BasicEngine(None)
+    engine.set_memory(memory)
+    inventory = build_inventory(10)
+
+    simulation = Simulation()
+    simulation.add_step(1, inventory, operation('LOAD', {'init': 10}), None)
+
+    execution = operation('EXECUTION', {'time': 5})
+    new_inventory = engine.apply_model(GrowModel(), execution, inventory)
+    simulation.add_step(2, new_inventory, execution, None)
+    memory.add_history(simulation)
+
+    record = memory.records[0]
+    trees = sum(plot.get_number_trees() for plot in inventory.plots)
+
+    assert len(memory.records) == 1
+    assert record['action'] == 'EXECUTION' and record['model'] == 'GrowModel'
+    assert record['delta'] > 0
+    assert record['steps'] == 2
+    assert record['history_plots'] == 20
+    assert record['history_trees'] == 2 * trees
+    assert record['live_trees'] >= 2 * trees
+
+    memory.write_json(str(tmp_path / 'memory.json'))
+    with open(str(tmp_path / 'memory.json')) as f:
+        assert json.load(f)['operations'][0]['history_trees'] == 2 * trees
+
+
+def test_peak_rss_is_the_high_water_mark(memory):
+
+    with memory.measure('allocate', 'TEST'):
+        temporary = bytearray(64 * 1024 * 1024)
+        temporary[::4096] = b'x' * len(temporary[::4096])  # touch every page, so it is resident
+        del temporary
+
+    assert memory.to_json()['peak_rss'] >= memory.records[0]['rss'] + 32 * 1024 * 1024
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import compare
+from micro import run_benchmarks
+
+
+def test_compare_reports_only_regressions():
+
+    baseline = {'a[10]': 1.0, 'b[10]': 1.0, 'c[10]': 1.0}
+    results = {'a[10]': 1.2, 'b[10]': 1.3, 'd[10]': 9.0}
+
+    assert compare(results, baseline, 0.25) == [('b[10]', 1.0, 1.3)]
+
+
+def test_run_benchmarks():
+
+    results = run_benchmarks(['tree_sort', 'plot_short_trees'], [5], repeat=1)
+
+    assert sorted(results.keys()) == ['plot_short_trees[5]', 'tree_sort[5]']
+    assert all(value > 0 for value in results.values())
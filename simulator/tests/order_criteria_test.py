@@ -24,7 +24,10 @@ import pytest
 ROOT_FOLDER = os.getcwd()
 
 sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
 
+from micro import build_plot
+from data import Tree
 from data.search import OrderCriteria
 from data.search import ASC
 from data.search import DESC
@@ -162,3 +165,36 @@ def test_get_len():
     expected_output: int = 2
 
     assert real_output == expected_output
+
+
+def test_sort_keeps_the_order_of_the_sorted_function():
+
+    trees = list(build_plot(30).trees)
+    for position, tree in enumerate(trees):
+        tree.add_value('dbh', float(position % 4))
+
+    for order_type in [DESC, ASC]:
+        tmp_order_criteria = OrderCriteria(order_type)
+        tmp_order_criteria.add_criteria('dbh')
+
+        real_output: list = tmp_order_criteria.sort(trees)
+        expected_output: list = sorted(trees, key=lambda tree: tree.dbh, reverse=order_type == ASC)
+
+        assert real_output == expected_output
+
+
+def test_sort_by_the_second_criteria_on_ties():
+
+    trees = list(build_plot(12).trees)
+    for position, tree in enumerate(trees):
+        tree.add_value('dbh', float(position % 3))
+        tree.add_value('height', float(-position))
+
+    tmp_order_criteria = OrderCriteria()
+    tmp_order_criteria.add_criteria('dbh')
+    tmp_order_criteria.add_criteria('height')
+
+    real_output: list = Tree.get_sord_and_order_tree_list(trees, order_criteria=tmp_order_criteria)
+    expected_output: list = sorted(trees, key=lambda tree: (tree.dbh, tree.height))
+
+    assert real_output == expected_output
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+
+from scenario.scenario import Scenario
+from service import BatchRunner
+from service import ScenarioPlanner
+from simulation import Inventory
+
+
+def operation(action: str, model_path: str, variables: dict):
+    return {'name': action, 'description': action, 'model_path': model_path, 'model_class': 'Model',
+            'operation': action, 'variables': variables}
+
+
+TEMPLATE = {
+    'name': 'Sweep',
+    'overwrite_output_file': 'YES',
+    'output_path': 'out/sweep_',
+    'decimal_numbers': 2,
+    'zip_compression': 'NO',
+    'operations': {
+        'operation_0': operation('LOAD', 'models.load.basic_load', {'init': 25, 'time': 0, 'input': 'file.xlsx'}),
+        'operation_1': operation('INIT', 'models.trees.model', {'time': 0}),
+        'operation_2': operation('EXECUTION', 'models.trees.model', {'time': 5}),
+        'operation_3': operation('HARVEST', 'models.harvest.cut_down_by_smallest',
+                                 {'time': 0, 'cut_down': 'PERCENTOFTREES', 'volumen': 10})
+    }
+}
+
+
+def scenarios(grid: dict):
+    return [Scenario(configuration=configuration) for configuration in BatchRunner.expand_grid(TEMPLATE, grid)]
+
+
+def test_shared_operations():
+
+    planner = ScenarioPlanner(scenarios({'operation_3.volumen': [10, 20, 30]}))
+
+    assert planner.count_operations() == (12, 6)
+    assert len(planner.root.children) == 1
+
+
+def test_branch_on_first_difference():
+
+    planner = ScenarioPlanner(scenarios({'operation_2.time': [5, 10], 'operation_3.volumen': [10, 20]}))
+
+    node = list(planner.root.children)[0]
+    node = list(node.children)[0]
+
+    assert planner.count_operations() == (16, 8)
+    assert len(node.children) == 2
+    assert all(len(child.children) == 2 for child in node.children)
+
+
+def test_scenario_prefix_of_another():
+
+    short = Scenario(configuration=dict(TEMPLATE, operations={key: value for key, value in
+                                                              TEMPLATE['operations'].items() if key != 'operation_3'}))
+    planner = ScenarioPlanner([Scenario(configuration=TEMPLATE), short])
+
+    node = planner.root
+    for depth in range(3):
+        node = list(node.children)[0]
+
+    assert planner.count_operations() == (7, 4)
+    assert node.depth == 3
+    assert node.scenarios == [1]
+    assert list(node.children)[0].scenarios == [0]
+
+
+def test_operation_key_ignores_variable_order():
+
+    first, second = scenarios({'operation_3.volumen': [10, 10]})
+    second.operations[3].variables.clear()
+    second.operations[3].variables.update({'volumen': 10, 'cut_down': 'PERCENTOFTREES', 'time': 0})
+
+    assert ScenarioPlanner.operation_key(first.operations[3]) == ScenarioPlanner.operation_key(second.operations[3])
+
+
+class FailingRunner:
+    """
+    Runs no model and fails the operations with 10 years; nothing is written.
+    """
+
+    def load_model(self, operation):
+        return None
+
+    def apply_model(self, model, operation, inventory=None):
+        if operation.get_variable('time') == 10:
+            raise ValueError('failed operation')
+        return Inventory()
+
+    def write_results(self, simulation, scenario):
+        return
+
+
+def test_failed_operation_ends_only_its_branch():
+
+    planner = ScenarioPlanner(scenarios({'operation_2.time': [10, 5], 'operation_3.volumen': [10, 20]}))
+
+    results = planner.run(FailingRunner())
+
+    assert [result['status'] for result in results] == ['error', 'error', 'done', 'done']
+    assert 'failed operation' in results[0]['error']
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from micro import build_plot
+from engine import BasicEngine
+from models import TreeModel
+from scenario import Operation
+from util import PlotCache
+
+
+class GrowModel(TreeModel):
+
+    def __init__(self, configuration=None):
+        super().__init__('grow', 1)
+        self.grown = 0
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree):
+        return 1.0
+
+    def grow(self, years, plot, old_tree, new_tree):
+        self.grown += 1
+        new_tree.add_value('dbh', old_tree.dbh + years)
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+class StochasticGrowModel(GrowModel):
+
+    @property
+    def stochastic(self):
+        return True
+
+
+def execution(variables: dict):
+    return Operation({'name': 'EXECUTION', 'description': 'EXECUTION', 'model_path': '', 'model_class': '',
+                      'operation': 'EXECUTION', 'variables': variables})
+
+
+def test_put_and_get(tmp_path):
+
+    cache = PlotCache(str(tmp_path))
+    plot = build_plot(10)
+
+    cache.put('key', plot)
+    cached = cache.get('key')
+
+    assert cached.values == plot.values
+    assert [tree.values for tree in cached.trees] == [tree.values for tree in plot.trees]
+    assert cache.get('other') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(PlotCache(str(tmp_path))) == 1
+
+
+def test_key_depends_on_plot_model_and_variables(tmp_path):
+
+    cache = PlotCache(str(tmp_path))
+    model = GrowModel()
+    plot = build_plot(10)
+    key = cache.key(plot, model, execution({'time': 5}))
+
+    assert key == cache.key(build_plot(10), GrowModel(), execution({'time': 5}))
+    assert key != cache.key(plot, model, execution({'time': 10}))
+    assert key != cache.key(plot, StochasticGrowModel(), execution({'time': 5}))
+    assert key != cache.key(build_plot(10, seed=1), model, execution({'time': 5}))
+
+
+def test_changed_shared_sources_invalidate_the_cache(tmp_path):
+
+    sources = tmp_path / 'src'
+    sources.mkdir()
+    (sources / 'tree_model.py').write_text('TREE_MODEL = 1\n')
+    path = str(tmp_path / 'cache')
+
+    cache = PlotCache(path, sources=str(sources))
+    key = cache.key(build_plot(10), GrowModel(), execution({'time': 5}))
+    cache.put(key, build_plot(10))
+
+    assert len(PlotCache(path, sources=str(sources))) == 1
+
+    (sources / 'tree_model.py').write_text('TREE_MODEL = 2\n')
+    cache = PlotCache(path, sources=str(sources))
+
+    assert len(cache) == 0
+    assert cache.get(key) is None
+    assert cache.key(build_plot(10), GrowModel(), execution({'time': 5})) != key
+
+
+def test_least_recently_used_are_removed(tmp_path):
+
+    plot = build_plot(10)
+    cache = PlotCache(str(tmp_path), 0)
+
+    cache.put('first', plot)
+    cache.put('second', plot)
+
+    assert len(cache) == 1
+    assert cache.get('first') is None
+    assert cache.get('second') is not None
+
+
+@pytest.mark.parametrize('model_class, grown', [(GrowModel, 0), (StochasticGrowModel, 100)])
+def test_engine_reuses_deterministic_plots(tmp_path, model_class, grown):
+
+    engine = BasicEngine(None)
+    engine.set_plot_cache(PlotCache(str(tmp_path)))
+    inventory = build_inventory(10)
+    operation = execution({'time': 5})
+
+    first = engine.apply_tree_model(inventory, model_class(), operation)
+    model = model_class()
+    second = engine.apply_tree_model(inventory, model, operation)
+
+    assert model.grown == grown
+    assert [plot.values for plot in first.plots] == [plot.values for plot in second.plots]
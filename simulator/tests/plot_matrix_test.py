@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import math
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from engine import BasicEngine
+from models import StandModel
+from scenario import Operation
+from service import Runner
+from simulation import Inventory
+from data import Plot
+from data.tree import VARIABLE_NAMES
+from constants import PLOT_VARIABLE_NAMES
+
+SYLVES = 'models.stand.Psylvestris_stand__SILVES__mad__v01'
+
+
+class GrowModel(StandModel):
+
+    batch = True
+
+    def __init__(self, configuration=None):
+        super().__init__('grow', 1)
+        self.plots = list()
+
+    def initialize(self, plot):
+        return
+
+    def apply_grow_model(self, old_plot, new_plot, years):
+        self.plots.append(old_plot.id)
+        new_plot.add_value('BASAL_AREA', math.sqrt(old_plot.basal_area) + years)
+
+    def apply_cut_down_model(self, old_plot, new_plot, cut_criteria, volume, time, min_age, max_age):
+        new_plot.add_value('DENSITY', old_plot.density * (1 - volume / 100))
+
+    def apply_grow_model_batch(self, old_plots, new_plots, years):
+        new_plots['BASAL_AREA'] = old_plots['BASAL_AREA'] ** 0.5 + years
+
+    def apply_cut_down_model_batch(self, old_plots, new_plots, cut_criteria, volume, time, min_age, max_age):
+        new_plots['DENSITY'] = old_plots['DENSITY'] * (1 - volume / 100)
+
+
+def grow_operation():
+    return Operation({'name': 'grow', 'description': 'grow', 'model_path': '', 'model_class': '',
+                      'operation': 'EXECUTION', 'variables': {'time': 5}})
+
+
+def operation(action: str, model_path: str, model_class: str, variables: dict):
+    return Operation({'name': action, 'description': action, 'model_path': model_path, 'model_class': model_class,
+                      'operation': action, 'variables': variables})
+
+
+@pytest.fixture
+def variable_names():
+    # importing a model trims the variable lists, which the other tests read
+    names, plot_names = list(VARIABLE_NAMES), list(PLOT_VARIABLE_NAMES)
+    yield
+    VARIABLE_NAMES[:], PLOT_VARIABLE_NAMES[:] = names, plot_names
+
+
+def test_matrix_reads_and_writes_plot_variables():
+
+    inventory = build_inventory(5)
+    plots = list(inventory.plots)
+    matrix = inventory.plot_matrix()
+
+    assert matrix['BASAL_AREA'].tolist() == [plot.basal_area for plot in plots]
+
+    matrix['BASAL_AREA'] = matrix['BASAL_AREA'] * 2
+    matrix['NEW_VARIABLE'] = 1.0
+    matrix.write()
+
+    for row, plot in enumerate(plots):
+        assert plot.basal_area == matrix['BASAL_AREA'][row]
+        assert plot.get_value('NEW_VARIABLE') == 1.0
+
+
+def test_batch_model_matches_the_plot_model():
+
+    model = GrowModel()
+
+    batch = BasicEngine(None).apply_tree_stand_model(build_inventory(5), model, grow_operation())
+
+    model.batch = False
+    plots = BasicEngine(None).apply_tree_stand_model(build_inventory(5), model, grow_operation())
+
+    assert [plot.basal_area for plot in batch.plots] == [plot.basal_area for plot in plots.plots]
+
+
+def test_invalid_rows_are_run_plot_by_plot():
+
+    model = GrowModel()
+    inventory = build_inventory(5)
+    plot = next(iter(inventory.plots))
+    plot.add_value('BASAL_AREA', -1.0)
+
+    result = BasicEngine(None).apply_tree_stand_model(inventory, model, grow_operation())
+
+    assert model.plots == [plot.id]
+    assert next(iter(result.plots)).basal_area == -1.0  # math.sqrt failed and was logged, as without batch
+
+
+def test_sylves_plot_model_matches_the_batch_model(variable_names):
+
+    runner = Runner()
+    load = operation('LOAD', 'models.load.basic_load', 'BasicLoad',
+                     {'init': 25, 'time': 0, 'input': os.path.join(ROOT_FOLDER, '..', 'data',
+                                                                   'data_sm4.2015.1p_eng.xlsx')})
+    init = operation('INIT', SYLVES, 'Sylves', {'time': 0})
+    model = runner.load_model(init)
+    plot = runner.apply_model(model, init, runner.apply_model(runner.load_model(load), load)).get_first_plot()
+
+    inventory = Inventory()
+
+    for position, factor in enumerate([1.0, 0.6, 1.5, 2.0]):
+        new_plot = Plot()
+        new_plot.clone(plot)
+        new_plot.add_value('PLOT_ID', position + 1)
+        new_plot.add_value('DENSITY', plot.density * factor)
+        inventory.add_plot(new_plot)
+
+    steps = [operation('EXECUTION', SYLVES, 'Sylves', {'time': 5, 'min_age': 0, 'max_age': 100})]
+
+    for cut_down in ['PERCENTOFTREES', 'VOLUME', 'AREA']:
+        steps += [operation('HARVEST', SYLVES, 'Sylves', {'time': 0, 'cut_down': cut_down, 'volumen': 10,
+                                                          'min_age': 0, 'max_age': 100}),
+                  operation('EXECUTION', SYLVES, 'Sylves', {'time': 5, 'min_age': 0, 'max_age': 100})]
+
+    values = dict()
+
+    for batch in [True, False]:
+        model.batch = batch
+        result = inventory
+
+        for step in steps:
+            result = BasicEngine(None).apply_model(model, step, result)
+
+        values[batch] = [new_plot.values for new_plot in result.plots]
+
+    assert len(values[True]) == 4
+    assert values[True] == values[False]
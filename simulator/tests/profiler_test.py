@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+
+from util import Profiler
+
+
+class DummyModel:
+
+    def survives(self, time, plot, tree):
+        return 1.0
+
+    def process_plot(self, time, plot, trees):
+        return None
+
+
+def test_instrument_counts_calls():
+
+    profiler = Profiler()
+    model = profiler.instrument(DummyModel())
+
+    model.survives(5, None, None)
+    model.survives(5, None, None)
+    model.process_plot(5, None, [1, 2, 3])
+
+    real_output = profiler.models['DummyModel.survives']
+    assert real_output['calls'] == 2
+    assert real_output['trees'] == 2
+
+    real_output = profiler.models['DummyModel.process_plot']
+    assert real_output['calls'] == 1
+    assert real_output['plots'] == 1
+    assert real_output['trees'] == 3
+
+
+def test_instrument_only_once():
+
+    profiler = Profiler()
+    model = profiler.instrument(DummyModel())
+    profiler.instrument(model)
+
+    model.survives(5, None, None)
+
+    assert profiler.models['DummyModel.survives']['calls'] == 1
+
+
+def test_unused_hooks_are_not_reported():
+
+    profiler = Profiler()
+    profiler.instrument(DummyModel())
+
+    assert profiler.to_json()['models'] == []
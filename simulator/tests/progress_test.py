@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import io
+import os
+import sys
+import json
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from engine import BasicEngine
+from models import TreeModel
+from scenario import Operation
+from util import Progress
+
+
+class GrowModel(TreeModel):
+
+    def __init__(self, configuration=None):
+        super().__init__('grow', 1)
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree):
+        return 1.0
+
+    def grow(self, years, plot, old_tree, new_tree):
+        new_tree.add_value('dbh', old_tree.dbh + years)
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+def execution():
+    return Operation({'name': 'grow', 'description': 'grow', 'model_path': '', 'model_class': '',
+                      'operation': 'EXECUTION', 'variables': {'time': 5}})
+
+
+def test_engine_reports_json_lines(tmp_path):
+
+    file_path = str(tmp_path / 'progress.jsonl')
+    inventory = build_inventory(10)
+
+    engine = BasicEngine(None)
+    engine.set_progress(Progress(file_path, interval=0))
+    engine.apply_tree_model(inventory, GrowModel(), execution())
+    engine.progress.close()
+
+    with open(file_path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert [record['plots_done'] for record in records] == list(range(1, 11))
+    assert records[-1]['finished'] is True and not any(record['finished'] for record in records[:-1])
+    assert records[-1]['plots'] == 10
+    assert records[-1]['trees'] == sum(plot.get_number_trees() for plot in inventory.plots)
+    assert records[-1]['operation'] == 'grow' and records[-1]['action'] == 'EXECUTION'
+    assert records[-1]['eta'] == 0
+
+
+def test_progress_line():
+
+    stream = io.StringIO()
+    progress = Progress(stream=stream, interval=3600)
+
+    progress.start(execution(), 2)
+    progress.update(100)
+    assert stream.getvalue() == ''
+
+    progress.update(50)
+    progress.finish()
+
+    assert stream.getvalue().startswith('\rgrow: 2/2 plots, ')
+    assert stream.getvalue().endswith('ETA 0:00:00\n')
+    assert progress.trees == 150
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from engine import BasicEngine
+from models import TreeModel
+from scenario import Operation
+from service import ReplicateRunner
+
+
+class HalfSurvivalModel(TreeModel):
+
+    def __init__(self, configuration=None):
+        super().__init__('half', 1)
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree):
+        return 0.5
+
+    def grow(self, years, plot, old_tree, new_tree):
+        return
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+def grow(engine: BasicEngine):
+
+    operation = Operation({'name': 'EXECUTION', 'description': 'EXECUTION', 'model_path': '', 'model_class': '',
+                           'operation': 'EXECUTION', 'variables': {'time': 5}})
+    inventory = engine.apply_tree_model(build_inventory(50), HalfSurvivalModel(), operation)
+
+    return [sorted(tree.id for tree in plot.trees if tree.expan > 0) for plot in inventory.plots]
+
+
+def test_mortality_is_drawn_per_tree():
+
+    engine = BasicEngine(None)
+    runner = ReplicateRunner(2, seed=7)
+
+    engine.set_random(runner.random_state(0))
+    first = grow(engine)
+    engine.set_random(runner.random_state(0))
+    again = grow(engine)
+    engine.set_random(runner.random_state(1))
+    other = grow(engine)
+
+    assert first == again
+    assert first != other
+    assert all(0 < len(trees) < 50 for trees in first)
+
+
+def test_summarise():
+
+    runner = ReplicateRunner(4, variables=['DENSITY', 'VOL'], quantiles=[0.0, 0.5, 1.0])
+    replicates = [([25, 30], {(0, 1): [100.0, None], (1, 1): [value, 10.0 * value]}) for value in [1, 2, 3, 4]]
+
+    rows = runner.summarise(replicates)
+
+    assert rows == [
+        [0, 25, 1, 'DENSITY', 4, 100.0, 100.0, 100.0, 100.0],
+        [1, 30, 1, 'DENSITY', 4, 2.5, 1.0, 2.5, 4.0],
+        [1, 30, 1, 'VOL', 4, 25.0, 10.0, 25.0, 40.0]
+    ]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from data import Plot
+from data import Tree
+from data.tree import VARIABLE_NAMES
+from constants import PLOT_VARIABLE_NAMES
+from reader import Reader
+from reader import Schema
+
+
+class RowsReader(Reader):
+
+    def __init__(self, columns):
+        self.__columns = columns
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    def read(self):
+        return
+
+
+def test_schema_splits_present_and_missing_variables():
+
+    schema = RowsReader(['PLOT_ID', 'TREE_ID', 'dbh', 'OTHER']).schema(['TREE_ID', 'height', 'dbh'], 'trees')
+
+    assert schema.present == ['TREE_ID', 'dbh']
+    assert schema.missing == ['height']
+    assert schema.sheet == 'trees'
+    assert schema.matches({'PLOT_ID': 1, 'TREE_ID': 2, 'dbh': 3.0, 'OTHER': None})
+    assert not schema.matches({'PLOT_ID': 1, 'TREE_ID': 2})
+
+
+def test_tree_with_schema_matches_tree_without_schema():
+
+    data = {'PLOT_ID': 1, 'TREE_ID': 7, 'dbh': 25.0, 'height': 12.5, 'specie': 21}
+    schema = Schema(VARIABLE_NAMES, list(data.keys()))
+
+    tree = Tree(data, schema)
+
+    assert tree.values == Tree(data).values
+    assert list(tree.values.keys()) == list(Tree(data).values.keys())
+
+
+def test_plot_with_schema_matches_plot_without_schema():
+
+    data = {'PLOT_ID': '3', 'AGE': 40, 'BASAL_AREA': 30.5}
+    schema = Schema(PLOT_VARIABLE_NAMES, list(data.keys()))
+
+    plot = Plot(data, schema)
+
+    assert plot.id == 3
+    assert plot.values == Plot(data).values
+
+
+def test_rows_that_do_not_match_are_read_variable_by_variable():
+
+    schema = Schema(PLOT_VARIABLE_NAMES, ['PLOT_ID', 'AGE', 'BASAL_AREA'])
+    data = {'PLOT_ID': 4, 'AGE': 40}  # a row without some column of the sheet
+
+    assert Plot(data, schema).values == Plot(data).values
+
+
+def test_schema_keeps_the_variables_it_was_resolved_with():
+
+    names = ['PLOT_ID', 'TREE_ID', 'dbh_1', 'dbh']
+    schema = Schema(names, ['PLOT_ID', 'TREE_ID', 'dbh'])
+    names.remove('dbh_1')  # as the models do when they are imported
+
+    tree = Tree({'PLOT_ID': 1, 'TREE_ID': 2, 'dbh': 3.0}, schema)
+
+    assert list(tree.values.keys()) == ['PLOT_ID', 'TREE_ID', 'dbh_1', 'dbh', 'status']
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import json
+import pytest
+import threading
+import http.client
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+
+from scenario import Operation
+from scenario.scenario import Scenario
+from service import SimulationService
+from service import SimulationServer
+from service import Runner
+
+INVENTORY = os.path.join(ROOT_FOLDER, '..', 'data', 'data_sm4.2015.1p_eng.xlsx')
+
+
+def load_operation_configuration():
+    return {'name': 'Load', 'description': 'Load', 'model_path': 'models.load.basic_load',
+            'model_class': 'BasicLoad', 'operation': 'LOAD', 'variables': {'init': 25, 'time': 0, 'input': INVENTORY}}
+
+
+def load_operation():
+    return Operation(load_operation_configuration())
+
+
+def test_scenario_from_configuration():
+
+    scenario = Scenario(configuration={
+        'name': 'Test', 'overwrite_output_file': 'YES', 'output_path': 'out_', 'decimal_numbers': 2,
+        'zip_compression': 'NO', 'operations': {'operation_0': load_operation_configuration()}})
+
+    assert scenario.name == 'Test'
+    assert len(scenario.operations) == 1
+
+
+def test_models_are_cached():
+
+    service = SimulationService()
+    operation = load_operation()
+
+    assert service.load_model(operation) is service.load_model(operation)
+    assert len(service.models) == 1
+
+
+def test_inventories_are_cached():
+
+    service = SimulationService(max_inventories=1)
+    operation = load_operation()
+    model = service.load_model(operation)
+
+    inventory = service.apply_model(model, operation)
+
+    assert service.apply_model(model, operation) is inventory
+    assert len(service.inventories) == 1
+
+
+def test_inventory_cache_disabled():
+
+    service = SimulationService(max_inventories=0)
+    operation = load_operation()
+    model = service.load_model(operation)
+
+    assert service.apply_model(model, operation) is not service.apply_model(model, operation)
+
+
+def test_least_recently_used_pools_are_shut_down():
+
+    server = SimulationServer(port=0, workers=1, max_pools=2)
+
+    first = server.pool('first')
+    server.pool('second')
+    server.pool('first')
+    server.pool('third')
+
+    assert list(server.pools.keys()) == ['first', 'third']
+    assert server.pool('first') is first
+
+    server.close()
+
+
+def test_jobs_that_can_not_be_submitted_get_a_json_error():
+
+    configuration = {'name': 'Test', 'overwrite_output_file': 'YES', 'output_path': 'out_', 'decimal_numbers': 2,
+                     'zip_compression': 'NO', 'operations': {'operation_0': load_operation_configuration()}}
+
+    server = SimulationServer(port=0, workers=1)
+    server.pool(Runner.model_key(Scenario(configuration=configuration))).shutdown()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    try:
+        connection = http.client.HTTPConnection(*server.address)
+        connection.request('POST', '/simulations', json.dumps(configuration),
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+
+        assert response.status == 503
+        assert json.loads(response.read())['status'] == 'error'
+    finally:
+        server.shutdown()
+        thread.join()
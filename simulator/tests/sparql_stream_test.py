@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import io
+import os
+import sys
+import json
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from data import Plot
+from data import Tree
+from reader import JSONReader
+from reader.sparql_stream import SparqlStream
+from simulation import Inventory
+
+PLOTS = os.path.join(ROOT_FOLDER, '..', 'data', 'sparql.plot.json')
+TREES = os.path.join(ROOT_FOLDER, '..', 'data', 'sparql.tree.json')
+
+
+def document_rows(filename):
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+
+    headers = document['head']['vars']
+    return [{header: binding[header]['value'] for header in headers} for binding in document['results']['bindings']]
+
+
+@pytest.mark.parametrize('chunk_size', [64, 1000, 65536])
+def test_stream_reads_the_rows_of_the_document(chunk_size):
+
+    with open(TREES, 'r', encoding='utf-8') as f:
+        rows = list(SparqlStream(f, chunk_size=chunk_size))
+
+    assert rows == document_rows(TREES)
+
+
+def test_stream_keeps_only_the_variables_asked():
+
+    document = '{"results": {"bindings": [{"a": {"value": "1"}, "b": {"value": 2.5}}, {"b": {"value": 3}}]}, ' \
+               '"head": {"vars": ["a", "b"]}}'
+    stream = SparqlStream(io.StringIO(document), ['b'], chunk_size=1)
+
+    assert stream.read_head() == ['b']
+    assert list(stream) == [{'b': 2.5}, {'b': 3}]
+
+
+def test_json_reader_reads_the_plots_and_trees():
+
+    reader = JSONReader({'plots': PLOTS, 'trees': TREES}, {'plots': Plot.JSON_VARIABLES})
+
+    reader.choose_sheet('plots', True)
+    assert reader.columns == Plot.JSON_VARIABLES
+    assert list(reader) == document_rows(PLOTS)
+
+    reader.choose_sheet('trees', True)
+    assert list(reader) == document_rows(TREES)
+
+
+def test_json_inventory_has_every_tree():
+
+    inventory = Inventory(JSONReader({'plots': PLOTS, 'trees': TREES}, {'plots': Plot.JSON_VARIABLES,
+                                                                          'trees': Tree.JSON_VARIABLES}))
+
+    assert len(inventory.plots) == len(document_rows(PLOTS))
+    assert sum([len(plot.trees) for plot in inventory.plots]) == len(document_rows(TREES))
@@ -15,4 +15,160 @@
 # limitations under the License.
 # ==============================================================================
 
-from __future__ import absolute_import
\ No newline at end of file
+from __future__ import absolute_import
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_inventory
+from generator import generate_inventory
+from simulation.inventory import Inventory
+from reader import ExcelReader
+from reader import JSONReader
+from scenario import Operation
+from data import Tree
+
+
+def test_partitions_take_the_plots_in_order():
+
+    inventory = build_inventory(5)
+    plot_ids = list(inventory.get_plot_ids())
+    last = inventory.get_plot(len(plot_ids) - 1)
+    inventory.add_plot(last, False)
+
+    partitions = list(inventory.partitions(3))
+
+    assert [list(partition.get_plot_ids()) for partition in partitions] == \
+        [plot_ids[start:start + 3] for start in range(0, len(plot_ids), 3)]
+    assert partitions[-1].must_be_printed(last.id) is False
+    assert inventory.empty
+
+
+def test_plots_outside_the_age_window_share_their_trees():
+
+    inventory = build_inventory(5)
+    operation = Operation({'name': 'grow', 'description': 'grow', 'model_path': '', 'model_class': '',
+                           'operation': 'EXECUTION', 'variables': {'time': 5, 'min_age': 1000, 'max_age': 2000}})
+
+    result = Inventory()
+    result.correct_plots(inventory, operation)
+
+    for plot in inventory.plots:
+        new_plot = result.get_plot(list(result.get_plot_ids()).index(plot.id))
+        assert new_plot.age == plot.age
+        assert new_plot.get_number_trees() == plot.get_number_trees()
+        assert all(a is b for a, b in zip(new_plot.trees, plot.trees))
+        assert result.must_be_printed(plot.id) is False
+
+    plot = inventory.get_first_plot()
+    new_plot = result.get_plot(0)
+    new_plot.sum_value('AGE', 5)
+    tree = Tree()
+    tree.clone(next(iter(plot.trees)))
+    tree.add_value('TREE_ID', -1)
+    new_plot.add_tree(tree)
+
+    assert new_plot.age == plot.age + 5
+    assert new_plot.get_number_trees() == plot.get_number_trees() + 1
+
+
+def test_age_index_follows_the_plot_ages():
+
+    inventory = build_inventory(5)
+    plots = list(inventory.plots)
+    for age, plot in zip([30, 10, 20, 10, 40, 50, 10, 60, 20, 30], plots):
+        plot.add_value('AGE', age)
+
+    assert inventory.plots_by_age(10, 20) == [plot for plot in plots if 10 <= plot.age <= 20]
+
+    plots[0].sum_value('AGE', -15)  # 30 -> 15, must be found now
+    plots[1].sum_value('AGE', 50)  # 10 -> 60, must not
+
+    assert inventory.plots_by_age(10, 20) == [plot for plot in plots if 10 <= plot.age <= 20]
+    assert inventory.plots_by_age(0, 1000) == plots
+
+
+def test_ages_advanced_by_correct_plots_are_indexed():
+
+    inventory = build_inventory(5)
+    for age, plot in enumerate(inventory.plots):
+        plot.add_value('AGE', age * 10)
+
+    operation = Operation({'name': 'grow', 'description': 'grow', 'model_path': '', 'model_class': '',
+                           'operation': 'EXECUTION', 'variables': {'time': 5, 'min_age': 0, 'max_age': 40}})
+
+    result = Inventory()
+    for plot in inventory.plots_by_age(0, 40):
+        result.add_plot(plot)
+    assert [plot.age for plot in result.plots_by_age(0, 40)] == [0, 10, 20, 30, 40]
+
+    result.correct_plots(inventory, operation)
+
+    assert [plot.age for plot in result.plots_by_age(0, 40)] == [5, 15, 25, 35]
+
+
+def test_secondary_indexes():
+
+    inventory = build_inventory(5)
+    plots = list(inventory.plots)
+    for position, plot in enumerate(plots):
+        plot.add_value('PROVINCE', 'A' if position % 2 == 0 else 'B')
+
+    assert inventory.plots_by('PROVINCE', 'A') == plots[0::2]
+
+    plots[0].add_value('PROVINCE', 'B')
+
+    assert inventory.plots_by('PROVINCE', 'A') == plots[2::2]
+    assert inventory.plots_by('PROVINCE', 'C') == []
+
+
+def test_trees_loaded_by_workers_match_a_serial_load(tmp_path):
+
+    file_path = generate_inventory(str(tmp_path / 'inventory.xlsx'), 5, 4, seed=3)
+
+    serial = Inventory(ExcelReader(file_path, ['Parcelas', 'PiesMayores']))
+    sharded = Inventory(ExcelReader(file_path, ['Parcelas', 'PiesMayores']), workers=3)
+
+    assert list(sharded.get_plot_ids()) == list(serial.get_plot_ids())
+    for plot, other in zip(serial.plots, sharded.plots):
+        assert other.values == plot.values
+        assert [tree.values for tree in other.trees] == [tree.values for tree in plot.trees]
+
+
+def test_partitions_are_read_from_the_reader(tmp_path):
+
+    file_path = generate_inventory(str(tmp_path / 'inventory.xlsx'), 5, 4, seed=3)
+    inventory = Inventory(ExcelReader(file_path, ['Parcelas', 'PiesMayores']))
+
+    partitions = list(Inventory.read_partitions(ExcelReader(file_path, ['Parcelas', 'PiesMayores']), 2))
+
+    assert [partition.get_number_plots() for partition in partitions] == [2, 2, 1]
+    plots = [plot for partition in partitions for plot in partition.plots]
+    for plot, expected in zip(plots, inventory.plots):
+        assert plot.values == expected.values
+        assert [tree.values for tree in plot.trees] == [tree.values for tree in expected.trees]
+
+
+def test_json_partitions_are_read_from_the_reader():
+
+    files = {'plots': os.path.join(ROOT_FOLDER, '..', 'data', 'sparql.plot.json'),
+             'trees': os.path.join(ROOT_FOLDER, '..', 'data', 'sparql.tree.json')}
+    inventory = Inventory(JSONReader(files))
+
+    partitions = list(Inventory.read_partitions(JSONReader(files), 4))
+
+    assert [partition.get_number_plots() for partition in partitions] == [4, 4, 3]
+    plots = [plot for partition in partitions for plot in partition.plots]
+    assert [plot.id for plot in plots] == list(inventory.get_plot_ids())
+    assert [plot.get_number_trees() for plot in plots] == [plot.get_number_trees() for plot in inventory.plots]
+
+
+def test_partitions_must_have_a_plot():
+
+    with pytest.raises(ValueError):
+        list(build_inventory(5).partitions(0))
@@ -15,4 +15,49 @@
 # limitations under the License.
 # ==============================================================================
 
-from __future__ import absolute_import
\ No newline at end of file
+from __future__ import absolute_import
+
+import os
+import sys
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_plot
+from data import Plot
+from constants import PLOT_VARIABLE_NAMES
+
+
+def test_clone_copies_the_plot_variables():
+
+    plot = build_plot(5)
+    plot.add_value('NOT_A_PLOT_VARIABLE', 1.0)
+
+    new_plot = Plot()
+    new_plot.clone(plot)
+
+    assert [new_plot.get_value(name) for name in PLOT_VARIABLE_NAMES] == \
+        [plot.get_value(name) for name in PLOT_VARIABLE_NAMES]
+    assert 'NOT_A_PLOT_VARIABLE' not in new_plot.values
+    assert new_plot.get_number_trees() == 0
+
+
+def test_layout_follows_the_trimmed_variables():
+
+    assert Plot.get_index_by_name('VOL') == PLOT_VARIABLE_NAMES.index('VOL')
+
+    position = PLOT_VARIABLE_NAMES.index('STAKE')
+    PLOT_VARIABLE_NAMES.remove('STAKE')
+
+    try:
+        assert Plot.get_index_by_name('CHIPS') == PLOT_VARIABLE_NAMES.index('CHIPS')
+        with pytest.raises(ValueError):
+            Plot.get_index_by_name('STAKE')
+        assert 'STAKE' not in Plot().values
+    finally:
+        PLOT_VARIABLE_NAMES.insert(position, 'STAKE')
+
+    assert Plot.get_name_by_index(Plot.get_index_by_name('STAKE')) == 'STAKE'
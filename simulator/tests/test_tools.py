@@ -26,3 +26,122 @@ ROOT_FOLDER = os.getcwd()
 sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
 
 
+
+import logging
+
+from util import Tools
+from util.tools import BANNER_LOGGER
+from util.tools import REPEATED_LOGS
+import util.tools
+
+
+class Message:
+    """
+    Message argument that counts how many times it is formatted.
+    """
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return 'message'
+
+
+@pytest.fixture
+def records():
+
+    class Handler(logging.Handler):
+
+        def __init__(self):
+            super().__init__()
+            self.records = list()
+
+        def emit(self, record):
+            self.records.append(record)
+
+    handler = Handler()
+    loggers = [logging.getLogger('logger_test'), logging.getLogger(BANNER_LOGGER)]
+    levels = [logger.level for logger in loggers]
+
+    for logger in loggers:
+        logger.addHandler(handler)
+    Tools.reset_repeated_logs()
+
+    yield loggers, handler.records
+
+    for logger, level in zip(loggers, levels):
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+def test_messages_are_formatted_lazily(records):
+
+    (logger, banner), logged = records
+    logger.setLevel(logging.INFO)
+    message = Message()
+
+    Tools.print_log_line('%s', logging.DEBUG, 'logger_test', args=(message,))
+    assert message.formatted == 0 and len(logged) == 0
+
+    Tools.print_log_line('%s', logging.INFO, 'logger_test', args=(message,))
+    assert logged[0].getMessage() == 'message'
+    assert logged[0].funcName == 'test_messages_are_formatted_lazily'
+
+
+def test_repeated_warnings_are_silenced(records):
+
+    (logger, banner), logged = records
+    logger.setLevel(logging.DEBUG)
+
+    for i in range(2 * REPEATED_LOGS):
+        Tools.print_log_line('%s is not in data document', logging.WARNING, 'logger_test', args=('dbh',))
+        Tools.print_log_line('debug line', logging.DEBUG, 'logger_test')
+
+    warnings = [record for record in logged if record.levelno == logging.WARNING]
+    assert len(warnings) == REPEATED_LOGS
+    assert warnings[-1].getMessage().endswith('it will not be logged again)')
+    assert len(logged) - len(warnings) == 2 * REPEATED_LOGS
+
+
+def test_banners_follow_the_banner_logger_level(records):
+
+    (logger, banner), logged = records
+    banner.setLevel(logging.INFO)
+
+    Tools.print_banner('model banner', 'second line')
+    assert len(logged) == 0
+
+    Tools.print_banner('operation banner', level=logging.INFO)
+    assert [record.getMessage() for record in logged] == ['operation banner']
+
+
+def test_logs_without_stacklevel_before_python_3_8(records, monkeypatch):
+
+    (logger, banner), logged = records
+    logger.setLevel(logging.INFO)
+    banner.setLevel(logging.INFO)
+    log = logging.Logger._log
+
+    def log_without_stacklevel(self, level, msg, args, exc_info=None, extra=None, stack_info=False):
+        return log(self, level, msg, args, exc_info, extra, stack_info)  # the signature of Python 3.6 and 3.7
+
+    monkeypatch.setattr(logging.Logger, '_log', log_without_stacklevel)
+    monkeypatch.setattr(util.tools, 'STACKLEVEL', False)
+
+    Tools.print_log_line('%s line', logging.INFO, 'logger_test', args=('info',))
+    Tools.print_banner('operation banner', level=logging.INFO)
+
+    assert [record.getMessage() for record in logged] == ['info line', 'operation banner']
+
+
+def square(value):
+    return value * value
+
+
+def test_fork_executor_before_python_3_7(monkeypatch):
+
+    monkeypatch.setattr(sys, 'version_info', (3, 6, 9))  # no mp_context
+
+    with Tools.fork_executor(2) as pool:
+        assert list(pool.map(square, range(4))) == [0, 1, 4, 9]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import threading
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+
+from util import Tracer
+
+
+def test_span_disabled():
+
+    Tracer.stop()
+
+    with Tracer.span('nothing'):
+        pass
+
+    assert Tracer.enabled() is False
+
+
+def test_span_records_complete_event():
+
+    Tracer.start()
+
+    with Tracer.span('operation', 'operation', {'action': 'INIT'}):
+        pass
+
+    events = Tracer.stop()
+
+    assert len(events) == 1
+    assert events[0]['ph'] == 'X'
+    assert events[0]['name'] == 'operation'
+    assert events[0]['args']['action'] == 'INIT'
+
+
+def test_collect_returns_worker_events():
+
+    def write(name):
+        with Tracer.span(name, 'output'):
+            pass
+
+    result = list()
+    worker = threading.Thread(target=lambda: result.append(Tracer.collect(write)('write 1')), name='worker-1')
+    worker.start()
+    worker.join()
+
+    assert len(result[0]) == 1
+    assert result[0][0]['args']['thread'] == 'worker-1'
+    assert Tracer.enabled() is False
+
+
+def test_to_json_adds_thread_names():
+
+    Tracer.start()
+
+    with Tracer.span('plot 1', 'plot'):
+        pass
+
+    content = Tracer.to_json(Tracer.stop())
+    names = [event['name'] for event in content['traceEvents'] if event['ph'] == 'M']
+
+    assert 'thread_name' in names
+    assert 'process_name' in names
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) $today.year Moisés Martínez (Sngular). All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+
+import os
+import sys
+import math
+import pytest
+
+ROOT_FOLDER = os.getcwd()
+
+sys.path.append(os.path.join(ROOT_FOLDER, 'src'))
+sys.path.append(os.path.join(ROOT_FOLDER, 'benchmarks'))
+
+from micro import build_plot
+from data import TreeColumns
+from models import TreeModel
+from data.search import DESC
+
+
+class ColumnsModel(TreeModel):
+
+    def __init__(self, configuration=None):
+        super().__init__('columns', 1)
+
+    def initialize(self, plot):
+        return
+
+    def survives(self, years, plot, tree):
+        return 1.0
+
+    def grow(self, years, plot, old_tree, new_tree):
+        return
+
+    def add_tree(self, years, plot):
+        return 0
+
+    def new_tree_distribution(self, years, plot, area):
+        return None
+
+    def process_plot(self, years, plot, trees):
+        return
+
+
+def test_columns_are_read_from_the_trees_and_written_back():
+
+    plot = build_plot(10)
+    trees = list(plot.trees)
+    columns = TreeColumns(trees)
+
+    assert columns['dbh'].tolist() == [tree.dbh for tree in trees]
+
+    columns['hd_ratio'] = columns['height'] * 100 / columns['dbh']
+    columns['cr'] = 0.5
+    assert trees[0].cr != 0.5
+
+    columns.write()
+
+    for tree in trees:
+        assert tree.hd_ratio == tree.height * 100 / tree.dbh
+        assert tree.cr == 0.5
+
+
+def test_sum_adds_in_the_order_of_the_trees():
+
+    plot = build_plot(50)
+    trees = list(plot.trees)
+    columns = TreeColumns(trees)
+
+    total = 0
+    for tree in trees:
+        total += tree.dbh
+
+    assert columns.sum('dbh') == total
+
+
+def test_run_stages_runs_tree_stages_after_the_columns():
+
+    plot = build_plot(10)
+    trees = list(plot.trees)
+    model = ColumnsModel()
+
+    def double(plot, columns):
+        columns['vol'] = columns['dbh'] * 2
+
+    def copy(tree):
+        tree.add_value('vol_ha', tree.vol + 1)
+
+    columns = model.run_stages(plot, trees, [double], [copy])
+
+    for tree in trees:
+        assert tree.vol == tree.dbh * 2
+    assert columns.sum('vol_ha') == sum([tree.dbh * 2 + 1 for tree in trees])
+
+
+def test_run_stages_raises_numeric_errors():
+
+    plot = build_plot(3)
+    trees = list(plot.trees)
+    trees[1].add_value('dbh', 0.0)
+
+    def ratio(plot, columns):
+        columns['hd_ratio'] = columns['height'] * 100 / columns['dbh']
+
+    with pytest.raises(FloatingPointError):
+        ColumnsModel().run_stages(plot, trees, [ratio])
+
+
+def process_plot_tree_by_tree(model, plot):
+    """
+    The per tree loop process_plot of Pinus radiata (Galicia) ran before the columns.
+    """
+
+    bal = 0.0
+
+    for tree in plot.short_trees_on_list('dbh', DESC):
+        if tree.status is None:
+            tree.add_value('bal', bal)
+            tree.add_value('basal_area', math.pi * (tree.dbh / 2) ** 2)
+            tree.add_value('ba_ha', tree.basal_area * tree.expan / 10000)
+            bal += tree.basal_area * tree.expan / 10000
+            tree.add_value('hd_ratio', tree.height * 100 / tree.dbh)
+            tree.add_value('normal_circumference', math.pi * tree.dbh)
+            model.crown(tree, plot, 'process_plot')
+            model.vol(tree, plot)
+            model.merch_classes(tree)
+            model.biomass(tree)
+
+    model.merch_classes_plot(plot)
+
+
+def test_radiata_columns_match_the_tree_by_tree_code_with_dead_and_added_trees():
+
+    from models.trees.Pradiata__gal__v01 import PinusRadiataGalicia
+
+    model = PinusRadiataGalicia()
+    plots = [build_plot(30, seed=5), build_plot(30, seed=5)]
+
+    for plot in plots:
+        for position, tree in enumerate(plot.short_trees_on_list('dbh', DESC)):
+            if position % 3 == 1:
+                tree.add_value('status', 'M' if position % 2 == 0 else 'I')
+
+    model.process_plot(1, plots[0], list(plots[0].trees))
+    process_plot_tree_by_tree(model, plots[1])
+
+    for tree, expected in zip(plots[0].short_trees_on_list('dbh', DESC), plots[1].short_trees_on_list('dbh', DESC)):
+        for variable in ['bal', 'ba_ha', 'hcb', 'cr', 'vol', 'saw_big', 'chips', 'wt']:
+            assert tree.get_value(variable) == pytest.approx(expected.get_value(variable)), variable
+
+    for variable in ['SAW_BIG', 'SAW_SMALL', 'SAW_CANTER', 'CHIPS']:
+        assert plots[0].get_value(variable) == pytest.approx(plots[1].get_value(variable)), variable